@@ -17,50 +17,264 @@
  # See the License for the specific language governing permissions and
  # limitations under the License.
  #**************************************************************************
-from PIL import Image, ImageDraw, ImageFont
+from operator import itemgetter
+from array import array
+import heapq
+import math
+import json
+import mmap
+import zlib
+import os
+import sys
 
-# Clear the detailed contents of the tasks #
-def clear(num_tasks, task_list):
-	for i in range(num_tasks):
-		task_list[i].thr_id = None
-		task_list[i].dev_id = None
-		task_list[i].status = None
-		task_list[i].s_time_cpu1 = None
-		task_list[i].f_time_cpu1 = None
-		task_list[i].s_time_memcopy1 = None
-		task_list[i].f_time_memcopy1 = None
-		task_list[i].s_time_gpu = None
-		task_list[i].f_time_gpu = None
-		task_list[i].s_time_memcopy2 = None
-		task_list[i].f_time_memcopy2 = None
-		task_list[i].s_time_cpu2 = None
-		task_list[i].f_time_cpu2 = None
-
-	return task_list
-
-# Check for current idle threads #
-def check_idle_thr(num_threads, thread_queue):
-	flag_empty = False
+# Define the ready set of the tasks #
+class ready_set:
+	def __init__(self, num_tasks, task_graph):
+		self.succ = [[] for i in range(num_tasks)] # The successors of the tasks
+		self.num_pred = [0] * num_tasks # The number of unfinished predecessors of the tasks
 
-	for i in range(num_threads):
-		if not bool(thread_queue[i]):
-			flag_empty = True
+		# Build the successors of the tasks from their data dependencies #
+		for i in range(num_tasks):
+			for dep in task_graph.dep(i):
+				self.succ[dep].append(i)
+				self.num_pred[i] += 1
+
+		# The IDs of the ready tasks, kept as a heap to process them in the order of the task list #
+		self.ready = [i for i in range(num_tasks) if self.num_pred[i] == 0]
+
+	def __len__(self):
+		return len(self.ready)
+
+	# Release the successors of a finished task (i.e., f_cpu or f_cpu2) #
+	def release(self, task_id):
+		for i in self.succ[task_id]:
+			self.num_pred[i] -= 1
+
+			if self.num_pred[i] == 0:
+				heapq.heappush(self.ready, i)
+
+	# Take the ready task with the lowest ID #
+	def pop(self):
+		return heapq.heappop(self.ready)
+
+# Schedule the time at which the end of an execution segment of a thread or device is noticed #
+def add_event(event_heap, t, f_time, res_id):
+	# The end of a segment started at time t is checked from the next time unit onwards #
+	heapq.heappush(event_heap, [max(t + 1, math.ceil(f_time)), res_id])
+
+# Take the threads or devices whose execution segments end at the current time #
+def due_events(event_heap, t):
+	res_list = []
+	while bool(event_heap) and event_heap[0][0] <= t:
+		res_list.append(heapq.heappop(event_heap)[1])
+
+	return res_list
+
+# Find the next time at which the state of the mapping process can change #
+def next_event(thr_events, dev_events, t, changed):
+	# A change made by a thread or device is observed by the others in the next time unit #
+	if changed:
+		return t + 1
+
+	next_t = -1
+	for event_heap in [thr_events, dev_events]:
+		if bool(event_heap) and (next_t == -1 or event_heap[0][0] < next_t):
+			next_t = event_heap[0][0]
+
+	if next_t == -1:
+		raise RuntimeError('The mapping process is blocked at time ' + str(t))
+
+	return next_t
+
+# Define the list of threads or devices to process at the current time, in the order of their IDs #
+class visit_list:
+	def __init__(self, res_list):
+		self.heap = list(set(res_list)) # The IDs of the threads or devices
+		heapq.heapify(self.heap)
+		self.last = -1 # The last processed ID
+
+	# Add a thread or device that has not been processed yet at the current time #
+	def add(self, res_id):
+		if res_id > self.last:
+			heapq.heappush(self.heap, res_id)
+
+	def __iter__(self):
+		while bool(self.heap):
+			res_id = heapq.heappop(self.heap)
+
+			if res_id != self.last:
+				self.last = res_id
+				yield res_id
+
+# Define the queue of tasks (i.e., task IDs) indexed by the priority of a selection algorithm #
+class task_queue:
+	def __init__(self, prio = None, tot_val = None):
+		self.prio = prio # The priority of a task, where the lowest value is selected first (None: the order of insertion)
+		self.heap = [] # The entries of the tasks, i.e., [priority, insertion number, task]
+		self.num_ins = 0 # The number of inserted tasks
+
+		# The total values of certain attributes (e.g., exe_time) of the tasks in the queue, where the values #
+		# of the tasks are given as arrays indexed by the task ID #
+		# Each total is the running sum of the values in the order of the queue (i.e., the same as adding them #
+		# one by one, like the original mapping process), so the ties of the mapping algorithms are the same #
+		# The sums are kept exactly as well, i.e., as integers scaled by 2 ** tot_shift (every floating-point #
+		# value is an integer multiple of a power of 1/2), so when a task is removed and every sum of the values #
+		# of the queue is exact (e.g., integer execution times), the running sum is the exact sum in constant #
+		# time; otherwise, it is calculated again over the queue #
+		self.tot_val = {}
+		self.tot_exact = {} # The exact sums of the values
+		self.tot_abs = {} # The exact sums of the absolute values
+		self.tot_shift = {}
+		self.tot = {}
+		if tot_val != None:
+			for attr in tot_val:
+				self.tot_val[attr] = tot_val[attr]
+				self.reset_tot(attr)
+
+	def __len__(self):
+		return len(self.heap)
+
+	# Traverse the tasks in the order of insertion #
+	def __iter__(self):
+		for entry in sorted(self.heap, key = itemgetter(1)):
+			yield entry[2]
+
+	# Insert a task into the queue #
+	def append(self, task):
+		if self.prio == None:
+			heapq.heappush(self.heap, [self.num_ins, self.num_ins, task])
 		else:
-			if thread_queue[i][len(thread_queue[i]) - 1].status == 'f_cpu' or thread_queue[i][len(thread_queue[i]) - 1].status == 'f_cpu1' or thread_queue[i][len(thread_queue[i]) - 1].status == 'f_cpu2':
-				flag_empty = True
+			heapq.heappush(self.heap, [self.prio(task), self.num_ins, task])
+
+		self.num_ins += 1
+		self.update_tot(task, 1)
+
+	# Remove the task with the lowest priority value from the queue, where the earliest inserted task wins ties #
+	def pop(self):
+		task = heapq.heappop(self.heap)[2]
+		self.update_tot(task, -1)
+
+		return task
+
+	# Remove a certain task from the queue #
+	def remove(self, task):
+		for i in range(len(self.heap)):
+			if self.heap[i][2] == task:
+				self.heap[i] = self.heap[len(self.heap) - 1]
+				self.heap.pop()
+				heapq.heapify(self.heap)
+				self.update_tot(task, -1)
+				break
+
+	# Clear the total values of an attribute #
+	def reset_tot(self, attr):
+		self.tot_exact[attr] = 0
+		self.tot_abs[attr] = 0
+		self.tot_shift[attr] = 0
+		self.tot[attr] = 0
+
+	# Update the total values after adding (sign = 1) or removing (sign = -1) a task #
+	def update_tot(self, task, sign):
+		for attr in self.tot:
+			# The scale of the values is reset when the queue is empty #
+			if len(self.heap) == 0:
+				self.reset_tot(attr)
+				continue
+
+			value = self.tot_val[attr][task]
+			num, den = value.as_integer_ratio()
+			shift = den.bit_length() - 1
+
+			# Scale the sums to the finest value so far #
+			if shift > self.tot_shift[attr]:
+				self.tot_exact[attr] <<= shift - self.tot_shift[attr]
+				self.tot_abs[attr] <<= shift - self.tot_shift[attr]
+				self.tot_shift[attr] = shift
+
+			self.tot_exact[attr] += sign * (num << (self.tot_shift[attr] - shift))
+			self.tot_abs[attr] += sign * (abs(num) << (self.tot_shift[attr] - shift))
+
+			# A task is added to the end of the queue, so its value is added to the running sum #
+			if sign == 1:
+				self.tot[attr] += value
+			# The running sum of the remaining tasks is the exact sum if no sum of their values exceeds the 53 bits #
+			# of a floating-point value #
+			elif self.tot_abs[attr] < 1 << 53:
+				self.tot[attr] = self.tot_exact[attr] / (1 << self.tot_shift[attr])
+			else:
+				self.tot[attr] = running_sum([self], attr)
+
+# The running sum of the values of an attribute of the tasks of several queues (see task_queue), i.e., in the #
+# order of the queues and of the tasks of each queue #
+def running_sum(queues, attr):
+	total = 0
+	for queue in queues:
+		values = queue.tot_val[attr]
+		for task in queue:
+			total += values[task]
+
+	return total
+
+# The total value of an attribute of the tasks of several queues, which is the running sum over the queues in #
+# their order, given by the exact sums if every sum of the values is exact #
+def queues_tot(queues, attr):
+	shift = max([queue.tot_shift[attr] for queue in queues])
+
+	if sum([queue.tot_abs[attr] << (shift - queue.tot_shift[attr]) for queue in queues]) < 1 << 53:
+		return sum([queue.tot_exact[attr] << (shift - queue.tot_shift[attr]) for queue in queues]) / (1 << shift)
 
-	return flag_empty
+	return running_sum(queues, attr)
 
-# Check meeting the dependencies #
-def check_dep(task_list, dep_list):
-	flag_finished = True
+# Define the index of the threads or devices, where the one with the lowest key is selected first #
+class res_index:
+	def __init__(self, num_res, key):
+		self.key = key # The key of a thread or device, where the lowest ID wins ties
+		self.curr_key = [] # The current key of the threads or devices (None: not included in the index)
+		for i in range(num_res):
+			self.curr_key.append(key(i))
 
-	for i in range(len(dep_list)):
-		for j in range(len(task_list)):
-			if dep_list[i] == task_list[j] and (task_list[j].status == None or task_list[j].status == 's_cpu' or task_list[j].status == 's_cpu1' or task_list[j].status == 'f_cpu1' or task_list[j].status == 's_memcopy1' or task_list[j].status == 's_gpu' or task_list[j].status == 's_memcopy2' or task_list[j].status == 'f_memcopy2' or task_list[j].status == 's_cpu2'):
-				flag_finished = False
+		# The entries of the threads or devices, i.e., [key, ID], where the outdated entries are discarded lazily #
+		self.heap = []
+		self.rebuild()
 
-	return flag_finished
+	def __len__(self):
+		return self.num_res
+
+	# Rebuild the heap from the current keys #
+	def rebuild(self):
+		self.heap = [[self.curr_key[i], i] for i in range(len(self.curr_key)) if self.curr_key[i] != None]
+		heapq.heapify(self.heap)
+
+		self.num_res = len(self.heap) # The number of threads or devices included in the index
+
+	# Include a thread or device in the index, or update its key #
+	def update(self, res_id):
+		key = self.key(res_id)
+
+		if self.curr_key[res_id] == None:
+			self.num_res += 1
+		elif self.curr_key[res_id] == key:
+			return
+
+		self.curr_key[res_id] = key
+		heapq.heappush(self.heap, [key, res_id])
+
+		# Discard the outdated entries if there are too many of them #
+		if len(self.heap) > 4 * len(self.curr_key) + 16:
+			self.rebuild()
+
+	# Exclude a thread or device from the index #
+	def exclude(self, res_id):
+		if self.curr_key[res_id] != None:
+			self.curr_key[res_id] = None
+			self.num_res -= 1
+
+	# Find the thread or device with the lowest key #
+	def top(self):
+		while self.heap[0][0] != self.curr_key[self.heap[0][1]]:
+			heapq.heappop(self.heap)
+
+		return self.heap[0][1]
 
 # Specify the missed deadline status of the system #
 def miss_deadline(deadline, t):
@@ -69,86 +283,462 @@ def miss_deadline(deadline, t):
 	else:
 		return 1
 
-# Export the scheduling of the threads to the files #
-def export_scheduling(num_threads, queue, alg_name, par1, par2, par3, par4, par5):
-	# Create the output file #
+# The folder of the output files, where the files of the algorithms are placed in its subfolders (scheduling, #
+# device allocation, and graphic) #
+output_dir = 'output'
+
+# The name of the files exported for a mapping algorithm, e.g., MTET-MET,LET-MNJ-MNAOT #
+def export_name(alg_name, par1, par2, par3, par4, par5):
 	if alg_name == 'O-KGLP':
-		file = open("output/scheduling/" + par1 + "-" + par2 + "," + alg_name + ".dat", "w")
+		return par1 + "-" + par2 + "," + alg_name
 	elif alg_name == 'new':
-		file = open("output/scheduling/" + par1 + "-" + par2 + "," + par3 + "-" + par4 + "-" + par5 + ".dat", "w")
+		return par1 + "-" + par2 + "," + par3 + "-" + par4 + "-" + par5
 
-	for i in range(num_threads):
-		# Write the name of the thread #
-		file.write('Thr' + str(i) + ':\n')
+# The path of a file exported for a mapping algorithm, e.g., output/scheduling/MTET-MET,O-KGLP.dat #
+def export_path(folder, alg_name, par1, par2, par3, par4, par5, ext):
+	return os.path.join(output_dir, folder, export_name(alg_name, par1, par2, par3, par4, par5) + ext)
 
-		# Write the name of each task executed by the thread #
-		for j in range(len(queue[i])):
-			file.write('T' + str(queue[i][j].t_id) + "\n")
-
-		if i != num_threads - 1:
-			file.write("\n")
+# Export the scheduling of the threads to the file, where the file is written at once #
+def export_scheduling(num_threads, queue, alg_name, par1, par2, par3, par4, par5):
+	# The name of each thread and the name of each task executed by the thread #
+	thr_list = []
+	for i in range(num_threads):
+		thr_list.append('Thr' + str(i) + ':\n' + ''.join(['T' + str(task) + '\n' for task in queue[i]]))
 
+	# Create the output file #
+	file = open(export_path("scheduling", alg_name, par1, par2, par3, par4, par5, ".dat"), "w")
+	file.write('\n'.join(thr_list))
 	file.close()
 
-# Export the allocation of devices to tasks to the file #
+# Export the allocation of devices to tasks to the file, where the file is written at once #
 def export_device_allocation(alloc_list, alg_name, par1, par2, par3, par4, par5):
 	# Create the output file #
-	if alg_name == 'O-KGLP':
-		file = open("output/device allocation/" + par1 + "-" + par2 + "," + alg_name + ".dat", "w")
-	elif alg_name == 'new':
-		file = open("output/device allocation/" + par1 + "-" + par2 + "," + par3 + "-" + par4 + "-" + par5 + ".dat", "w")
+	file = open(export_path("device allocation", alg_name, par1, par2, par3, par4, par5, ".dat"), "w")
+
+	# Write the task ID and device ID #
+	file.write('\n'.join([str(task) + "," + str(dev_id) for task, dev_id in alloc_list]))
+	file.close()
+
+# The version of the format of the schedule files, which is changed whenever the format changes #
+# Version 2 added the positions of the segments in the order of the threads and devices #
+schedule_magic = b'SCHEDULE'
+schedule_version = 2
+
+# The columns of the schedule files, i.e., [name, type code of the array] #
+# thr_pos1: The position of the CPU-only task or the initial CPU segment in the order of the segments of the #
+# thread, thr_pos2: The position of the last CPU segment, dev_pos: The position of the job in the order of #
+# the jobs of the device #
+schedule_columns = [['t_type', 'b'], ['thr_id', 'q'], ['device', 'q'], ['s_time_cpu', 'd'], ['f_time_cpu', 'd'], ['s_time_cpu1', 'd'], ['f_time_cpu1', 'd'], ['s_time_memcopy1', 'd'], ['f_time_memcopy1', 'd'], ['s_time_gpu', 'd'], ['f_time_gpu', 'd'], ['s_time_memcopy2', 'd'], ['f_time_memcopy2', 'd'], ['s_time_cpu2', 'd'], ['f_time_cpu2', 'd'], ['thr_pos1', 'q'], ['thr_pos2', 'q'], ['dev_pos', 'q']]
+
+# Specify the columns of the schedule of a simulation, i.e., name: values #
+def schedule_data(task_graph, sim):
+	num_tasks = task_graph.num_tasks
+	columns = {'t_type': task_graph.t_type}
+
+	# The device of each task #
+	columns['device'] = array('q', [-1]) * num_tasks
+	for task, dev_id in sim.task_device:
+		columns['device'][task] = dev_id
+
+	for name in ['thr_id', 's_time_cpu', 'f_time_cpu', 's_time_cpu1', 'f_time_cpu1', 's_time_memcopy1', 'f_time_memcopy1', 's_time_gpu', 'f_time_gpu', 's_time_memcopy2', 'f_time_memcopy2', 's_time_cpu2', 'f_time_cpu2']:
+		columns[name] = getattr(sim.task_state, name)
+
+	# The positions of the segments, where a GPU-using task is given twice in the execution queue of its #
+	# thread (i.e., its initial and last CPU segments) #
+	for name in ['thr_pos1', 'thr_pos2', 'dev_pos']:
+		columns[name] = array('q', [-1]) * num_tasks
+
+	for queue in sim.exec_queue:
+		for pos, task in enumerate(queue):
+			if columns['thr_pos1'][task] == -1:
+				columns['thr_pos1'][task] = pos
+			else:
+				columns['thr_pos2'][task] = pos
+
+	for queue in sim.ker_exec_queue:
+		for pos, task in enumerate(queue):
+			columns['dev_pos'][task] = pos
+
+	return columns
+
+# Export the schedule of the tasks of a simulation to a columnar file, i.e., the task type, thread, device, #
+# start and finish times of the segments, and positions of the segments of each task (-1: not specified), #
+# where each column is written as a whole #
+# The file includes the header, the length of the description of the columns and the description in JSON #
+# (i.e., the number of tasks, and the name, type code, offset, size, and compression of each column), and #
+# then the columns, which start at multiples of 8 bytes, so they can be used directly from the memory map #
+# The columns are compressed using zlib if compress = 1, where they are decompressed by the loader #
+def export_schedule(file_name, task_graph, sim, compress = 0):
+	num_tasks = task_graph.num_tasks
+	columns = schedule_data(task_graph, sim)
+
+	col_data = []
+	for name, type_code in schedule_columns:
+		data = columns[name].tobytes()
+		if compress == 1:
+			data = zlib.compress(data)
+
+		col_data.append(data)
+
+	# Specify the offsets of the columns, where the size of the description is fixed before the offsets #
+	# are added, and then the description is padded to the size #
+	desc = {'version': schedule_version, 'num_tasks': num_tasks, 'columns': []}
+	for i in range(len(schedule_columns)):
+		desc['columns'].append({'name': schedule_columns[i][0], 'type': schedule_columns[i][1], 'offset': 0, 'size': len(col_data[i]), 'compressed': compress == 1})
+
+	desc_size = len(json.dumps(desc)) + len(schedule_columns) * 20
+	desc_size += -desc_size % 8
+
+	offset = len(schedule_magic) + 8 + desc_size
+	for i in range(len(schedule_columns)):
+		desc['columns'][i]['offset'] = offset
+		offset += len(col_data[i]) + (-len(col_data[i]) % 8)
+
+	desc_text = json.dumps(desc).encode()
 
-	for i in range(len(alloc_list)):
-		# Write the task ID and device ID #
-		if i < len(alloc_list) - 1:
-			file.write(str(alloc_list[i][0]) + "," + str(alloc_list[i][1]) + "\n")
+	with open(file_name, 'wb') as file:
+		file.write(schedule_magic)
+		file.write(array('q', [desc_size]).tobytes())
+		file.write(desc_text + b' ' * (desc_size - len(desc_text)))
+
+		for data in col_data:
+			file.write(data)
+			file.write(b'\0' * (-len(data) % 8))
+
+# Define the schedule loaded from a columnar file, where each column (e.g., schedule['thr_id']) is a view of #
+# the memory map of the file (or an array if it is compressed), so the file is not parsed #
+class schedule_file:
+	def __init__(self, file_name):
+		self.file = open(file_name, 'rb')
+		self.mm = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+		self.view = memoryview(self.mm)
+		self.columns = {} # The columns, i.e., name: values
+
+		if self.mm[:len(schedule_magic)] != schedule_magic:
+			self.close()
+			raise ValueError('Not a schedule file: ' + file_name)
+
+		pos = len(schedule_magic)
+		desc_size = array('q', self.mm[pos:pos + 8])[0]
+		desc = json.loads(self.mm[pos + 8:pos + 8 + desc_size])
+
+		# The files of version 1 are read as well, where the positions of the segments are not given #
+		if desc['version'] not in [1, schedule_version]:
+			self.close()
+			raise ValueError('Unsupported version of the schedule file: ' + file_name)
+
+		self.num_tasks = desc['num_tasks'] # Number of tasks
+
+		for col in desc['columns']:
+			data = self.view[col['offset']:col['offset'] + col['size']]
+
+			if col['compressed']:
+				values = array(col['type'])
+				values.frombytes(zlib.decompress(data))
+				data.release()
+			else:
+				values = data.cast(col['type'])
+
+			self.columns[col['name']] = values
+
+	def __getitem__(self, name):
+		return self.columns[name]
+
+	def __contains__(self, name):
+		return name in self.columns
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	# Release the views of the columns and close the file #
+	def close(self):
+		for name in self.columns:
+			if isinstance(self.columns[name], memoryview):
+				self.columns[name].release()
+		self.columns = {}
+
+		self.view.release()
+		self.mm.close()
+		self.file.close()
+
+# Load a schedule from a columnar file #
+def load_schedule(file_name):
+	return schedule_file(file_name)
+
+# The segments of the tasks, i.e., [name, start time column, finish time column, duration attribute of the #
+# graph], in the order of executing them #
+cpu_segments = [['CPU', 's_time_cpu', 'f_time_cpu', 'exe_time']]
+gpu_segments = [['CPU1', 's_time_cpu1', 'f_time_cpu1', 'cpu1_time'], ['memory copy 1', 's_time_memcopy1', 'f_time_memcopy1', 'memcopy1_time'], ['GPU', 's_time_gpu', 'f_time_gpu', 'gpu_time'], ['memory copy 2', 's_time_memcopy2', 'f_time_memcopy2', 'memcopy2_time'], ['CPU2', 's_time_cpu2', 'f_time_cpu2', 'cpu2_time']]
+
+# Check a schedule (i.e., the columns given by schedule_data or load_schedule) against its graph, where the #
+# errors are returned (at most max_errors of them) #
+# Each task should execute its segments in order with the durations of the graph, start after the tasks it #
+# depends on are finished, and the segments of each thread (CPU segments) and device (from the start of the #
+# first memory copy to the finish of the second one) should not overlap #
+# If the graph is not given (task_graph = None), the durations and data dependencies are not checked #
+# The segments of each thread and device are placed in order using their positions, so the check takes time #
+# linear in the number of tasks and data dependencies, where the files of version 1 (without the positions) #
+# are sorted by the start times instead #
+def check_schedule(task_graph, schedule, max_errors = 10):
+	errors = []
+	t_type = schedule['t_type']
+	thr_id = schedule['thr_id']
+	device = schedule['device']
+	num_tasks = len(t_type)
+
+	def error(text):
+		errors.append(text)
+		return len(errors) >= max_errors
+
+	start = array('d', [-1]) * num_tasks # The start time of each task
+	finish = array('d', [-1]) * num_tasks # The finish time of each task
+	thr_seg = [] # The CPU segments, i.e., [thread, position, start time, finish time, task]
+	dev_seg = [] # The jobs, i.e., [device, position, start time, finish time, task]
+	has_pos = 'thr_pos1' in schedule
+
+	# Check the segments of each task #
+	for i in range(num_tasks):
+		segments = cpu_segments if t_type[i] == 0 else gpu_segments
+		prev_f = -1
+
+		for name, s_col, f_col, dur_attr in segments:
+			s_time = schedule[s_col][i]
+			f_time = schedule[f_col][i]
+
+			if s_time == -1 or f_time == -1:
+				if error('Task ' + str(i) + ': the ' + name + ' segment is not executed'):
+					return errors
+			elif task_graph != None and f_time != s_time + getattr(task_graph, dur_attr)[i]:
+				if error('Task ' + str(i) + ': the ' + name + ' segment takes ' + str(f_time - s_time) + ' instead of ' + str(getattr(task_graph, dur_attr)[i])):
+					return errors
+			elif s_time < prev_f:
+				if error('Task ' + str(i) + ': the ' + name + ' segment starts at ' + str(s_time) + ' before the previous segment finishes at ' + str(prev_f)):
+					return errors
+
+			prev_f = f_time
+
+		start[i] = schedule[segments[0][1]][i]
+		finish[i] = schedule[segments[-1][2]][i]
+
+		if thr_id[i] < 0:
+			if error('Task ' + str(i) + ': no thread'):
+				return errors
+			continue
+
+		if t_type[i] == 0:
+			thr_seg.append([thr_id[i], schedule['thr_pos1'][i] if has_pos else None, start[i], finish[i], i])
 		else:
-			file.write(str(alloc_list[i][0]) + "," + str(alloc_list[i][1]))
+			thr_seg.append([thr_id[i], schedule['thr_pos1'][i] if has_pos else None, start[i], schedule['f_time_cpu1'][i], i])
+			thr_seg.append([thr_id[i], schedule['thr_pos2'][i] if has_pos else None, schedule['s_time_cpu2'][i], finish[i], i])
 
-	file.close()
+			if device[i] < 0:
+				if error('Task ' + str(i) + ': no device'):
+					return errors
+				continue
+
+			dev_seg.append([device[i], schedule['dev_pos'][i] if has_pos else None, schedule['s_time_memcopy1'][i], schedule['f_time_memcopy2'][i], i])
+
+	# Check the data dependencies #
+	for i in range(num_tasks if task_graph != None else 0):
+		for dep in task_graph.dep(i):
+			if start[i] < finish[dep]:
+				if error('Task ' + str(i) + ': starts at ' + str(start[i]) + ' before task ' + str(dep) + ' (which it depends on) finishes at ' + str(finish[dep])):
+					return errors
+
+	# Check the occupancy of the threads and devices #
+	for res_name, seg_list in [['Thread', thr_seg], ['Device', dev_seg]]:
+		num_res = max([seg[0] for seg in seg_list], default = -1) + 1
+
+		# Place the segments of each thread or device in order #
+		lanes = [[] for j in range(num_res)]
+		if has_pos:
+			lane_len = [0] * num_res
+			for seg in seg_list:
+				lane_len[seg[0]] += 1
+			for j in range(num_res):
+				lanes[j] = [None] * lane_len[j]
+
+			for seg in seg_list:
+				lane = lanes[seg[0]]
+				if not 0 <= seg[1] < len(lane) or lane[seg[1]] != None:
+					if error(res_name + ' ' + str(seg[0]) + ': the position ' + str(seg[1]) + ' of task ' + str(seg[4]) + ' is not valid'):
+						return errors
+					continue
+
+				lane[seg[1]] = seg
+		else:
+			for seg in seg_list:
+				lanes[seg[0]].append(seg)
+			for lane in lanes:
+				lane.sort(key = itemgetter(2, 3))
+
+		for j in range(num_res):
+			prev = None
+			for seg in lanes[j]:
+				if seg == None:
+					continue
 
-# Draw the graphical result #
-def graphic_result(num_threads, queue, t, alg_name, par1, par2, par3, par4, par5):
-	# Specify the width of the window, the height of the queues, and the height of the window #
-	win_width = num_threads * 100 + (num_threads - 1) * 10 + 100 # The width of the window
-	queue_height = t # The height of the queues
-	win_height = queue_height * 10 + 100 # The height of the window
+				if prev != None and seg[2] < prev[3]:
+					if error(res_name + ' ' + str(j) + ': task ' + str(seg[4]) + ' starts at ' + str(seg[2]) + ' before task ' + str(prev[4]) + ' finishes at ' + str(prev[3])):
+						return errors
+
+				prev = seg
+
+	return errors
+
+# The graphical results are drawn by a background thread, so drawing does not stop the next simulation #
+graphic_executor = None
+
+# The maximum height of the time axis of the graphical results in pixels, where a time unit takes 10 pixels #
+# if the response time fits, and otherwise the time is scaled to this height #
+graphic_max_height = 2000
+
+# The maximum width of the lanes of the graphical results in pixels, where a lane takes 100 pixels and the gap #
+# between the lanes takes 10 pixels if all lanes fit, and otherwise the lanes and the gaps are narrowed to #
+# this width (with at least a pixel for each lane) #
+graphic_max_width = 4000
+
+# The colors of the lanes, i.e., [color of the tasks, color of the tasks aggregated as they are shorter #
+# than a pixel] #
+graphic_thr_color = [(0, 255, 0), (0, 128, 0)]
+graphic_dev_color = [(0, 160, 255), (0, 64, 160)]
+
+# Draw the graphical result, i.e., a lane for each thread (the CPU-only tasks, and the GPU-using tasks from #
+# the start of the initial CPU segment to the finish of the last CPU segment) and a lane for each device (the #
+# GPU-using tasks from the start of the memory copy to the device to the finish of the memory copy from the #
+# device) #
+# The lanes are specified here, and then the image is drawn by the background thread #
+def graphic_result(num_threads, num_devices, queue, task_device, task_graph, task_state, t, alg_name, par1, par2, par3, par4, par5):
+	global graphic_executor
+
+	lanes = [] # The lanes, i.e., [name, tasks as [start time, finish time, task ID], colors]
+
+	for i in range(num_threads):
+		segments = []
+		for t_id in queue[i]:
+			if task_graph.t_type[t_id] == 0:
+				segments.append([task_state.s_time_cpu[t_id], task_state.f_time_cpu[t_id], t_id])
+			else:
+				segments.append([task_state.s_time_cpu1[t_id], task_state.f_time_cpu2[t_id], t_id])
+
+		lanes.append(['Thr' + str(i), segments, graphic_thr_color])
+
+	dev_segments = [[] for i in range(num_devices)]
+	for t_id, dev_id in task_device:
+		if task_state.s_time_memcopy1[t_id] != -1:
+			dev_segments[dev_id].append([task_state.s_time_memcopy1[t_id], task_state.f_time_memcopy2[t_id], t_id])
+
+	for i in range(num_devices):
+		lanes.append(['Dev' + str(i), dev_segments[i], graphic_dev_color])
+
+	# The executor (and concurrent.futures) is loaded only when a graphical result is drawn #
+	if graphic_executor == None:
+		import concurrent.futures
+		graphic_executor = concurrent.futures.ThreadPoolExecutor(1)
+
+	future = graphic_executor.submit(draw_graphic, export_path("graphic", alg_name, par1, par2, par3, par4, par5, ".jpg"), lanes, t)
+	future.add_done_callback(graphic_done)
+
+	return future
+
+# Show the error of drawing a graphical result, since the background thread does not stop the program #
+def graphic_done(future):
+	if future.exception() != None:
+		print('The graphical result is not drawn: ' + repr(future.exception()), file = sys.stderr)
+
+# Wait for the graphical results being drawn #
+def graphic_wait():
+	global graphic_executor
+
+	if graphic_executor != None:
+		graphic_executor.shutdown(wait = True)
+		graphic_executor = None
+
+# Load the font of the graphical results, where the default font of PIL is used if no font is found #
+def graphic_font(size):
+	# PIL is imported only when the graphical result is drawn, since it is not needed otherwise #
+	from PIL import ImageFont
+
+	for font_name in ['DejaVuSans.ttf', 'arial.ttf', 'Arial.ttf']:
+		try:
+			return ImageFont.truetype(font_name, size)
+		except OSError:
+			pass
+
+	return ImageFont.load_default()
+
+# Draw the lanes of a graphical result to the image file #
+# The tasks shorter than a pixel are aggregated, i.e., the consecutive ones are drawn as a single box, so the #
+# number of boxes of a lane is bounded by its height in pixels #
+def draw_graphic(file_name, lanes, t):
+	# PIL is imported only when the graphical result is drawn, since it is not needed otherwise #
+	from PIL import Image, ImageDraw
+
+	# Specify the scale of the time, the width of the lanes and the gaps, the width of the window, the height #
+	# of the lanes, and the height of the window #
+	if t * 10 <= graphic_max_height:
+		scale = 10 # Pixels per time unit
+	else:
+		scale = graphic_max_height / t
+	if len(lanes) * 110 - 10 <= graphic_max_width:
+		lane_width = 100 # The width of the lanes
+		gap_width = 10 # The width of the gaps between the lanes
+	else:
+		lane_width = max(graphic_max_width / (len(lanes) * 1.1 - 0.1), 1)
+		gap_width = lane_width / 10
+	win_width = round(len(lanes) * lane_width + (len(lanes) - 1) * gap_width) + 100 # The width of the window
+	lane_height = round(t * scale) # The height of the lanes
+	win_height = lane_height + 100 # The height of the window
 
 	# Prepare the drawing process #
 	im = Image.new('RGB', (win_width, win_height), (255, 255, 255))
 	draw = ImageDraw.Draw(im)
 
-	# Draw the name and contents of each thread #
+	font_lane = graphic_font(20)
+	font_task = graphic_font(15)
+
+	# Draw the name and contents of each lane #
 	l_point = 50
-	font_thr_id = ImageFont.truetype(r'C:\Users\System-Pc\Desktop\arial.ttf', 20) 
-	font_task_id = ImageFont.truetype(r'C:\Users\System-Pc\Desktop\arial.ttf', 15)
+	for name, segments, color in lanes:
+		# Draw the name of the lane if it fits #
+		if lane_width >= 80:
+			draw.text((l_point + lane_width / 4, 20), name, fill = "black", font = font_lane)
 
-	for i in range(num_threads):
-		# Draw the name of the thread #
-		thr_id = 'Thr' + str(i)
-		draw.text((l_point + 25, 20), thr_id, fill = "black", font = font_thr_id, align = "center")
-
-		# Draw the main box of the thread #
-		draw.rectangle((l_point, 50, l_point + 100, queue_height * 10 + 60), fill = (255, 255, 255), outline = (0, 0, 0), width = 2)
-
-		for j in range(len(queue[i])):
-			if queue[i][j].t_type == 0:
-				# Draw the box related to the execution of each task #
-				draw.rectangle((l_point, queue[i][j].s_time_cpu * 10 + 50, l_point + 100, queue[i][j].f_time_cpu * 10 + 50), fill = (0, 255, 0), outline = (0, 0, 0), width = 1)
-				# Draw the name of the task #
-				task_id = 'T' + str(queue[i][j].t_id)
-				draw.text((l_point + 40, (queue[i][j].s_time_cpu + (queue[i][j].f_time_cpu - queue[i][j].s_time_cpu) // 2) * 10 + 45), task_id, fill = "black", font = font_task_id, align = "center")
-			else:
-				# Draw the box related to the execution of each task #
-				draw.rectangle((l_point, queue[i][j].s_time_cpu1 * 10 + 50, l_point + 100, queue[i][j].f_time_cpu2 * 10 + 50), fill = (0, 255, 0), outline = (0, 0, 0), width = 1)
-				# Draw the name of the task #
-				task_id = 'T' + str(queue[i][j].t_id)
-				draw.text((l_point + 40, (queue[i][j].s_time_cpu1 + (queue[i][j].f_time_cpu2 - queue[i][j].s_time_cpu1) // 2) * 10 + 45), task_id, fill = "black", font = font_task_id, align = "center")				
+		# Draw the main box of the lane #
+		draw.rectangle((l_point, 50, l_point + lane_width, lane_height + 60), fill = (255, 255, 255), outline = (0, 0, 0), width = 2 if lane_width >= 10 else 0)
+
+		run = None # The aggregated tasks, i.e., [top, bottom]
+		for s_time, f_time, t_id in sorted(segments):
+			top = s_time * scale + 50
+			bottom = f_time * scale + 50
+
+			# Aggregate the task if it is shorter than a pixel #
+			if bottom - top < 1:
+				if run != None and top <= run[1] + 1:
+					run[1] = max(run[1], bottom)
+				else:
+					if run != None:
+						draw.rectangle((l_point, run[0], l_point + lane_width, max(run[1], run[0] + 1)), fill = color[1])
+					run = [top, bottom]
+
+				continue
+
+			if run != None:
+				draw.rectangle((l_point, run[0], l_point + lane_width, max(run[1], run[0] + 1)), fill = color[1])
+				run = None
 
-		l_point += 110
+			# Draw the box related to the execution of the task, as well as its name if it fits #
+			draw.rectangle((l_point, top, l_point + lane_width, bottom), fill = color[0], outline = (0, 0, 0), width = 1 if lane_width >= 10 else 0)
+			if bottom - top >= 20 and lane_width >= 80:
+				draw.text((l_point + lane_width * 0.4, (top + bottom) / 2 - 8), 'T' + str(t_id), fill = "black", font = font_task)
+
+		if run != None:
+			draw.rectangle((l_point, run[0], l_point + lane_width, max(run[1], run[0] + 1)), fill = color[1])
+
+		l_point += lane_width + gap_width
 
 	# Create the output file #
-	if alg_name == 'O-KGLP':
-		im.save("output/graphic/" + par1 + "-" + par2 + "," + alg_name + ".jpg", quality = 300)
-	elif alg_name == 'new':
-		im.save("output/graphic/" + par1 + "-" + par2 + "," + par3 + "-" + par4 + "-" + par5 + ".jpg", quality = 300)
+	im.save(file_name, quality = 95)
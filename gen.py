@@ -19,205 +19,320 @@
  # See the License for the specific language governing permissions and
  # limitations under the License.
  #**************************************************************************
+from array import array
+from enum import IntEnum
+from itertools import repeat, starmap, accumulate, compress
+from operator import add, sub, mul, truediv
 import random
-
-out_list = [] # Outgoing tasks
-
-# Define the task class #
-class task:
-	def __init__(self, t_id, t_type, thr_id, dev_id, exe_time, cpu1_time, memcopy1_time, gpu_time, memcopy2_time, cpu2_time, dep, num_out, res_time, status, s_time_cpu, f_time_cpu, s_time_cpu1, f_time_cpu1, s_time_memcopy1, f_time_memcopy1, s_time_gpu, f_time_gpu, s_time_memcopy2, f_time_memcopy2, s_time_cpu2, f_time_cpu2, deadline):
-		self.t_id = t_id # Task ID
-		self.t_type = t_type # Task type; 0: CPU-only task, 1: GPU-using task
-		self.thr_id = thr_id # Thread ID, which can be used only for GPU-using tasks
-		self.dev_id = dev_id # Device ID, which can be used only for GPU-using tasks
-		self.exe_time = exe_time # Execution time
-		self.cpu1_time = cpu1_time # Execution time of the initial CPU segment
-		self.memcopy1_time = memcopy1_time # Time to copy memory from host to device
-		self.gpu_time = gpu_time # Execution time of the GPU segment
-		self.memcopy2_time = memcopy2_time # Time to copy memory from device to host
-		self.cpu2_time = cpu2_time # Execution time of the last CPU segment
-		self.dep = dep # The tasks list corresponding to input data dependency
-		self.num_out = num_out # The number of outgoing tasks
-		self.deadline = deadline # Deadline of the task
-		self.res_time = res_time # Response time of the task
-		# Status #
-		# [CPU-only task]
-		# s_cpu: CPU-only task started, f_cpu: CPU-only task finished
-		# [GPU-using task]
-		# s_cpu1: Initial CPU segment started, f_cpu1: Initial CPU segment finished
-		# s_memcopy1: Memory copy from host to device started, f_memcopy1: Memory copy from host to device finished
-		# s_gpu: GPU segment started, f_gpu: GPU segment finished
-		# s_memcopy2: Memory copy from device to host started, f_memcopy2: Memory copy from device to host finished
-		# s_cpu2: Last CPU segment started, f_cpu2: Last CPU segment finished
-		self.status = status
-		self.s_time_cpu = s_time_cpu # Start time of the CPU-only task
-		self.f_time_cpu = f_time_cpu # Finish time of the CPU-only task
-		self.s_time_cpu1 = s_time_cpu1 # Start time of the initial CPU segment
-		self.f_time_cpu1 = f_time_cpu1 # Finish time of the initial CPU segment
-		self.s_time_memcopy1 = s_time_memcopy1 # Start time of the memory copy from host to device
-		self.f_time_memcopy1 = f_time_memcopy1 # Finish time of the memory copy from host to device
-		self.s_time_gpu = s_time_gpu # Start time of the GPU segment
-		self.f_time_gpu = f_time_gpu # Finish time of the GPU segment
-		self.s_time_memcopy2 = s_time_memcopy2 # Start time of the memory copy from device to host
-		self.f_time_memcopy2 = f_time_memcopy2 # Finish time of the memory copy from device to host
-		self.s_time_cpu2 = s_time_cpu2 # Start time of the last CPU segment
-		self.f_time_cpu2 = f_time_cpu2 # Finish time of the last CPU segment
+import math
+import json
+import hashlib
+import mmap
+import os
+
+# The benchmarks loaded in the process, i.e., benchmark: bench_data #
+bench_cache = {}
+
+# The header of the cache files of the benchmarks, where the version is changed whenever the format of the #
+# files changes, so the old files are built again #
+bench_cache_magic = b'GPUBENCH'
+bench_cache_version = 1
+
+# Define the graph of tasks, where the attributes of the tasks are stored in compact arrays indexed by #
+# the task ID, as well as the graph is shared (without modification) by the mapping runs #
+class graph:
+	__slots__ = ('num_tasks', 't_type', 'exe_time', 'cpu1_time', 'memcopy1_time', 'gpu_time', 'memcopy2_time', 'cpu2_time', 'dep_ptr', 'dep_idx', 'num_out', 'deadline', 'res_time')
+
+	def __init__(self, num_tasks, t_type, dep_list):
+		self.num_tasks = num_tasks # Number of tasks
+		self.t_type = array('b', t_type) # Task type; 0: CPU-only task, 1: GPU-using task
+		self.exe_time = array('d', [0]) * num_tasks # Execution time
+		self.cpu1_time = array('d', [0]) * num_tasks # Execution time of the initial CPU segment
+		self.memcopy1_time = array('d', [0]) * num_tasks # Time to copy memory from host to device
+		self.gpu_time = array('d', [0]) * num_tasks # Execution time of the GPU segment
+		self.memcopy2_time = array('d', [0]) * num_tasks # Time to copy memory from device to host
+		self.cpu2_time = array('d', [0]) * num_tasks # Execution time of the last CPU segment
+		self.num_out = array('q', [0]) * num_tasks # The number of outgoing tasks
+		self.deadline = array('d', [0]) * num_tasks # Deadline of the task
+		self.res_time = array('d', [0]) * num_tasks # Response time of the task
+
+		# The tasks corresponding to input data dependency in the compressed sparse row format, i.e., the #
+		# dependencies of task i are dep_idx[dep_ptr[i]:dep_ptr[i + 1]] #
+		self.dep_ptr = array('q', [0])
+		self.dep_idx = array('q')
+		for i in range(num_tasks):
+			self.dep_idx.extend(dep_list[i])
+			self.dep_ptr.append(len(self.dep_idx))
+
+	# The tasks corresponding to input data dependency of a task #
+	def dep(self, t_id):
+		return self.dep_idx[self.dep_ptr[t_id]:self.dep_ptr[t_id + 1]]
+
+	# The number of data dependencies (i.e., edges) of the graph #
+	def num_edge(self):
+		return len(self.dep_idx)
+
+# Create a graph using the arrays of its structure (i.e., the task types, the data dependencies in the #
+# compressed sparse row format, and the number of outgoing tasks), which are shared instead of copied, where #
+# the times of the tasks are not specified yet #
+def graph_struct(num_tasks, t_type, dep_ptr, dep_idx, num_out):
+	task_graph = graph.__new__(graph)
+	task_graph.num_tasks = num_tasks
+	task_graph.t_type = t_type
+	task_graph.dep_ptr = dep_ptr
+	task_graph.dep_idx = dep_idx
+	task_graph.num_out = num_out
+
+	for attr in ['exe_time', 'cpu1_time', 'memcopy1_time', 'gpu_time', 'memcopy2_time', 'cpu2_time', 'deadline', 'res_time']:
+		setattr(task_graph, attr, array('d', [0]) * num_tasks)
+
+	return task_graph
+
+# Define the status of the tasks #
+class task_status(IntEnum):
+	none = 0 # Not dispatched yet
+	# [CPU-only task]
+	s_cpu = 1 # CPU-only task started
+	f_cpu = 2 # CPU-only task finished
+	# [GPU-using task]
+	s_cpu1 = 3 # Initial CPU segment started
+	f_cpu1 = 4 # Initial CPU segment finished
+	s_memcopy1 = 5 # Memory copy from host to device started
+	s_gpu = 6 # GPU segment started (i.e., memory copy from host to device finished)
+	s_memcopy2 = 7 # Memory copy from device to host started (i.e., GPU segment finished)
+	f_memcopy2 = 8 # Memory copy from device to host finished
+	s_cpu2 = 9 # Last CPU segment started
+	f_cpu2 = 10 # Last CPU segment finished
+
+# The transitions of the status of the tasks, i.e., status: the next statuses #
+status_trans = {
+	task_status.none: (task_status.s_cpu, task_status.s_cpu1),
+	task_status.s_cpu: (task_status.f_cpu,),
+	task_status.f_cpu: (),
+	task_status.s_cpu1: (task_status.f_cpu1,),
+	task_status.f_cpu1: (task_status.s_memcopy1,),
+	task_status.s_memcopy1: (task_status.s_gpu,),
+	task_status.s_gpu: (task_status.s_memcopy2,),
+	task_status.s_memcopy2: (task_status.f_memcopy2,),
+	task_status.f_memcopy2: (task_status.s_cpu2,),
+	task_status.s_cpu2: (task_status.f_cpu2,),
+	task_status.f_cpu2: ()
+}
+
+# The next statuses of each status as a bit mask, which is used to check the transitions #
+status_trans_mask = [0] * len(task_status)
+for status in status_trans:
+	for next_status in status_trans[status]:
+		status_trans_mask[status] |= 1 << next_status
+
+# Define the state of the tasks in a mapping run, which is allocated in bulk for each run (-1: not specified) #
+class task_state:
+	__slots__ = ('thr_id', 'status', 'num_status', 's_time_cpu', 'f_time_cpu', 's_time_cpu1', 'f_time_cpu1', 's_time_memcopy1', 'f_time_memcopy1', 's_time_gpu', 'f_time_gpu', 's_time_memcopy2', 'f_time_memcopy2', 's_time_cpu2', 'f_time_cpu2')
+
+	def __init__(self, num_tasks):
+		self.thr_id = array('q', [-1]) * num_tasks # Thread ID
+		self.status = array('b', [task_status.none]) * num_tasks # Status of the task (task_status)
+		self.num_status = [0] * len(task_status) # The number of tasks in each status
+		self.num_status[task_status.none] = num_tasks
+		self.s_time_cpu = array('d', [-1]) * num_tasks # Start time of the CPU-only task
+		self.f_time_cpu = array('d', [-1]) * num_tasks # Finish time of the CPU-only task
+		self.s_time_cpu1 = array('d', [-1]) * num_tasks # Start time of the initial CPU segment
+		self.f_time_cpu1 = array('d', [-1]) * num_tasks # Finish time of the initial CPU segment
+		self.s_time_memcopy1 = array('d', [-1]) * num_tasks # Start time of the memory copy from host to device
+		self.f_time_memcopy1 = array('d', [-1]) * num_tasks # Finish time of the memory copy from host to device
+		self.s_time_gpu = array('d', [-1]) * num_tasks # Start time of the GPU segment
+		self.f_time_gpu = array('d', [-1]) * num_tasks # Finish time of the GPU segment
+		self.s_time_memcopy2 = array('d', [-1]) * num_tasks # Start time of the memory copy from device to host
+		self.f_time_memcopy2 = array('d', [-1]) * num_tasks # Finish time of the memory copy from device to host
+		self.s_time_cpu2 = array('d', [-1]) * num_tasks # Start time of the last CPU segment
+		self.f_time_cpu2 = array('d', [-1]) * num_tasks # Finish time of the last CPU segment
+
+	# Change the status of a task, where an illegal transition is detected in the debug mode of Python #
+	def set_status(self, t_id, status):
+		prev_status = self.status[t_id]
+		assert status_trans_mask[prev_status] >> status & 1, 'Illegal transition of task ' + str(t_id) + ' from ' + task_status(prev_status).name + ' to ' + task_status(status).name
+
+		self.status[t_id] = status
+		self.num_status[prev_status] -= 1
+		self.num_status[status] += 1
 
 # Generate the graph based on a predefined structure #
+# The structure of the benchmark is loaded once in the process, and then shared by the graphs #
 def graph_predef(bench_name, gpu_task_num):
-	global out_list
+	data = load_bench(bench_name)
+	num_tasks = len(data.num_out)
+
+	# Determine task type of the tasks #
+	gpu_task_set = set(gpu_task_num)
+	t_type = array('b', [0]) * num_tasks # CPU-only task
+	for i in gpu_task_set:
+		if i < num_tasks:
+			t_type[i] = 1 # GPU-using task
+
+	task_graph = graph_struct(num_tasks, t_type, data.dep_ptr, data.dep_idx, data.num_out)
+
+	return num_tasks, task_graph
 
+# Parse the file of a predefined structure, i.e., the number of tasks and the data dependencies of each task #
+def parse_predef(bench_name):
 	num_tasks = 0
-	task_list = []
+	edge_list = [] # The data dependencies, i.e., [source task, destination task]
 
 	# Open the file and read the contents #
 	file = open("benchmark/" + bench_name + "_tdg_modified.dot", "r")
 	lines = file.readlines()
 	file.close()
 
-	# Fetch the number of tasks #
+	# Fetch the number of tasks and the data dependencies #
 	for line in lines:
-		line_arr = line.strip().split("->")
+		line_arr = [int(i) for i in line.strip().split("->")]
 
-		for i in range(len(line_arr)):
-			if int(line_arr[i]) > num_tasks:
-				num_tasks = int(line_arr[i])
+		for i in line_arr:
+			if i > num_tasks:
+				num_tasks = i
 
-	num_tasks += 1
-
-	# Initialize the list of tasks #
-	for i in range(num_tasks):
-		task_list.append(task(i, None, None, None, None, None, None, None, None, None, [], None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None))
+		if len(line_arr) == 2:
+			edge_list.append(line_arr)
 
-	# Determine task type of the tasks #
-	for i in range(num_tasks):
-		if i not in gpu_task_num:
-			task_list[i].t_type = 0 # CPU-only task
-		else:
-			task_list[i].t_type = 1 # GPU-using task
+	num_tasks += 1
 
 	# Specify data dependencies between the tasks #
-	for line in lines:
-		line_arr = line.strip().split("->")
+	dep_list = [[] for i in range(num_tasks)]
+	for edge in edge_list:
+		dep_list[edge[1]].append(edge[0])
 
-		if len(line_arr) == 2:
-			task_list[int(line_arr[1])].dep.append(task_list[int(line_arr[0])])
+	return num_tasks, dep_list
 
-	# Determine the number of all outgoing tasks of the tasks #
-	for i in range(num_tasks):
-		out_list = []
-		num_out_task_predef(i, lines)
-
-		task_list[i].num_out = len(out_list)
+# Create the random generator of an iteration, whose seed is derived from the master seed and the index of #
+# the iteration, so each iteration gets its own stream of random numbers and can be regenerated alone #
+def iteration_rng(master_seed, itr):
+	return random.Random(iteration_seed(master_seed, itr))
 
-	return num_tasks, task_list
+# The seed of the random generator of an iteration (a 64-bit integer) #
+def iteration_seed(master_seed, itr):
+	return int.from_bytes(hashlib.sha256((str(master_seed) + '/' + str(itr)).encode()).digest()[:8], 'little')
 
 # Generate the graph randomly #
-def graph_rand(max_num_tasks, type_pro, ran_pro, gpu_task_num):
-	global out_list
-
+# The random numbers are drawn from rng (e.g., the generator of the iteration), where the random module is #
+# used by default #
+def graph_rand(max_num_tasks, type_pro, ran_pro, gpu_task_num, rng = random):
 	# Determine the number of tasks #
 	num_GPU_tasks = round(max_num_tasks * type_pro / 10) # Number of GPU-using tasks
 	num_CPU_tasks = round(max_num_tasks - (max_num_tasks * type_pro)) # Number of CPU-only tasks
 	num_tasks = num_CPU_tasks + num_GPU_tasks # Number of tasks
 
-	# Initialize the list of tasks #
-	task_list = []
-	for i in range(num_tasks):
-		task_list.append(task(i, None, None, None, None, None, None, None, None, None, [], None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None))
-
 	# Specify the task type #
 	gpu_task_num = []
+	gpu_task_set = set() # The GPU-using tasks as a set to check whether a task is selected
 	while (len(gpu_task_num) < num_GPU_tasks):
-		task_id = random.randint(0, num_tasks - 1)
+		task_id = rng.randint(0, num_tasks - 1)
 
-		if task_id not in gpu_task_num:
+		if task_id not in gpu_task_set:
 			gpu_task_num.append(task_id)
+			gpu_task_set.add(task_id)
 
+	t_type = []
 	for i in range(num_tasks):
-		if i in gpu_task_num:
-			task_list[i].t_type = 1
+		if i in gpu_task_set:
+			t_type.append(1)
 		else:
-			task_list[i].t_type = 0
+			t_type.append(0)
 
 	# Specify data dependencies between the tasks #
-	M = [ [ 0 for i in range(num_tasks) ] for j in range(num_tasks) ]
+	dep_list = rand_dep(num_tasks, ran_pro, rng)
 
-	for i in range(num_tasks):
-		for j in range(num_tasks)[:i:]:
-			if random.random() < ran_pro:
-				M[i][j] = 1
+	# Create the graph #
+	task_graph = graph(num_tasks, t_type, dep_list)
 
-	num_edge = 0 # Number of edges
+	# Determine the number of all outgoing tasks of the tasks #
+	num_out_task(task_graph)
 
-	for j in range(num_tasks):
-		dep_list = []
-		for i in range(num_tasks):
-			if (i != j) and (M[i][j] == 1):
-				dep_list.append(i)
-				num_edge += 1
-		
-		for k in range(len(dep_list)):
-			task_list[j].dep.append(task_list[dep_list[k]])
-
-	# Write the result to the file #
-	file = open("output/num_edge.dat", "a")
-	file.write(str(num_edge) + "\n")
-	file.close()
+	return num_tasks, task_graph, gpu_task_num
 
-	# Determine the number of all outgoing tasks of the tasks #
-	task_arr = []
-	proc_list = []
-	for i in range(num_tasks):
-		if len(task_list[i].dep) != 0:
-			for j in range(len(task_list[i].dep)):
-				task_arr.append([task_list[i].dep[j].t_id, task_list[i].t_id])
-				proc_list.append(task_list[i].dep[j].t_id)
-	for i in range(num_tasks):
-		if i not in proc_list:
-			task_arr.append([i])
+# Select the data dependencies of the random graph, where each pair of tasks (i, j) with j < i is selected #
+# with the probability ran_pro, and then task j depends on task i #
+# Instead of drawing a random number for each pair, the number of pairs skipped before the next selected #
+# pair is drawn from the geometric distribution, so the time depends on the number of edges #
+def rand_dep(num_tasks, ran_pro, rng = random):
+	dep_list = [[] for i in range(num_tasks)] # The data dependencies of each task
 
-	for i in range(num_tasks):
-		out_list = []
-		num_out_task_rand(i, task_arr)
+	if ran_pro <= 0:
+		return dep_list
 
-		task_list[i].num_out = len(out_list)
+	num_pairs = num_tasks * (num_tasks - 1) // 2 # Number of pairs, which are numbered row by row (i.e., by i)
+	if ran_pro < 1:
+		log_q = math.log(1 - ran_pro)
 
-	return num_tasks, task_list, gpu_task_num
+	pair = -1 # The selected pair
+	i = 1 # The row of the selected pair
+	row_start = 0 # The first pair of the row, where the pairs of row i are (i, 0) to (i, i - 1)
 
-# Specify the number of outgoing tasks of a certain task based on the predefined structure #
-def num_out_task_predef(task_id, lines):
-	global out_list
+	while True:
+		# Skip the pairs that are not selected #
+		if ran_pro < 1:
+			pair += 1 + int(math.log(1 - rng.random()) / log_q)
+		else:
+			pair += 1
 
-	for line in lines:
-		line_arr = line.strip().split("->")
+		if pair >= num_pairs:
+			break
 
-		if len(line_arr) == 2:
-			if int(line_arr[0].strip()) == task_id:
-				if int(line_arr[1].strip()) not in out_list:
-					out_list.append(int(line_arr[1].strip()))
-					#print(int(line_arr[1].strip()))
+		# Find the row of the pair #
+		while pair >= row_start + i:
+			row_start += i
+			i += 1
 
-					num_out_task_predef(int(line_arr[1].strip()), lines)
+		dep_list[pair - row_start].append(i)
 
-# Specify the number of outgoing tasks of a certain task based on the random structure #
-def num_out_task_rand(task_id, task_arr):
-	global out_list
+	return dep_list
 
-	for i in range(len(task_arr)):
-		if len(task_arr[i]) == 2:
-			if task_arr[i][0] == task_id:
-				if task_arr[i][1] not in out_list:
-					out_list.append(task_arr[i][1])
+# Specify the number of all outgoing tasks (i.e., the tasks depending on the task directly or indirectly) #
+# of the tasks in one pass over the graph in reverse topological order #
+# The outgoing tasks of a task are kept as a bit set in an integer (bit i: task i), which is merged into the #
+# bit sets of the tasks it depends on once all of its own outgoing tasks are merged into it, and then freed #
+def num_out_task(task_graph):
+	num_tasks = task_graph.num_tasks
+	dep_ptr = task_graph.dep_ptr
+	dep_idx = task_graph.dep_idx
 
-					num_out_task_rand(task_arr[i][1], task_arr)
+	# The number of data dependencies on each task that are not merged yet #
+	num_left = [0] * num_tasks
+	for i in dep_idx:
+		num_left[i] += 1
+
+	out_set = [0] * num_tasks # The bit set of the outgoing tasks of each task
+	stack = [i for i in range(num_tasks) if num_left[i] == 0] # The tasks whose outgoing tasks are all merged
+	num_done = 0
+
+	while stack:
+		task = stack.pop()
+		num_done += 1
+
+		task_graph.num_out[task] = out_set[task].bit_count()
+		task_bit = out_set[task] | (1 << task) # The task and its outgoing tasks
+		out_set[task] = 0
+
+		for i in dep_idx[dep_ptr[task]:dep_ptr[task + 1]]:
+			out_set[i] |= task_bit
+			num_left[i] -= 1
+
+			if num_left[i] == 0:
+				stack.append(i)
+
+	if num_done != num_tasks:
+		raise ValueError('The graph of tasks has a cycle of data dependencies')
+
+# Read GPU-using task number(s) of a benchmark, where each call gets a new list of the task numbers #
+def read_gpu_task(bench_name):
+	return list(load_bench(bench_name).gpu_task_num)
+
+# Parse the file of GPU-using task number(s) #
+def parse_gpu_task(bench_name):
+	gpu_task_num = []
 
-# Read GPU-using task number(s) from file
-def read_gpu_task(bench_name, gpu_task_num):
 	# Read the file as lines #
 	with open("benchmark/" + bench_name + "_gpu_task.dat") as f:
 		lines = f.readlines() # Content of the file
-		f.close() # Close the file
 
 	# Traverse the file to find tasks numbers #
 	for i in range(len(lines)):
@@ -227,75 +342,331 @@ def read_gpu_task(bench_name, gpu_task_num):
 			min_range = int(sp_line[0])
 			max_range = int(sp_line[1])
 
-			for i in range (min_range, max_range + 1):
-				gpu_task_num.append(i)
+			for j in range (min_range, max_range + 1):
+				gpu_task_num.append(j)
 		else:
 			gpu_task_num.append(int(lines[i].replace("\n", "")))
 
 	return gpu_task_num
 
+# Parse the GPU trace file, i.e., the durations of the memory copies and the kernels #
+def parse_gpu_trace(bench_name):
+	with open("benchmark/" + bench_name + "_gpu_trace.csv") as f:
+		lines_csv = f.readlines() # Content of the file
+
+	mem_copy = []
+	kernel = []
+	for i in range (len(lines_csv)):
+		if (lines_csv[i].find('memcopy:start') != -1) or (lines_csv[i].find('memcopy:terminate') != -1):
+			sp_line = lines_csv[i].split(', memcopy') # Split the line
+			mem_copy.append(int(sp_line[0]))
+
+		if (lines_csv[i].find('kernel') != -1):
+			sp_line = lines_csv[i].split(', kernel') # Split the line
+			kernel.append(int(sp_line[0]))
+
+	mem_copy_diff = []
+	for j in range (0, len(mem_copy), 2):
+		mem_copy_diff.append(mem_copy[j + 1] - mem_copy[j])
+
+	kernel_diff = []
+	for j in range (0, len(kernel), 2):
+		kernel_diff.append(kernel[j + 1] - kernel[j])
+
+	return mem_copy_diff, kernel_diff
+
+# Read a JSON file as a stream, where the objects and arrays are walked one item at a time, so only the #
+# item being read is kept in the memory #
+class json_stream:
+	def __init__(self, file, chunk_size = 1 << 16):
+		self.file = file
+		self.chunk_size = chunk_size # Number of characters read from the file at once
+		self.buf = '' # The characters read from the file
+		self.pos = 0 # The position of the next character in the buffer
+		self.eof = False # Whether the file is read to the end
+		self.decoder = json.JSONDecoder()
+
+	# Read the next chunk of the file to the buffer, where the characters already walked are dropped #
+	def read(self):
+		chunk = self.file.read(self.chunk_size)
+		if chunk == '':
+			self.eof = True
+
+		self.buf = self.buf[self.pos:] + chunk
+		self.pos = 0
+
+	# Return the next character after the white spaces without walking it ('': end of the file) #
+	def peek(self):
+		while True:
+			while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\n\r':
+				self.pos += 1
+
+			if self.pos < len(self.buf) or self.eof:
+				return self.buf[self.pos:self.pos + 1]
+
+			self.read()
+
+	# Walk a certain character #
+	def expect(self, char):
+		if self.peek() != char:
+			raise ValueError('Invalid JSON: expected ' + repr(char) + ' at ' + repr(self.buf[self.pos:self.pos + 20]))
+
+		self.pos += 1
+
+	# Read the next value as a whole #
+	def value(self):
+		self.peek()
+
+		while True:
+			try:
+				value, end = self.decoder.raw_decode(self.buf, self.pos)
+
+				# A number at the end of the buffer, or followed by a character that continues a number (e.g., #
+				# '1' followed by '.5' of the next chunk, which is decoded as 1 otherwise), may continue in the #
+				# next chunk #
+				if self.eof or (end < len(self.buf) and not (isinstance(value, (int, float)) and self.buf[end] in '0123456789.eE+-')):
+					self.pos = end
+					return value
+			except json.JSONDecodeError:
+				if self.eof:
+					raise
+
+			self.read()
+
+	# Walk the items of the next object, where the key of each item is returned and its value has to be #
+	# walked by the caller #
+	def items(self):
+		self.expect('{')
+		if self.peek() == '}':
+			self.pos += 1
+			return
+
+		while True:
+			key = self.value()
+			self.expect(':')
+
+			yield key
+
+			if self.peek() == ',':
+				self.pos += 1
+			else:
+				self.expect('}')
+				return
+
+	# Walk the elements of the next array, where each element has to be walked by the caller #
+	def elements(self):
+		self.expect('[')
+		if self.peek() == ']':
+			self.pos += 1
+			return
+
+		while True:
+			yield
+
+			if self.peek() == ',':
+				self.pos += 1
+			else:
+				self.expect(']')
+				return
+
+# Read the execution times of the tasks from the JSON file of a benchmark, i.e., the "execution_total_time" #
+# of the results of each node of the task graphs #
+# The file is read as a stream, and the times of each task are kept as [minimum, average, maximum] instead #
+# of all samples #
+def parse_bench_et(bench_name):
+	et_sum = {} # The task number: [minimum, sum, number, maximum] of the times
+
+	with open("benchmark/" + bench_name + "_json.json") as f:
+		stream = json_stream(f)
+
+		for name in stream.items(): # The benchmarks
+			for i in stream.elements(): # The task graphs
+				for key in stream.items():
+					if key != 'nodes':
+						stream.value()
+						continue
+
+					for t_id in stream.items(): # The nodes (i.e., tasks)
+						node = stream.value()
+
+						for result in node.get('results', []):
+							et = int(result['execution_total_time'])
+
+							if int(t_id) not in et_sum:
+								et_sum[int(t_id)] = [et, 0, 0, et]
+
+							et_stat = et_sum[int(t_id)]
+							et_stat[0] = min(et_stat[0], et)
+							et_stat[1] += et
+							et_stat[2] += 1
+							et_stat[3] = max(et_stat[3], et)
+
+	index = {}
+	for t_id in et_sum:
+		et_stat = et_sum[t_id]
+		index[t_id] = {'min': et_stat[0], 'avg': round(et_stat[1] / et_stat[2]), 'max': et_stat[3]}
+
+	return index
+
+# Define the preprocessed data of a benchmark, which is built from the files of the benchmark and kept in #
+# a cache file, where all attributes are arrays of integers #
+class bench_data:
+	__slots__ = ('gpu_task_num', 'dep_ptr', 'dep_idx', 'num_out', 'et_min', 'et_avg', 'et_max', 'mem_copy_diff', 'kernel_diff')
+
+# The files of a benchmark, where the cache file is built again if any of them changes #
+def bench_files(bench_name):
+	return ["benchmark/" + bench_name + "_tdg_modified.dot", "benchmark/" + bench_name + "_json.json", "benchmark/" + bench_name + "_gpu_task.dat", "benchmark/" + bench_name + "_gpu_trace.csv"]
+
+# Load the data of a benchmark, which is done once in the process #
+# The data is read from the cache file of the benchmark if the file is built from the current contents of the #
+# files of the benchmark (i.e., the same hash); otherwise, the files are parsed and the cache file is built #
+def load_bench(bench_name):
+	if bench_name not in bench_cache:
+		cache_file = "benchmark/" + bench_name + "_cache.bin"
+
+		# Calculate the hash of the contents of the files #
+		file_hash = hashlib.sha256()
+		for file_name in bench_files(bench_name):
+			with open(file_name, 'rb') as f:
+				while True:
+					chunk = f.read(1 << 20)
+					if not chunk:
+						break
+					file_hash.update(chunk)
+		digest = file_hash.digest()
+
+		data = None
+		if os.path.exists(cache_file):
+			data = read_bench_cache(cache_file, digest)
+
+		if data == None:
+			data = build_bench(bench_name)
+			write_bench_cache(cache_file, digest, data)
+
+		bench_cache[bench_name] = data
+
+	return bench_cache[bench_name]
+
+# Parse the files of a benchmark #
+def build_bench(bench_name):
+	data = bench_data()
+
+	data.gpu_task_num = array('q', parse_gpu_task(bench_name))
+
+	# The structure of the graph #
+	num_tasks, dep_list = parse_predef(bench_name)
+	task_graph = graph(num_tasks, [0] * num_tasks, dep_list)
+	num_out_task(task_graph)
+
+	data.dep_ptr = task_graph.dep_ptr
+	data.dep_idx = task_graph.dep_idx
+	data.num_out = task_graph.num_out
+
+	# The execution times of the tasks #
+	et_index = parse_bench_et(bench_name)
+	for et_type in ['min', 'avg', 'max']:
+		et_list = array('q')
+		for i in range(num_tasks):
+			if i not in et_index:
+				raise ValueError('No execution time of task ' + str(i) + ' in the JSON file of ' + bench_name)
+
+			et_list.append(et_index[i][et_type])
+
+		setattr(data, 'et_' + et_type, et_list)
+
+	# The times of the memory copies and the kernels #
+	mem_copy_diff, kernel_diff = parse_gpu_trace(bench_name)
+	data.mem_copy_diff = array('q', mem_copy_diff)
+	data.kernel_diff = array('q', kernel_diff)
+
+	return data
+
+# Write the data of a benchmark to its cache file, i.e., the header, the hash of the files of the benchmark, #
+# and then the length and the items of each array of the data (in the native byte order) #
+# The file is written to a temporary file of the process that is renamed at the end, so the cache file is #
+# never partial #
+def write_bench_cache(cache_file, digest, data):
+	tmp_file = cache_file + '.' + str(os.getpid()) + '.tmp'
+
+	with open(tmp_file, 'wb') as f:
+		f.write(bench_cache_magic)
+		f.write(array('q', [bench_cache_version]).tobytes())
+		f.write(digest)
+
+		for attr in bench_data.__slots__:
+			values = getattr(data, attr)
+			f.write(array('q', [len(values)]).tobytes())
+			f.write(values.tobytes())
+
+	os.replace(tmp_file, cache_file)
+
+# Read the data of a benchmark from its cache file, which is memory-mapped, where the arrays are copied out of #
+# the map, so the file is closed afterwards #
+# None is returned if the file is not built from the current files of the benchmark or by this version #
+def read_bench_cache(cache_file, digest):
+	header_size = len(bench_cache_magic) + 8 + len(digest)
+
+	with open(cache_file, 'rb') as f:
+		if os.fstat(f.fileno()).st_size < header_size:
+			return None
+
+		with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+			if mm[:len(bench_cache_magic)] != bench_cache_magic:
+				return None
+
+			pos = len(bench_cache_magic)
+			if array('q', mm[pos:pos + 8])[0] != bench_cache_version or mm[pos + 8:header_size] != digest:
+				return None
+
+			data = bench_data()
+			pos = header_size
+
+			with memoryview(mm) as view:
+				for attr in bench_data.__slots__:
+					if pos + 8 > len(mm):
+						return None
+
+					num_items = array('q', mm[pos:pos + 8])[0]
+					pos += 8
+
+					if pos + 8 * num_items > len(mm):
+						return None
+
+					values = array('q')
+					values.frombytes(view[pos:pos + 8 * num_items])
+					pos += 8 * num_items
+
+					setattr(data, attr, values)
+
+	return data
+
 # Specify execution time of the tasks, as well as calculate the deadline of the system #
 # and response time of the tasks #
-def specify_et(graph_type, num_tasks, task_list, bench_name, et_min, et_max, et_type, itr_et, dl_min_task, dl_max_task, dl_min_graph, dl_max_graph, gpu_task_num):
-	if graph_type == 'y':
-		# Determine an execution time for each task based on the json file #
-		tdg_st_line_num = [] # The starting line number of each task
+# The random numbers are drawn from rng, where the random module is used by default #
+# The arrays of the graph are filled in place, where the values of all tasks are calculated together by #
+# chaining map over the arrays (i.e., the loops run in C), and the operations are done in the same order as #
+# for a single task, so the values are the same #
+def specify_et(graph_type, num_tasks, task_graph, bench_name, et_min, et_max, et_type, itr_et, dl_min_task, dl_max_task, dl_min_graph, dl_max_graph, gpu_task_num, rng = random):
+	t_type = task_graph.t_type
 
-		# Read the json file as lines #
-		with open("benchmark/" + bench_name + "_json.json") as f:
-			lines_json = f.readlines() # Content of the file
-			f.close() # Close the file
+	# The multiplier of the values of the GPU-using tasks (i.e., 10), which is 1 for the CPU-only tasks #
+	gpu_mul = list(map((1, 10).__getitem__, t_type))
 
-		# Traverse the file to find the starting line number of each task #
-		for i in range(num_tasks):
-			for j in range(len(lines_json)):
-				# Check whether the task number (i) is found in the current line #
-				if (lines_json[j].find('"' + str(i) + '":') != -1):
-					tdg_st_line_num.append(j) # Set the starting line number
+	# The times of the segments of the GPU-using tasks are calculated just for them (in the order of the tasks), #
+	# and then placed using the position of each task among them (1, 2, ...; 0 for the CPU-only tasks, whose #
+	# times are 0) #
+	gpu_pos = list(map(mul, accumulate(t_type), t_type))
 
-		# Determine execution time for each task #
-		for i in range(num_tasks):
-			exe_list = [] # The list of execution times
-			st_line_num = tdg_st_line_num[i] # The starting line number of the task
+	if graph_type == 'y':
+		data = load_bench(bench_name)
 
-			# Specify the finishing line number of the task #
-			if i != num_tasks - 1:
-				fn_line_num = tdg_st_line_num[i + 1] - 1
-			else:
-				fn_line_num = len(lines_json) - 1
-
-			# Find execution total times in the json and add it to the list #
-			for j in range (st_line_num, fn_line_num):
-				# Check whether execution total time exists in the current line #
-				if (lines_json[j].find('execution_total_time') != -1):
-					sp_line = lines_json[j].split(':') # Split the line
-					et = int(sp_line[1].strip()) # Fetch the execution total time from the line
-					exe_list.append(et) # Add the execution time to the list
-
-			# Determine the execution time based on the minimum value #
-			if et_type == 'min':
-				task_list[i].exe_time = min(exe_list)
-			# Determine the execution time based on the average value #
-			elif et_type == 'avg':
-				task_list[i].exe_time = round(sum(exe_list) / len(exe_list))
-			# Determine the execution time based on the maximum value #
-			elif et_type == 'max':
-				task_list[i].exe_time = max(exe_list)
-
-		# Determine detailed times for GPU-using tasks #
-		with open("benchmark/" + bench_name + "_gpu_trace.csv") as f:
-			lines_csv = f.readlines() # Content of the file
-			f.close() # Close the file
-
-		mem_copy = []
-		for i in range (len(lines_csv)):
-			if (lines_csv[i].find('memcopy:start') != -1) or (lines_csv[i].find('memcopy:terminate') != -1):
-				sp_line = lines_csv[i].split(', memcopy') # Split the line
-				mem_copy.append(int(sp_line[0]))
-
-		mem_copy_diff = []
-		for j in range (0, len(mem_copy), 2):
-			mem_copy_diff.append(mem_copy[j + 1] - mem_copy[j])
+		# Determine an execution time for each task based on the json file, i.e., the minimum, average, or #
+		# maximum value of the execution times of the task #
+		et_list = getattr(data, 'et_' + et_type)
+		task_graph.exe_time[:] = array('d', et_list[:num_tasks])
+
+		# Determine detailed times for GPU-using tasks based on the GPU trace file #
+		mem_copy_diff = data.mem_copy_diff
 
 		if et_type == 'min': # The minimum value #
 			mem_copy_time = min(mem_copy_diff)
@@ -304,96 +675,76 @@ def specify_et(graph_type, num_tasks, task_list, bench_name, et_min, et_max, et_
 		elif et_type == 'max': # The maximum value #
 			mem_copy_time = max(mem_copy_diff)
 
-		for k in range(num_tasks):
-			if task_list[k].t_type == 1:
-				task_list[k].memcopy1_time = mem_copy_time
-				task_list[k].memcopy2_time = mem_copy_time
+		task_graph.memcopy1_time[:] = array('d', map(mul, t_type, repeat(mem_copy_time)))
+		task_graph.memcopy2_time[:] = task_graph.memcopy1_time
 
 		# Determine the execution time for GPU-using tasks #
-		kernel = []
-		for i in range (len(lines_csv)):
-			if (lines_csv[i].find('kernel') != -1):
-				sp_line = lines_csv[i].split(', kernel') # Split the line
-				kernel.append(int(sp_line[0]))
-
-		kernel_diff = []
-		for j in range (0, len(kernel), 2):
-			kernel_diff.append(kernel[j + 1] - kernel[j])
+		kernel_diff = data.kernel_diff
 
 		for i in range(len(gpu_task_num)):
-			for j in range(num_tasks):
-				if (gpu_task_num[i] == j):
-					task_list[j].gpu_time = kernel_diff[i]
+			if 0 <= gpu_task_num[i] < num_tasks:
+				task_graph.gpu_time[gpu_task_num[i]] = kernel_diff[i]
 
-		# Determine execution time of the CPU segments for GPU-using tasks #
-		for i in range(num_tasks):
-			if task_list[i].t_type == 1:
-				task_list[i].cpu1_time = round(abs(task_list[i].exe_time - (task_list[i].memcopy1_time + task_list[i].gpu_time + task_list[i].memcopy2_time)) / 2)
-				task_list[i].cpu2_time = task_list[i].cpu1_time
+		# Determine execution time of the CPU segments for GPU-using tasks, i.e., #
+		# round(abs(exe_time - (memcopy1_time + gpu_time + memcopy2_time)) / 2) #
+		memcopy_time = list(compress(task_graph.memcopy1_time, t_type))
+		seg_time = map(add, map(add, memcopy_time, compress(task_graph.gpu_time, t_type)), memcopy_time)
+		cpu_time = [0] + list(map(round, map(truediv, map(abs, map(sub, compress(task_graph.exe_time, t_type), seg_time)), repeat(2))))
+
+		task_graph.cpu1_time[:] = array('d', map(cpu_time.__getitem__, gpu_pos))
+		task_graph.cpu2_time[:] = task_graph.cpu1_time
 	else:
 		# Specify execution times for each task based on the random procedure #
-		for i in range(num_tasks):		
-			# CPU-only task
-			if task_list[i].t_type == 0:
-				# Generate the random values #
-				ran_list = []
-				for j in range(itr_et):
-					ran_list.append(round(random.random() * (et_max - et_min)))
-
-				# Determine the execution time based on the minimum value #
-				if et_type == 'min':
-					task_list[i].exe_time = min(ran_list)
-				# Determine the execution time based on the average value #
-				elif et_type == 'avg':
-					task_list[i].exe_time = round(sum(ran_list) / len(ran_list))
-				# Determine the execution time based on the maximum value #
-				elif et_type == 'max':
-					task_list[i].exe_time = max(ran_list)
-			# GPU-using task
-			else:
-				# Generate the random values #
-				ran_list = []
-				for j in range(itr_et):
-					ran_list.append(round(random.random() * (et_max - et_min) * 10))
-
-				# Determine the execution time based on the minimum value #
-				if et_type == 'min':
-					task_list[i].exe_time = min(ran_list)
-				# Determine the execution time based on the average value #
-				elif et_type == 'avg':
-					task_list[i].exe_time = round(sum(ran_list) / len(ran_list))
-				# Determine the execution time based on the maximum value #
-				elif et_type == 'max':
-					task_list[i].exe_time = max(ran_list)
-				
-				# Specify the memory copy times #
-				task_list[i].memcopy1_time = round(task_list[i].exe_time * 0.05, 2)
-				task_list[i].memcopy2_time = round(task_list[i].exe_time * 0.05, 2)
-
-				# Specify the execution time of the GPU segment #
-				task_list[i].gpu_time = round(task_list[i].exe_time * 0.85, 2)
-
-				# Specify the execution time of the CPU segments #
-				task_list[i].cpu1_time = round(abs(task_list[i].exe_time - (task_list[i].memcopy1_time + task_list[i].gpu_time + task_list[i].memcopy2_time)) / 2, 2)
-				task_list[i].cpu2_time = task_list[i].cpu1_time
-
-	# Specify the deadline of the task #
-	for i in range(num_tasks):
-		# CPU-only task
-		if task_list[i].t_type == 0:
-			task_list[i].deadline = random.randint(dl_min_task, dl_max_task)
-		# GPU-using task
+		# The random values of all tasks are drawn at once (itr_et values for each task, in the order of the #
+		# tasks), i.e., round(random * (et_max - et_min)), which is multiplied by 10 before rounding for #
+		# GPU-using tasks, and then the values of the tasks are reduced together, where the j-th list of #
+		# ran_list includes the j-th value of each task #
+		ran_all = list(map(mul, starmap(rng.random, repeat((), num_tasks * itr_et)), repeat(et_max - et_min)))
+
+		ran_list = []
+		for j in range(itr_et):
+			ran_list.append(list(map(round, map(mul, ran_all[j::itr_et], gpu_mul))))
+
+		# Determine the execution time based on the minimum value #
+		if et_type == 'min':
+			task_graph.exe_time[:] = array('d', map(min, zip(*ran_list)))
+		# Determine the execution time based on the average value #
+		elif et_type == 'avg':
+			task_graph.exe_time[:] = array('d', map(round, map(truediv, map(sum, zip(*ran_list)), repeat(itr_et))))
+		# Determine the execution time based on the maximum value #
+		elif et_type == 'max':
+			task_graph.exe_time[:] = array('d', map(max, zip(*ran_list)))
 		else:
-			task_list[i].deadline = random.randint(dl_min_task, dl_max_task) * 10
+			raise ValueError('Unknown execution time type: ' + str(et_type))
 
-	# Determine the deadline of the system #
-	sum_et = 0
-	for i in range(num_tasks):
-		sum_et += task_list[i].exe_time
-	deadline = random.randint(dl_min_graph, dl_max_graph) * sum_et
+		# Specify the memory copy times and the execution time of the GPU segment for GPU-using tasks, i.e., #
+		# round(exe_time * 0.05, 2) and round(exe_time * 0.85, 2), where the execution times are whole #
+		# numbers, so they are exactly exe_time / 20 and exe_time * 17 / 20 (the execution time is taken as 0 #
+		# for CPU-only tasks, so their values are 0) #
+		gpu_exe_time = list(map(mul, task_graph.exe_time, t_type))
 
-	# Calculate response time of the tasks #
-	for i in range(num_tasks):
-		task_list[i].res_time = round(deadline * task_list[i].exe_time / sum_et)
+		task_graph.memcopy1_time[:] = array('d', map(truediv, gpu_exe_time, repeat(20)))
+		task_graph.memcopy2_time[:] = task_graph.memcopy1_time
+		task_graph.gpu_time[:] = array('d', map(truediv, map(mul, gpu_exe_time, repeat(17)), repeat(20)))
+
+		# Determine execution time of the CPU segments for GPU-using tasks, i.e., #
+		# round(abs(exe_time - (memcopy1_time + gpu_time + memcopy2_time)) / 2, 2) #
+		memcopy_time = list(compress(task_graph.memcopy1_time, t_type))
+		seg_time = map(add, map(add, memcopy_time, compress(task_graph.gpu_time, t_type)), memcopy_time)
+		cpu_time = [0] + list(map(round, map(truediv, map(abs, map(sub, compress(task_graph.exe_time, t_type), seg_time)), repeat(2)), repeat(2)))
+
+		task_graph.cpu1_time[:] = array('d', map(cpu_time.__getitem__, gpu_pos))
+		task_graph.cpu2_time[:] = task_graph.cpu1_time
+
+	# Specify the deadline of the task, which is multiplied by 10 for GPU-using tasks #
+	task_graph.deadline[:] = array('d', map(mul, starmap(rng.randint, repeat((dl_min_task, dl_max_task), num_tasks)), gpu_mul))
+
+	# Determine the deadline of the system, where the execution times are whole numbers, so the deadline is #
+	# an integer #
+	sum_et = int(sum(task_graph.exe_time))
+	deadline = rng.randint(dl_min_graph, dl_max_graph) * sum_et
+
+	# Calculate response time of the tasks, i.e., round(deadline * exe_time / sum_et) #
+	task_graph.res_time[:] = array('d', map(round, map(truediv, map(mul, repeat(deadline), task_graph.exe_time), repeat(sum_et))))
 
-	return task_list, deadline
+	return task_graph, deadline
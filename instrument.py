@@ -0,0 +1,280 @@
+ #**************************************************************************
+ # instrument.py
+ #
+ # Profile the mapping process, i.e., the wall-clock time of its phases,
+ # the calls and latency of the mapping algorithms, and the number of time
+ # units, events, dependency checks, dispatches, and queue operations, as
+ # well as the optional cProfile and tracemalloc captures, and write them to
+ # a JSON report. The simulator is instrumented only when a profiler is active, so
+ # the mapping process does not pay for it otherwise.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from time import perf_counter_ns
+import json
+import os
+import mapping
+
+# Number of functions (cProfile) and lines (tracemalloc) written to the report #
+report_top = 30
+
+# Define a timer of a phase or an algorithm, i.e., the number of calls, total time, and maximum time #
+class timer:
+	__slots__ = ['calls', 'total', 'max']
+
+	def __init__(self):
+		self.calls = 0
+		self.total = 0 # Nanoseconds
+		self.max = 0 # Nanoseconds
+
+	# Wrap a function, so each call of it is measured by the timer #
+	def wrap(self, function):
+		def timed(*args):
+			start = perf_counter_ns()
+			try:
+				return function(*args)
+			finally:
+				elapsed = perf_counter_ns() - start
+
+				self.calls += 1
+				self.total += elapsed
+				if elapsed > self.max:
+					self.max = elapsed
+
+		return timed
+
+	def report(self):
+		return {'calls': self.calls, 'total': self.total / 1e9, 'mean': self.total / self.calls / 1e9 if self.calls > 0 else 0, 'max': self.max / 1e9}
+
+# Define the proxy of an object used by the simulator (e.g., a mapping algorithm), where the calls of its #
+# methods are measured by the timers named "name.method" #
+# The wrapped methods are kept in the proxy, so each of them is wrapped once #
+class timed_object:
+	def __init__(self, prof, name, obj):
+		self._prof = prof
+		self._name = name
+		self._obj = obj
+
+	def __getattr__(self, attr):
+		value = getattr(self._obj, attr)
+
+		if callable(value):
+			value = self._prof.timer(self._prof.policies, self._name + '.' + attr).wrap(value)
+			setattr(self, attr, value)
+
+		return value
+
+	def __len__(self):
+		return len(self._obj)
+
+	def __iter__(self):
+		return iter(self._obj)
+
+# Define the proxy of the ready set, which also counts the data dependencies checked when a task is finished #
+# (i.e., one for each of its successors) #
+class counted_ready_set(timed_object):
+	def __init__(self, prof, obj):
+		timed_object.__init__(self, prof, 'ready_set', obj)
+		self._release = prof.timer(prof.policies, 'ready_set.release').wrap(obj.release)
+
+	def release(self, task_id):
+		self._prof.counters['dep_checks'] += len(self._obj.succ[task_id])
+		self._release(task_id)
+
+# Define an execution queue of a thread or device, which counts the tasks dispatched to it #
+class counted_queue(list):
+	def __init__(self, counters, name, tasks):
+		list.__init__(self, tasks)
+		self.counters = counters
+		self.name = name # The name of the counter
+
+	def append(self, task):
+		self.counters[self.name] += 1
+		list.append(self, task)
+
+# Define the profiler of the mapping process #
+class profiler:
+	def __init__(self, cprofile = 0, memory = 0):
+		self.phases = {} # The timers of the phases of the mapping process
+		self.policies = {} # The timers of the mapping algorithms and queues
+		self.counters = {'runs': 0, 'tasks': 0, 'ticks': 0, 'skipped_ticks': 0, 'events': 0, 'dep_checks': 0, 'cpu_dispatches': 0, 'gpu_dispatches': 0, 'queue_ops': 0}
+
+		self.cprofile_on = cprofile # The capture of cProfile; 0: Off, 1: On
+		self.cprofile = None # The profile of cProfile, which is created when profiling starts
+		self.memory = memory # The capture of tracemalloc; 0: Off, 1: On
+		self.start_time = None
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.stop()
+
+	# Find a timer, which is created at its first use #
+	def timer(self, timers, name):
+		if name not in timers:
+			timers[name] = timer()
+
+		return timers[name]
+
+	# Start profiling, i.e., instrument the simulators created from now on #
+	# cProfile, pstats, and tracemalloc are loaded only when their captures are used #
+	def start(self):
+		self.start_time = perf_counter_ns()
+		mapping.profiler = self
+
+		if self.memory == 1:
+			import tracemalloc
+			tracemalloc.start()
+		if self.cprofile_on == 1:
+			import cProfile
+			self.cprofile = cProfile.Profile()
+			self.cprofile.enable()
+
+	# Stop profiling #
+	def stop(self):
+		if self.cprofile != None:
+			self.cprofile.disable()
+
+		if mapping.profiler is self:
+			mapping.profiler = None
+
+		self.wall_time = (perf_counter_ns() - self.start_time) / 1e9
+
+		# The memory is captured before tracemalloc is stopped #
+		self.memory_report = None
+		if self.memory == 1:
+			import tracemalloc
+
+			# The memory allocated by the profiler itself is not shown in the top lines #
+			snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+			current, peak = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+
+			top = []
+			for stat in snapshot.statistics('lineno')[:report_top]:
+				top.append({'line': str(stat.traceback[0]), 'size': stat.size, 'count': stat.count})
+
+			self.memory_report = {'current': current, 'peak': peak, 'top': top}
+
+	# Instrument a simulator, where its phases are measured, its mapping algorithms, allocation queues, and #
+	# ready set are replaced by the proxies measuring their calls, and its events, dependency checks, and #
+	# dispatches are counted as they occur #
+	def attach(self, sim):
+		counters = self.counters
+
+		sim.cpu_alloc = timed_object(self, type(sim.cpu_alloc).__name__, sim.cpu_alloc)
+		sim.cpu_disp = timed_object(self, type(sim.cpu_disp).__name__, sim.cpu_disp)
+		sim.gpu = timed_object(self, type(sim.gpu).__name__, sim.gpu)
+		sim.ready_tasks = counted_ready_set(self, sim.ready_tasks)
+		for i in range(len(sim.alloc_queue)):
+			sim.alloc_queue[i] = timed_object(self, 'alloc_queue', sim.alloc_queue[i])
+
+		for i in range(len(sim.exec_queue)):
+			sim.exec_queue[i] = counted_queue(counters, 'cpu_dispatches', sim.exec_queue[i])
+		for i in range(len(sim.ker_exec_queue)):
+			sim.ker_exec_queue[i] = counted_queue(counters, 'gpu_dispatches', sim.ker_exec_queue[i])
+
+		# Each end of an execution segment taken from the events is an event, and the time units between the #
+		# current time and the next time are skipped #
+		due_events = sim.due_events
+		next_event = sim.next_event
+
+		def counted_due_events(event_heap, t):
+			res_list = due_events(event_heap, t)
+			counters['events'] += len(res_list)
+			return res_list
+
+		def counted_next_event(thr_events, dev_events, t, changed):
+			next_t = next_event(thr_events, dev_events, t, changed)
+			counters['skipped_ticks'] += next_t - t - 1
+			return next_t
+
+		sim.due_events = counted_due_events
+		sim.next_event = counted_next_event
+
+		# The phases of each time unit (the remaining time of the run is taken by advancing the time) #
+		sim.cpu_execution = self.timer(self.phases, 'cpu_execution').wrap(sim.cpu_execution)
+		sim.gpu_execution = self.timer(self.phases, 'gpu_execution').wrap(sim.gpu_execution)
+
+		run = self.timer(self.phases, 'run').wrap(sim.run)
+
+		def profiled_run():
+			t = run()
+			self.count(sim)
+			return t
+
+		sim.run = profiled_run
+
+	# Update the counters after a run of the simulator (the others are counted during the run) #
+	def count(self, sim):
+		self.counters['runs'] += 1
+		self.counters['tasks'] += sim.num_tasks
+
+	# Create the report #
+	def report(self):
+		phases = {}
+		for name in self.phases:
+			phases[name] = self.phases[name].report()
+
+		# The time of advancing the time (i.e., the run except for the CPU and GPU execution) #
+		if 'run' in self.phases:
+			advance = self.phases['run'].total
+			for name in ['cpu_execution', 'gpu_execution']:
+				if name in self.phases:
+					advance -= self.phases[name].total
+			phases['time_advance'] = {'calls': self.phases['run'].calls, 'total': advance / 1e9}
+
+		# The queue operations are the ones of the allocation queues and the ready set, where the ones of the #
+		# devices are given by the calls of the GPU strategy #
+		policies = {}
+		queue_ops = 0
+		for name in sorted(self.policies):
+			policies[name] = self.policies[name].report()
+			if name.startswith('alloc_queue.') or name.startswith('ready_set.'):
+				queue_ops += self.policies[name].calls
+
+		counters = dict(self.counters)
+		counters['ticks'] = self.phases['cpu_execution'].calls if 'cpu_execution' in self.phases else 0
+		counters['queue_ops'] = queue_ops
+
+		report = {'wall_time': self.wall_time, 'phases': phases, 'policies': policies, 'counters': counters}
+
+		# The functions taking the most cumulative time #
+		if self.cprofile != None:
+			import pstats
+			stats = pstats.Stats(self.cprofile)
+			functions = []
+			for func_key, (cc, nc, tt, ct, callers) in stats.stats.items():
+				functions.append({'function': pstats.func_std_string(func_key), 'calls': nc, 'primitive_calls': cc, 'total_time': tt, 'cumulative_time': ct})
+
+			functions.sort(key = lambda entry: entry['cumulative_time'], reverse = True)
+			report['cprofile'] = functions[:report_top]
+
+		if self.memory_report != None:
+			report['tracemalloc'] = self.memory_report
+
+		return report
+
+	# Write the report to a JSON file, as well as the cProfile capture to a file with the extension .prof #
+	# (which can be read by pstats or snakeviz) #
+	def write(self, file_name):
+		file = open(file_name, 'w')
+		json.dump(self.report(), file, indent = 1)
+		file.close()
+
+		if self.cprofile != None:
+			self.cprofile.dump_stats(os.path.splitext(file_name)[0] + '.prof')
@@ -20,16 +20,29 @@
  #**************************************************************************
 import gen
 import func
+import workload
+import sink
+import mapping
+import random
 import math
+import time
+import io
+import os
+import contextlib
+import json
 from method import new
 from method import O_KGLP
 
 # Global variables #
+graph_type = '' # The graph; y: Based on the benchmark, n: Random; '': Asked at the start
 max_num_tasks = 500 # Maximum number of tasks [random case]
 num_tasks = 0 # Number of tasks [random case]
 bench_name = 'heat' # The name of the benchmark
 ran_pro = 0.01 # Probability of selecting data dependencies between tasks [random case]
 type_pro = 0.99 # The probability to specify the task type [random case]
+workload_family = '' # The family of the random graph (see workload.py), whose number of tasks is max_num_tasks; '': Random procedure [random case]
+workload_gpu_pro = 0.1 # The fraction of GPU-using tasks of the family [random case]
+workload_param = {} # The parameters of the family, e.g., {'width': 16} [random case]
 itr_et = 3 # Number of iterations for execution time generation
 et_min = 1 # Minimum execution time [random case]
 et_max = 10 # Maximum execution time [random case]
@@ -39,74 +52,326 @@ dl_max_task = 5 # Maximum probability for determining the deadline of the task
 dl_min_graph = 1 # Minimum probability for determining the deadline of the graph
 dl_max_graph = 2 # Maximum probability for determining the deadline of the graph
 itr_prg = 50 # Number of iterations for the program
+seed = None # The master seed of the random numbers, where each iteration has its own generator derived from it (see gen.iteration_rng); None: Chosen randomly
 num_cpu_threads = 32 # Number of CPU threads
-gpu_task_num = [] # GPU-using task number (the index starts from 0)
 num_gpu_devices = 8 # Number of GPU devices
 loc_queue_cap = math.ceil(num_cpu_threads / num_gpu_devices) # Capacity of the local queues of GPU devices
 graphic_result = 0 # Graphical output; 0: Not show, 1: Show
+check_result = 0 # Check the schedule of each run (see func.check_schedule), where an invalid schedule stops the program; 0: Off, 1: On
+num_workers = 1 # Number of worker processes running the mapping algorithms; 0: Number of CPU cores, 1: No worker process
+output_dir = 'output' # The folder of the output files, so that the runs using different folders do not overwrite each other's files
+results_file = 'results.csv' # The file of the records of the runs in output_dir (.csv, .jsonl, or .parquet); '': Not written
+profile_result = 0 # Profiling of the mapping process (the jobs are run without worker processes); 0: Off, 1: On
+profile_cprofile = 0 # The capture of cProfile while profiling (written next to profile_file as .prof); 0: Off, 1: On
+profile_memory = 0 # The capture of tracemalloc while profiling; 0: Off, 1: On
+profile_file = 'profile.json' # The report of the profiling in output_dir
+policy_weights = {} # The weights of the mapping algorithms, e.g., {'cpu_alloc': {'TMCD': {'alpha': 0.5}}} (see weight_policies); {}: The default weights
 
-# Generate the graph #
-graph_type = input("Generate the graph based on benchmark (press y) or random graph (press n)? ")
+# The mapping algorithms, i.e., [method, CPU allocation, CPU dispatching, GPU algorithm(s)] #
+alg_list = [
+	['O-KGLP', 'MTET', 'MET', 'O-KGLP'], # MTET-MET, O-KGLP
+	['new', 'MTET', 'MET', 'LET', 'MNJ', 'MNAOT'], # MTET-MET, LET-MNJ-MNAOT
+	['new', 'MTET', 'MET', 'LET', 'LTET', 'MNAOT'], # MTET-MET, LET-LTET-MNAOT
+	['new', 'MTET', 'MET', 'LET', 'WSM', 'MNAOT'], # MTET-MET, LET-WSM-MNAOT
+	['new', 'MTET', 'MET', 'WSM', 'MNJ', 'MNAOT'] # MTET-MET, WSM-MNJ-MNAOT
+]
 
-# Show the status of the mapping process #
-print('The mapping is in progress...')
+# The parameters given by the configuration files and the command line, i.e., the global variables above #
+# (except for the ones specified during the run) and the mapping algorithms #
+config_params = ['graph_type', 'max_num_tasks', 'bench_name', 'ran_pro', 'type_pro', 'workload_family', 'workload_gpu_pro', 'workload_param', 'itr_et', 'et_min', 'et_max', 'et_type', 'dl_min_task', 'dl_max_task', 'dl_min_graph', 'dl_max_graph', 'itr_prg', 'seed', 'num_cpu_threads', 'num_gpu_devices', 'loc_queue_cap', 'graphic_result', 'check_result', 'num_workers', 'output_dir', 'results_file', 'profile_result', 'profile_cprofile', 'profile_memory', 'profile_file', 'policy_weights', 'alg_list']
 
-# Reset the files to write the results #
-file = open("output/results.dat", "w")
-file.close()
+# The mapping algorithms whose weights can be given in policy_weights, i.e., group: algorithms #
+weight_policies = {'cpu_alloc': mapping.cpu_alloc_policies, 'cpu_disp': mapping.cpu_disp_policies, 'gpu_prio': new.job_prio_policies, 'lq_alloc': new.lq_alloc_policies}
 
-file = open("output/max_tasks.dat", "w")
-file.close()
+# Read a configuration file (TOML or JSON), i.e., parameter: value #
+def load_config(file_name):
+	ext = os.path.splitext(file_name)[1]
 
-file = open("output/num_edge.dat", "w")
-file.close()
+	if ext == '.toml':
+		# tomllib exists in Python 3.11 and later #
+		try:
+			import tomllib
+		except ImportError:
+			raise ValueError('Reading a TOML configuration file needs Python 3.11 or later: ' + file_name)
 
-for i in range(itr_prg):
-	print('\nIteration ' + str(i + 1) + '\n====================')
+		with open(file_name, 'rb') as f:
+			config = tomllib.load(f)
+	elif ext == '.json':
+		with open(file_name) as f:
+			config = json.load(f)
+	else:
+		raise ValueError('Unknown format of the configuration file: ' + file_name)
+
+	if not isinstance(config, dict):
+		raise ValueError('The configuration file should give the parameters by name: ' + file_name)
+
+	return config
+
+# Specify the configuration from the command line, where the parameters of the configuration file are #
+# replaced by the ones given by the options #
+def parse_args(argv):
+	import argparse
+
+	parser = argparse.ArgumentParser(description = 'Simulate the mapping of the tasks of the graphs to the CPU threads and GPU devices.')
+	parser.add_argument('-c', '--config', help = 'configuration file (.toml or .json) giving the parameters of main.py by name')
+	parser.add_argument('-g', '--graph', choices = ['bench', 'random'], help = 'generate the graph based on the benchmark or randomly (instead of asking)')
+	parser.add_argument('-o', '--output-dir', help = 'folder of the output files')
+	parser.add_argument('-s', '--seed', type = int, help = 'master seed of the random numbers')
+	parser.add_argument('--set', action = 'append', default = [], metavar = 'NAME=VALUE', help = 'set a parameter, where the value is given in JSON (or as a string), e.g., --set itr_prg=10')
+	args = parser.parse_args(argv)
+
+	config = {}
+	if args.config != None:
+		config.update(load_config(args.config))
+
+	for item in args.set:
+		if '=' not in item:
+			parser.error('the parameter should be given as NAME=VALUE: ' + item)
+
+		name, value = item.split('=', 1)
+		try:
+			config[name] = json.loads(value)
+		except ValueError:
+			config[name] = value
+
+	if args.graph != None:
+		config['graph_type'] = 'y' if args.graph == 'bench' else 'n'
+	if args.output_dir != None:
+		config['output_dir'] = args.output_dir
+	if args.seed != None:
+		config['seed'] = args.seed
+
+	return config
+
+# Apply a configuration to the global variables and the weights of the mapping algorithms #
+# This is also done by each worker process, so the configuration does not depend on how the processes are #
+# started #
+def apply_config(config):
+	global loc_queue_cap
+
+	for name in config:
+		if name not in config_params:
+			raise ValueError('Unknown parameter: ' + name)
+
+	for alg in config.get('alg_list', []):
+		if not (isinstance(alg, list) and ((len(alg) == 4 and alg[0] == 'O-KGLP') or (len(alg) == 6 and alg[0] == 'new'))):
+			raise ValueError('A mapping algorithm should be given as [O-KGLP, CPU allocation, CPU dispatching, O-KGLP] or [new, CPU allocation, CPU dispatching, GQ selection, LQ allocation, LQ dispatching]: ' + str(alg))
+
+	globals().update(config)
+
+	# The capacity of the local queues follows the number of threads and devices unless it is given #
+	if 'loc_queue_cap' not in config and ('num_cpu_threads' in config or 'num_gpu_devices' in config):
+		loc_queue_cap = math.ceil(num_cpu_threads / num_gpu_devices)
+
+	func.output_dir = output_dir
+
+	for group in policy_weights:
+		if group not in weight_policies:
+			raise ValueError('Unknown group of mapping algorithms: ' + group)
+
+		for alg in policy_weights[group]:
+			if alg not in weight_policies[group]:
+				raise ValueError('Unknown mapping algorithm: ' + group + '.' + alg)
+
+			policy = weight_policies[group][alg]
+			for weight in policy_weights[group][alg]:
+				if not isinstance(getattr(policy, weight, None), (int, float)):
+					raise ValueError('Unknown weight of the mapping algorithm: ' + group + '.' + alg + '.' + weight)
+
+				setattr(policy, weight, policy_weights[group][alg][weight])
+
+# The current configuration, i.e., the values of all parameters #
+def current_config():
+	return {name: globals()[name] for name in config_params}
+
+# Generate the graph of an iteration, i.e., [number of tasks, graph, deadline] #
+# The random numbers of each iteration are drawn from its own generator, so an iteration does not depend on #
+# the other iterations, and its graph is the same whichever process generates it #
+def gen_graph(graph_type, master_seed, i):
+	rng = gen.iteration_rng(master_seed, i)
 
 	if graph_type == 'y':
 		# Specify GPU-using task number(s)
-		gpu_task_num = gen.read_gpu_task(bench_name, gpu_task_num)
+		gpu_task_num = gen.read_gpu_task(bench_name)
 
 		# Generate the graph based on the benchmark #
-		num_tasks, task_list = gen.graph_predef(bench_name, gpu_task_num)
+		num_tasks, task_graph = gen.graph_predef(bench_name, gpu_task_num)
 	else:
-		# Generate the graph randomly #
-		num_tasks, task_list, gpu_task_num = gen.graph_rand(max_num_tasks, type_pro, ran_pro, gpu_task_num)
+		if workload_family == '':
+			# Generate the graph randomly #
+			num_tasks, task_graph, gpu_task_num = gen.graph_rand(max_num_tasks, type_pro, ran_pro, [], rng)
+		else:
+			# Generate the graph using the family, where its seed is drawn from the random numbers #
+			num_tasks, task_graph, gpu_task_num = workload.generate(workload_family, max_num_tasks, workload_gpu_pro, rng.getrandbits(32), **workload_param)
 
 	# Determine execution time of tasks, deadline of the system, and generate the list of tasks #
-	task_list, deadline = gen.specify_et(graph_type, num_tasks, task_list, bench_name, et_min, et_max, et_type, itr_et, dl_min_task, dl_max_task, dl_min_graph, dl_max_graph, gpu_task_num)
+	task_graph, deadline = gen.specify_et(graph_type, num_tasks, task_graph, bench_name, et_min, et_max, et_type, itr_et, dl_min_task, dl_max_task, dl_min_graph, dl_max_graph, gpu_task_num, rng)
+
+	return num_tasks, task_graph, deadline
+
+# The jobs of the iterations, i.e., [iteration, graph type, master seed], where the graph of each iteration is #
+# generated by the process running its job, so the graphs are neither generated one after another by the #
+# main process nor sent to the worker processes #
+def gen_jobs(graph_type, master_seed):
+	for i in range(itr_prg):
+		yield [i, graph_type, master_seed]
+
+# Map the graph using one of the algorithms #
+# The output of the algorithm is returned instead of being shown #
+def map_graph(alg, num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, task_graph, deadline, graphic_result, export_result, check_result = 0):
+	output = io.StringIO()
+	with contextlib.redirect_stdout(output):
+		if alg[0] == 'O-KGLP':
+			result = O_KGLP.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, task_graph, deadline, alg[1], alg[2], alg[3], graphic_result, export_result, check_result)
+		else:
+			result = new.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, task_graph, deadline, alg[1], alg[2], alg[3], alg[4], alg[5], graphic_result, export_result, check_result)
+
+	return output.getvalue(), result
+
+# The name of a mapping algorithm, e.g., MTET-MET, LET-MNJ-MNAOT #
+def alg_name(alg):
+	return alg[1] + '-' + alg[2] + ', ' + '-'.join(alg[3:])
+
+# Run the job of an iteration, which can be done by a worker process, i.e., generate the graph and map it #
+# using each algorithm of alg_list #
+# The output and results of each algorithm are returned with the number of edges of the graph and the #
+# wall-clock time of the mapping #
+def run_job(job):
+	i, graph_type, master_seed = job
+	num_tasks, task_graph, deadline = gen_graph(graph_type, master_seed, i)
+
+	# The files of the results are exported just in the last iteration, as they are overwritten by each iteration #
+	if i == itr_prg - 1:
+		export_result = 1
+	else:
+		export_result = 0
+
+	job_results = []
+	for alg in alg_list:
+		start_time = time.perf_counter()
+		output, result = map_graph(alg, num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, task_graph, deadline, graphic_result, export_result, check_result)
+
+		job_results.append([output, result, task_graph.num_edge(), time.perf_counter() - start_time])
+
+	return job_results
+
+# The main function #
+# The configuration is given by the command line (see parse_args), where argv is the list of its arguments #
+# (None: The arguments of the program) #
+def main(argv = None):
+	apply_config(parse_args(argv))
+
+	# Generate the graph, which is asked if it is not given #
+	if graph_type == '':
+		graph = input("Generate the graph based on benchmark (press y) or random graph (press n)? ")
+	else:
+		graph = graph_type
+
+	# Create the folders of the output files #
+	for folder in ['', 'scheduling', 'device allocation', 'graphic']:
+		os.makedirs(os.path.join(output_dir, folder), exist_ok = True)
+
+	# Specify the master seed of the random numbers, which is shown so that the run can be repeated #
+	master_seed = seed if seed != None else random.getrandbits(64)
+	print('Master seed: ' + str(master_seed))
+
+	# Show the status of the mapping process #
+	print('The mapping is in progress...')
 
 	# ++++++++++++++++++ Start the mapping with the algorithms ++++++++++++++++++++ #
 
-	results = []
+	# The files of the results, which are written by the sinks in the background #
+	# results.dat: The response time and missed deadline of the algorithms (one line per iteration), #
+	# max_tasks.dat: The maximum number of parallel tasks running using CPUs and GPUs, num_edge.dat: The #
+	# number of edges of the graphs, and results_file: A record of each run of the algorithms #
+	results_dat = sink.results_sink(os.path.join(output_dir, "results.dat"))
+	max_tasks_dat = sink.results_sink(os.path.join(output_dir, "max_tasks.dat"))
+	num_edge_dat = sink.results_sink(os.path.join(output_dir, "num_edge.dat"))
+	sink_list = [results_dat, max_tasks_dat, num_edge_dat]
+
+	record_sink = None
+	if results_file != '':
+		record_sink = sink.results_sink(os.path.join(output_dir, results_file), ['iteration', 'seed', 'config', 'response_time', 'miss_deadline', 'num_edge', 'max_tasks_cpu', 'max_tasks_gpu', 'wall_time'])
+		sink_list.append(record_sink)
+
+	prof = None
+	pool = None
+	try:
+		# Profile the mapping process, where the jobs are run in this process so that they are measured #
+		# The profiler (and cProfile, pstats, and tracemalloc) is loaded only when the mapping process is profiled #
+		if profile_result == 1:
+			import instrument
+			prof = instrument.profiler(profile_cprofile, profile_memory)
+			prof.start()
+
+		# Run the jobs in the worker processes, where the results are received in the order of the jobs #
+		if num_workers == 1 or prof != None:
+			job_results = map(run_job, gen_jobs(graph, master_seed))
+		else:
+			# The worker processes apply the configuration of this process, where multiprocessing is loaded only #
+			# when the worker processes are used #
+			import multiprocessing
+			if num_workers == 0:
+				pool = multiprocessing.Pool(os.cpu_count(), apply_config, (current_config(),))
+			else:
+				pool = multiprocessing.Pool(num_workers, apply_config, (current_config(),))
+
+			job_results = pool.imap(run_job, gen_jobs(graph, master_seed))
+
+		for itr, itr_results in enumerate(job_results):
+			print('\nIteration ' + str(itr + 1) + '\n====================')
+
+			# Write the number of edges of the graph to the file #
+			num_edge_dat.write(str(itr_results[0][2]) + "\n")
 
-	# MTET-MET, O-KGLP #
-	results.append(O_KGLP.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, func.clear(num_tasks, task_list), deadline, 'MTET', 'MET', 'O-KGLP', graphic_result))
+			results = []
+			for alg, (output, result, num_edge, wall_time) in zip(alg_list, itr_results):
+				# Show the output of the algorithm #
+				print(output, end = '')
+				results.append(result)
 
-	# MTET-MET, LET-MNJ-MNAOT #
-	results.append(new.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, func.clear(num_tasks, task_list), deadline, 'MTET', 'MET', 'LET', 'MNJ', 'MNAOT', graphic_result))
+				# Write the maximum number of parallel tasks to the file #
+				if result[2] != None:
+					max_tasks_dat.write(str(result[2][0]) + "\t" + str(result[2][1]) + "\n")
 
-	# MTET-MET, LET-LTET-MNAOT #
-	results.append(new.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, func.clear(num_tasks, task_list), deadline, 'MTET', 'MET', 'LET', 'LTET', 'MNAOT', graphic_result))
+				# Write the record of the run, where the seed is the one of the generator of the iteration (i.e., #
+				# the graph can be generated again using random.Random(seed)) #
+				if record_sink != None:
+					max_tasks = result[2] if result[2] != None else [None, None]
+					record_sink.write({'iteration': itr + 1, 'seed': gen.iteration_seed(master_seed, itr), 'config': alg[0] + ': ' + alg_name(alg), 'response_time': result[0], 'miss_deadline': result[1], 'num_edge': num_edge, 'max_tasks_cpu': max_tasks[0], 'max_tasks_gpu': max_tasks[1], 'wall_time': round(wall_time, 6)})
 
-	# MTET-MET, LET-WSM-MNAOT #
-	results.append(new.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, func.clear(num_tasks, task_list), deadline, 'MTET', 'MET', 'LET', 'WSM', 'MNAOT', graphic_result))
+			# Write the results of the iteration to the file, where each line includes the response time and #
+			# missed deadline of all algorithms #
+			line = []
+			for alg_result in results:
+				line.append(str(alg_result[0]))
+				line.append(str(alg_result[1]))
 
-	# MTET-MET, WSM-MNJ-MNAOT #
-	results.append(new.execute(num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, func.clear(num_tasks, task_list), deadline, 'MTET', 'MET', 'WSM', 'MNJ', 'MNAOT', graphic_result))
+			results_dat.write("\t".join(line) + "\n")
 
-	# Write the results to the file #
-	file = open("output/results.dat", "a")
+		# All jobs are finished, so the worker processes exit normally #
+		if pool != None:
+			pool.close()
+			pool.join()
+	finally:
+		# The worker processes are stopped if the run did not finish (e.g., a job raised an error or a sink #
+		# failed), so they are not left behind #
+		if pool != None:
+			pool.terminate()
 
-	for i in range(0, 5):
-		file.write(str(results[i][0]) + "\t")
-		file.write(str(results[i][1]))
+		try:
+			for file_sink in sink_list:
+				file_sink.close()
+		finally:
+			if prof != None:
+				prof.stop()
 
-		if i != 4:
-			file.write("\t")
+	# Write the report of the profiling #
+	if prof != None:
+		prof.write(os.path.join(output_dir, profile_file))
 
-	if i != itr_prg - 1:
-		file.write("\n")
+	# Wait for the graphical results being drawn in the background #
+	func.graphic_wait()
 
-file.close()
+if __name__ == '__main__':
+	main()
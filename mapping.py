@@ -0,0 +1,549 @@
+ #**************************************************************************
+ # mapping.py
+ #
+ # Simulate the mapping of the tasks of the graph to the CPU threads and the
+ # GPU devices, where the mapping algorithms are given as policy objects.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from gen import task_status
+import func
+import gen
+import math
+
+# ++++++++++++++++++++++++ CPU allocation algorithms ++++++++++++++++++++++++ #
+
+# Define the base of the CPU allocation algorithms #
+# By default, the thread with the least key in the index of the allocation queues is selected, which is used #
+# by the algorithms that depend only on the allocation queues #
+class cpu_alloc:
+	# The key of a thread #
+	def key(self, sim, thr_id):
+		return 0
+
+	# Select an allocation queue #
+	def select(self, sim, t):
+		return sim.alloc_index.top()
+
+# The MNTP algorithm #
+class cpu_alloc_MNTP(cpu_alloc):
+	# The minimum number of tasks existing in the queue #
+	def key(self, sim, thr_id):
+		return len(sim.alloc_queue[thr_id])
+
+# The MTET algorithm #
+class cpu_alloc_MTET(cpu_alloc):
+	# The minimum total execution time of the queue #
+	def key(self, sim, thr_id):
+		return sim.alloc_queue[thr_id].tot['exe_time']
+
+# The MTRT algorithm #
+class cpu_alloc_MTRT(cpu_alloc):
+	# The maximum total response time of the queue #
+	def key(self, sim, thr_id):
+		return -sim.alloc_queue[thr_id].tot['res_time']
+
+# The NT algorithm #
+class cpu_alloc_NT(cpu_alloc):
+	def select(self, sim, t):
+		# Select the next thread #
+		if sim.curr_thr < sim.num_cpu_threads - 1:
+			sim.curr_thr += 1
+		else:
+			sim.curr_thr = 0
+
+		return sim.curr_thr
+
+# The MRIT algorithm #
+class cpu_alloc_MRIT(cpu_alloc):
+	# The last idle time of the thread, where the busy threads come last #
+	def key(self, sim, thr_id):
+		if sim.last_idle[thr_id] != -1:
+			return sim.last_idle[thr_id]
+		else:
+			return math.inf
+
+	# Select the thread with the most recent idle time (i.e., the thread that has been idle the longest) #
+	def select(self, sim, t):
+		thr_id = sim.alloc_index.top()
+
+		# If none of the threads has been idle for a time unit, all of them have the recent idle time 0, so #
+		# the first thread is selected #
+		if sim.last_idle[thr_id] == -1 or sim.last_idle[thr_id] == t:
+			return 0
+
+		return thr_id
+
+# The TMCD algorithm #
+# Its cost is normalized by the totals of all queues and the recent idle times, so the order of all threads #
+# changes whenever a queue changes or the time advances, and the threads are not kept in the index of the #
+# allocation queues; the cost of each thread is calculated once instead, using the totals of the queues #
+class cpu_alloc_TMCD(cpu_alloc):
+	alpha = 0.5
+	beta = 0
+	gamma = 0.5
+
+	def select(self, sim, t):
+		# Calculate the recent idle time of the threads #
+		rec_idle_time = []
+		for i in range(sim.num_cpu_threads):
+			if sim.last_idle[i] != -1:
+				rec_idle_time.append(t - sim.last_idle[i])
+			else:
+				rec_idle_time.append(0)
+
+		# Calculate total number of tasks, total idle time, and total execution time #
+		total_num_tasks = sim.num_tasks_cpu
+		total_it = sum(rec_idle_time)
+		total_et = func.queues_tot(sim.alloc_queue, 'exe_time')
+
+		if total_num_tasks == 0:
+			total_num_tasks = 1
+		if total_it == 0:
+			total_it = 1
+		if total_et == 0:
+			total_et = 1
+
+		# Select the queue with the least cost, where the lowest ID wins ties #
+		sel_thr = 0
+		sel_cost = None
+		for i in range(sim.num_cpu_threads):
+			if rec_idle_time[i] != 0:
+				val_it = 1 / (rec_idle_time[i] / total_it)
+			else:
+				val_it = 0
+
+			cost = self.alpha * len(sim.alloc_queue[i]) / total_num_tasks + self.beta * val_it + self.gamma * sim.alloc_queue[i].tot['exe_time'] / total_et
+			if sel_cost == None or cost < sel_cost:
+				sel_thr = i
+				sel_cost = cost
+
+		return sel_thr
+
+cpu_alloc_policies = {'MNTP': cpu_alloc_MNTP, 'MTET': cpu_alloc_MTET, 'MTRT': cpu_alloc_MTRT, 'NT': cpu_alloc_NT, 'MRIT': cpu_alloc_MRIT, 'TMCD': cpu_alloc_TMCD}
+
+# ++++++++++++++++++++++++ CPU dispatching algorithms +++++++++++++++++++++++ #
+
+# Define the base of the CPU dispatching algorithms #
+# By default, the allocation queue is indexed by the priority of the algorithm (the task with the lowest #
+# priority value is selected), which is used by the algorithms that depend only on the task itself #
+class cpu_disp:
+	# The priority of a task ID (None: the cost of a task depends on the other tasks of the queue) #
+	def prio(self, task_graph):
+		return None
+
+	# Choose a task from the allocation queue and remove it from the queue #
+	def select(self, sim, queue):
+		return queue.pop()
+
+# The MET algorithm #
+class cpu_disp_MET(cpu_disp):
+	# Select the task with the minimum execution time #
+	def prio(self, task_graph):
+		return task_graph.exe_time.__getitem__
+
+# The MRT algorithm #
+class cpu_disp_MRT(cpu_disp):
+	# Select the task with the maximum response time #
+	def prio(self, task_graph):
+		return lambda t_id: -task_graph.res_time[t_id]
+
+# The MCD algorithm #
+class cpu_disp_MCD(cpu_disp):
+	theta = 0.4
+	psi = 0.6
+
+	def select(self, sim, queue):
+		sel_tasks = list(queue)
+		exe_time = sim.task_graph.exe_time
+		res_time = sim.task_graph.res_time
+
+		# Calculate total execution time and total response time of the tasks #
+		total_et = 0
+		total_rt = 0
+		for i in range(len(sel_tasks)):
+			total_et += exe_time[sel_tasks[i]]
+			total_rt += res_time[sel_tasks[i]]
+
+		if total_et == 0:
+			total_et = 1
+		if total_rt == 0:
+			total_rt = 1
+
+		# Calculate the cost of each task #
+		cost = []
+		for i in range(len(sel_tasks)):
+			cost.append(self.theta * exe_time[sel_tasks[i]] / total_et + self.psi * 1 / (res_time[sel_tasks[i]] / total_rt))
+
+		# Select the task with the least cost #
+		sel_id = 0
+		for i in range(len(sel_tasks))[1::]:
+			if cost[i] < cost[sel_id]:
+				sel_id = i
+
+		queue.remove(sel_tasks[sel_id])
+
+		return sel_tasks[sel_id]
+
+cpu_disp_policies = {'MET': cpu_disp_MET, 'MRT': cpu_disp_MRT, 'MCD': cpu_disp_MCD}
+
+# +++++++++++++++++++++++++++++ GPU strategies ++++++++++++++++++++++++++++++ #
+
+# Define the base of the strategies that distribute the GPU-using tasks (i.e., jobs) among the devices #
+class gpu_strategy:
+	# Create the queues of the devices #
+	def setup(self, sim):
+		pass
+
+	# Enqueue a job (i.e., task ID) whose initial CPU segment has been finished #
+	# Return the device whose queue gets the job (-1: none of the devices) #
+	def enqueue(self, sim, task):
+		return -1
+
+	# Distribute the enqueued jobs among the devices, which is done just by the master device #
+	# Return the devices whose queues get the jobs #
+	def distribute(self, sim):
+		return []
+
+	# Choose a job for an idle device and remove it from the queue (None: no job to dispatch) #
+	def dispatch(self, sim, dev_num):
+		return None
+
+# Find the policy object of a mapping algorithm by its name #
+def get_policy(policies, alg):
+	if alg not in policies:
+		raise ValueError('Unknown mapping algorithm: ' + str(alg))
+
+	return policies[alg]()
+
+# +++++++++++++++++++++++++++++++ Simulator +++++++++++++++++++++++++++++++++ #
+
+# The profiler instrumenting the simulators (see instrument.py), where None means the mapping process is not #
+# profiled #
+profiler = None
+
+# Define the simulator of the mapping process, which owns the state of a single run #
+class simulator:
+	def __init__(self, num_tasks, num_cpu_threads, num_gpu_devices, task_graph, cpu_alloc_policy, cpu_disp_policy, gpu_policy):
+		self.num_tasks = num_tasks # Number of tasks
+		self.num_cpu_threads = num_cpu_threads # Number of CPU threads
+		self.num_gpu_devices = num_gpu_devices # Number of GPU devices
+		self.task_graph = task_graph # The graph of tasks, which is not modified by the mapping process
+		self.task_state = gen.task_state(num_tasks) # The state of the tasks in this run
+		self.cpu_alloc = cpu_alloc_policy # The CPU allocation algorithm
+		self.cpu_disp = cpu_disp_policy # The CPU dispatching algorithm
+		self.gpu = gpu_policy # The GPU strategy
+
+		# Create the ready set of the tasks #
+		self.ready_tasks = func.ready_set(num_tasks, task_graph)
+
+		# Create an allocation queue for each thread #
+		self.alloc_queue = []
+		for i in range(num_cpu_threads):
+			self.alloc_queue.append(func.task_queue(self.cpu_disp.prio(task_graph), {'exe_time': task_graph.exe_time, 'res_time': task_graph.res_time}))
+
+		# Create a list for the last idle time of the threads (-1 for a busy thread) #
+		self.last_idle = []
+		for i in range(num_cpu_threads):
+			self.last_idle.append(0)
+
+		# Create the index of the allocation queues #
+		self.alloc_index = func.res_index(num_cpu_threads, lambda thr_id: self.cpu_alloc.key(self, thr_id))
+
+		# Create an execution queue for each thread #
+		self.exec_queue = []
+		for i in range(num_cpu_threads):
+			self.exec_queue.append([])
+
+		# Create a waiting queue (FIFO queue) for each thread to execute the second CPU segment of GPU-using tasks #
+		self.wait_queue = []
+		for i in range(num_cpu_threads):
+			self.wait_queue.append([])
+
+		# Initialize the current thread #
+		self.curr_thr = -1
+
+		# Create the index of the idle threads having empty allocation queues, where the thread with the lowest ID #
+		# is selected first, and the set of the idle threads having tasks in their waiting queues #
+		self.free_thr = func.res_index(num_cpu_threads, lambda thr_id: 0)
+		self.pend_thr = set()
+
+		# Create a kernel execution queue for each device #
+		self.ker_exec_queue = []
+		for i in range(num_gpu_devices):
+			self.ker_exec_queue.append([])
+
+		# Initialize the sets of the busy devices (i.e., the last job of the device is in s_memcopy1, s_gpu, or #
+		# s_memcopy2 status) and the idle devices having jobs to dispatch #
+		self.busy_dev = set()
+		self.pend_dev = set()
+
+		# Initialize the allocation of devices to tasks #
+		self.task_device = []
+
+		# Create the queues of the devices #
+		self.gpu.setup(self)
+
+		# The times at which the end of the executing segments of the threads and devices is noticed, i.e., [time, ID] #
+		self.thr_events = []
+		self.dev_events = []
+
+		# The functions taking the events and advancing the time, which are replaced by the counting ones if the #
+		# mapping process is profiled #
+		self.due_events = func.due_events
+		self.next_event = func.next_event
+
+		self.num_tasks_cpu = 0 # Number of tasks in the allocation queues of the threads
+		self.max_tasks_cpu = 0 # Maximum number of parallel tasks running using CPUs
+
+		# Instrument the simulator if the mapping process is profiled #
+		if profiler != None:
+			profiler.attach(self)
+
+	# The number of completed tasks #
+	def comp_tasks_cnt(self):
+		return self.task_state.num_status[task_status.f_cpu] + self.task_state.num_status[task_status.f_cpu2]
+
+	# Set the last idle time of a thread (-1: busy), which is a key of the index of the allocation queues for #
+	# certain CPU allocation algorithms (e.g., MRIT) #
+	def set_last_idle(self, thr_id, last_idle):
+		self.last_idle[thr_id] = last_idle
+		self.alloc_index.update(thr_id)
+
+	# The mapping process #
+	def run(self):
+		t = 0 # Response time
+
+		# Continue the mapping process while the allocation queues of the threads are not empty, as well as #
+		# the execution queues of the threads include executing tasks #
+		while self.comp_tasks_cnt() < self.num_tasks:
+			# Check whether the state of the threads or devices has been changed at the current time #
+			changed = self.cpu_execution(t)
+			changed = self.gpu_execution(t) or changed
+
+			# Advance the time to the next time unit at which an event occurs #
+			t = self.next_event(self.thr_events, self.dev_events, t, changed)
+
+		return t
+
+	# CPU execution #
+	def cpu_execution(self, t):
+		changed = False
+		task_graph = self.task_graph
+		st = self.task_state
+
+		# The master thread, the threads whose executing segments end at the current time, and the idle threads #
+		# having tasks to dispatch are processed in the order of their IDs #
+		visit_thr = func.visit_list([0] + self.due_events(self.thr_events, t) + list(self.pend_thr))
+		self.pend_thr.clear()
+
+		for thr_num in visit_thr:
+			# Check the execution queue of the thread #
+			if bool(self.exec_queue[thr_num]):
+				task = self.exec_queue[thr_num][len(self.exec_queue[thr_num]) - 1] # The task ID
+
+				# CPU-only task #
+				# Check whether the execution of the CPU-only task has been finished #
+				if st.status[task] == task_status.s_cpu and st.f_time_cpu[task] <= t:
+					st.set_status(task, task_status.f_cpu)
+					changed = True
+
+					self.ready_tasks.release(task)
+
+					self.curr_thr = thr_num
+					self.set_last_idle(thr_num, t)
+
+				# GPU-using task #
+				# Check whether the execution of the initial CPU segment has been finished #
+				elif st.status[task] == task_status.s_cpu1 and st.f_time_cpu1[task] <= t:
+					st.set_status(task, task_status.f_cpu1)
+					changed = True
+
+					self.curr_thr = thr_num
+					self.set_last_idle(thr_num, t)
+
+					# Enqueue the job using the GPU strategy, where an idle device getting the job dispatches it #
+					# at the current time #
+					dev_id = self.gpu.enqueue(self, task)
+					if dev_id != -1 and dev_id not in self.busy_dev:
+						self.pend_dev.add(dev_id)
+
+				# Check whether the execution of the last CPU segment has been finished #
+				elif st.status[task] == task_status.s_cpu2 and st.f_time_cpu2[task] <= t:
+					st.set_status(task, task_status.f_cpu2)
+					changed = True
+
+					self.ready_tasks.release(task)
+
+					self.curr_thr = thr_num
+					self.set_last_idle(thr_num, t)
+
+			# Add the thread to the index of the idle threads having empty allocation queues #
+			if self.last_idle[thr_num] != -1 and len(self.alloc_queue[thr_num]) == 0:
+				self.free_thr.update(thr_num)
+
+			# Add the ready tasks to the allocation queues #
+			# This process is done just by the master thread #
+			if thr_num == 0:
+				# The tasks become ready when there are not any data dependencies, or there are any data #
+				# dependencies but the related tasks are finished #
+				while bool(self.ready_tasks):
+					ready_task = self.ready_tasks.pop()
+
+					# Select an allocation queue from the list of queues #
+					if bool(self.free_thr): # Select empty queue belonging to an idle thread (the one with the lowest ID)
+						thread_id = self.free_thr.top()
+					else: # Select the queue using the CPU allocation algorithm
+						thread_id = self.cpu_alloc.select(self, t)
+
+					# Append the task to the selected queue #
+					self.alloc_queue[thread_id].append(ready_task)
+					self.alloc_index.update(thread_id)
+					self.free_thr.exclude(thread_id)
+					self.num_tasks_cpu += 1
+
+					# The idle thread dispatches the task at the current time #
+					if self.last_idle[thread_id] != -1:
+						visit_thr.add(thread_id)
+
+					# Set the thread ID of the task #
+					st.thr_id[ready_task] = thread_id
+					changed = True
+
+				# Update the maximum number of parallel tasks running using CPUs #
+				if self.num_tasks_cpu > self.max_tasks_cpu:
+					self.max_tasks_cpu = self.num_tasks_cpu
+
+			# Check whether the thread is idle #
+			if not bool(self.exec_queue[thr_num]) or self.last_idle[thr_num] != -1:
+				# Check the waiting queue of the thread and dispatch one of the tasks (if any) to it #
+				if bool(self.wait_queue[thr_num]):
+					# Choose the first task (i.e., FIFO) from the waiting queue #
+					sel_task = self.wait_queue[thr_num][0]
+
+					# Dispatch the task to the thread #
+					self.exec_queue[thr_num].append(sel_task)
+					task = self.exec_queue[thr_num][len(self.exec_queue[thr_num]) - 1]
+
+					st.set_status(task, task_status.s_cpu2)
+					st.s_time_cpu2[task] = t
+					st.f_time_cpu2[task] = t + task_graph.cpu2_time[task]
+					func.add_event(self.thr_events, t, st.f_time_cpu2[task], thr_num)
+
+					self.set_last_idle(thr_num, -1)
+					self.free_thr.exclude(thr_num)
+					changed = True
+
+					# Remove the task from the waiting queue #
+					self.wait_queue[thr_num].remove(sel_task)
+
+				# Check the allocation queue of the thread and dispatch one of the tasks (if any) to it #
+				elif bool(self.alloc_queue[thr_num]):
+					# Choose one of the tasks from the allocation queue using the CPU dispatching algorithm, and #
+					# remove it from the queue #
+					sel_task = self.cpu_disp.select(self, self.alloc_queue[thr_num])
+					self.alloc_index.update(thr_num)
+					self.num_tasks_cpu -= 1
+
+					# Dispatch the task to the thread #
+					self.exec_queue[thr_num].append(sel_task)
+					task = self.exec_queue[thr_num][len(self.exec_queue[thr_num]) - 1]
+
+					if task_graph.t_type[task] == 0: # CPU-only task
+						st.set_status(task, task_status.s_cpu)
+						st.s_time_cpu[task] = t
+						st.f_time_cpu[task] = t + task_graph.exe_time[task]
+						func.add_event(self.thr_events, t, st.f_time_cpu[task], thr_num)
+					else: # GPU-using task
+						st.set_status(task, task_status.s_cpu1)
+						st.s_time_cpu1[task] = t
+						st.f_time_cpu1[task] = t + task_graph.cpu1_time[task]
+						func.add_event(self.thr_events, t, st.f_time_cpu1[task], thr_num)
+
+					self.set_last_idle(thr_num, -1)
+					self.free_thr.exclude(thr_num)
+					changed = True
+
+		return changed
+
+	# GPU execution #
+	def gpu_execution(self, t):
+		changed = False
+		task_graph = self.task_graph
+		st = self.task_state
+
+		# The master device, the devices whose executing segments end at the current time, and the idle devices #
+		# having jobs to dispatch are processed in the order of their IDs #
+		visit_dev = func.visit_list([0] + self.due_events(self.dev_events, t) + list(self.pend_dev))
+		self.pend_dev.clear()
+
+		for dev_num in visit_dev:
+			# Check the kernel execution queue of the device #
+			if bool(self.ker_exec_queue[dev_num]):
+				task = self.ker_exec_queue[dev_num][len(self.ker_exec_queue[dev_num]) - 1] # The task ID
+
+				# Check whether the execution of the task has been finished #
+				if st.status[task] == task_status.s_memcopy1 and st.f_time_memcopy1[task] <= t:
+					st.set_status(task, task_status.s_gpu)
+					st.s_time_gpu[task] = t
+					st.f_time_gpu[task] = t + task_graph.gpu_time[task]
+					func.add_event(self.dev_events, t, st.f_time_gpu[task], dev_num)
+					changed = True
+				elif st.status[task] == task_status.s_gpu and st.f_time_gpu[task] <= t:
+					st.set_status(task, task_status.s_memcopy2)
+					st.s_time_memcopy2[task] = t
+					st.f_time_memcopy2[task] = t + task_graph.memcopy2_time[task]
+					func.add_event(self.dev_events, t, st.f_time_memcopy2[task], dev_num)
+					changed = True
+				elif st.status[task] == task_status.s_memcopy2 and st.f_time_memcopy2[task] <= t:
+					st.set_status(task, task_status.f_memcopy2)
+					changed = True
+
+					self.busy_dev.discard(dev_num)
+
+					self.wait_queue[st.thr_id[task]].append(task) # Allocate the task to the waiting queue of the thread
+
+					# The idle thread dispatches the task at the next time unit #
+					if self.last_idle[st.thr_id[task]] != -1:
+						self.pend_thr.add(st.thr_id[task])
+
+			# Distribute the enqueued jobs among the devices using the GPU strategy #
+			# This process is done just by the master device #
+			if dev_num == 0:
+				for dev_id in self.gpu.distribute(self):
+					changed = True
+
+					# The idle device dispatches the job at the current time #
+					if dev_id not in self.busy_dev:
+						visit_dev.add(dev_id)
+
+			# Check whether the device is idle #
+			if dev_num not in self.busy_dev:
+				# Choose one of the jobs (if any) using the GPU strategy and dispatch it to the device #
+				sel_task = self.gpu.dispatch(self, dev_num)
+
+				if sel_task != None:
+					self.ker_exec_queue[dev_num].append(sel_task)
+					task = self.ker_exec_queue[dev_num][len(self.ker_exec_queue[dev_num]) - 1]
+
+					st.set_status(task, task_status.s_memcopy1)
+					st.s_time_memcopy1[task] = t
+					st.f_time_memcopy1[task] = t + task_graph.memcopy1_time[task]
+					func.add_event(self.dev_events, t, st.f_time_memcopy1[task], dev_num)
+					changed = True
+
+					self.busy_dev.add(dev_num)
+
+		return changed
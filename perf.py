@@ -0,0 +1,224 @@
+ #**************************************************************************
+ # perf.py
+ #
+ # Measure the speed of the simulator itself, i.e., loading the graphs of
+ # the benchmarks, generating the random graphs, determining the number of
+ # outgoing tasks and the execution times, and mapping the graphs using
+ # each algorithm, where the results of each run are appended to a JSON
+ # history to compare the builds and draw the scaling curves.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import gen
+import main
+import time
+import random
+import json
+import os
+import platform
+import subprocess
+import multiprocessing
+
+# The peak memory is measured only where the resource module exists (i.e., not on Windows) #
+try:
+	import resource
+except ImportError:
+	resource = None
+
+# Global variables #
+history_file = 'perf_history.json' # The history of the measurements in the output folder of main.py (main.output_dir), so perf runs using different output folders do not share it
+label = '' # The label of the build in the history (e.g., the name of a change); the commit is also recorded
+bench_list = ['axpy', 'heat', 'sparseLU'] # The benchmarks
+rand_sizes = [100, 1000, 10000, 100000] # The number of tasks of the random graphs
+rand_degree = 2 # Mean number of data dependencies of each task of the random graphs
+dot_gpu_pro = main.workload_gpu_pro # The fraction of GPU-using tasks of the benchmarks given just by the DOT file
+repeat = 3 # Number of times each measurement is repeated, where the fastest one is kept
+repeat_max_tasks = 10000 # The graphs with more tasks are measured once
+
+# The cases, i.e., [graph, number of tasks], where the number of tasks of a benchmark is given by its file #
+def perf_cases():
+	return [[bench, None] for bench in bench_list] + [['random', size] for size in rand_sizes]
+
+# Measure a step of a case repeatedly, where each repetition gets a new generator of the same random numbers #
+# Return the result of the step and the fastest time #
+def measure(step, seed, num_repeat):
+	best = None
+	for i in range(num_repeat):
+		rng = random.Random(seed)
+
+		start_time = time.perf_counter()
+		result = step(rng)
+		elapsed = time.perf_counter() - start_time
+
+		if best == None or elapsed < best:
+			best = elapsed
+
+	return result, best
+
+# Generate the graph of a case, i.e., [number of tasks, graph, GPU-using task number(s), source] #
+# The benchmarks having all of their files are loaded like the simulator does (the cached data), and the #
+# ones having just the DOT file get the GPU-using tasks and execution times randomly #
+def case_graph(name, size, rng):
+	if name == 'random':
+		# The number of tasks of graph_rand is a fraction of max_num_tasks, which is chosen to get the given #
+		# number of tasks #
+		max_num_tasks = round(size / (1 - 0.9 * main.type_pro))
+		ran_pro = 2 * rand_degree / max(size - 1, 1)
+
+		num_tasks, task_graph, gpu_task_num = gen.graph_rand(max_num_tasks, main.type_pro, ran_pro, [], rng)
+		return num_tasks, task_graph, gpu_task_num, 'random'
+
+	if all(os.path.exists(file_name) for file_name in gen.bench_files(name)):
+		# The data of the benchmark is read again from the cache file in each repetition #
+		gen.bench_cache.pop(name, None)
+
+		gpu_task_num = gen.read_gpu_task(name)
+		num_tasks, task_graph = gen.graph_predef(name, gpu_task_num)
+		return num_tasks, task_graph, gpu_task_num, 'bench'
+
+	num_tasks, dep_list = gen.parse_predef(name)
+	gpu_task_num = sorted(rng.sample(range(num_tasks), round(num_tasks * dot_gpu_pro)))
+
+	gpu_task_set = set(gpu_task_num)
+	t_type = [1 if i in gpu_task_set else 0 for i in range(num_tasks)]
+
+	return num_tasks, gen.graph(num_tasks, t_type, dep_list), gpu_task_num, 'dot'
+
+# Measure a case, which is done by a worker process, so the peak memory is the one of the case #
+def run_case(case):
+	name, size = case
+	seed = 'perf ' + name + ' ' + str(size)
+	phases = {}
+
+	# Generate or load the graph #
+	(num_tasks, task_graph, gpu_task_num, source), elapsed = measure(lambda rng: case_graph(name, size, rng), seed, repeat)
+	num_repeat = repeat if num_tasks <= repeat_max_tasks else 1
+	phases[{'random': 'graph_rand', 'bench': 'graph_predef', 'dot': 'parse_predef'}[source]] = elapsed
+
+	# Determine the number of all outgoing tasks of the tasks (which is also done while generating the graph) #
+	result, phases['num_out'] = measure(lambda rng: gen.num_out_task(task_graph), seed, num_repeat)
+
+	# Determine the execution times and deadline #
+	graph_type = 'y' if source == 'bench' else 'n'
+	(task_graph, deadline), phases['specify_et'] = measure(lambda rng: gen.specify_et(graph_type, num_tasks, task_graph, name, main.et_min, main.et_max, main.et_type, main.itr_et, main.dl_min_task, main.dl_max_task, main.dl_min_graph, main.dl_max_graph, gpu_task_num, rng), seed, num_repeat)
+
+	# Each task finishes one execution segment (CPU-only task), or five of them (GPU-using task), where the #
+	# end of each segment is an event of the mapping process #
+	num_gpu_tasks = task_graph.t_type.count(1)
+	num_events = num_tasks - num_gpu_tasks + 5 * num_gpu_tasks
+
+	# Map the graph using each algorithm #
+	configs = []
+	for alg in main.alg_list:
+		(output, result), elapsed = measure(lambda rng: main.map_graph(alg, num_tasks, main.num_cpu_threads, main.num_gpu_devices, main.loc_queue_cap, task_graph, deadline, 0, 0), seed, num_repeat)
+		configs.append({'config': alg[0] + ': ' + main.alg_name(alg), 'time': elapsed, 'tasks_per_s': num_tasks / elapsed, 'events_per_s': num_events / elapsed, 'response_time': result[0]})
+
+	record = {'case': name if size == None else name + ' ' + str(size), 'source': source, 'num_tasks': num_tasks, 'num_edge': task_graph.num_edge(), 'num_events': num_events, 'repeat': num_repeat, 'phases': {}, 'configs': configs, 'peak_rss': None}
+	for step in phases:
+		record['phases'][step] = {'time': phases[step], 'tasks_per_s': num_tasks / phases[step] if phases[step] > 0 else None}
+
+	# The peak resident set size in bytes (ru_maxrss is given in kilobytes on Linux and bytes on macOS) #
+	if resource != None:
+		record['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		if platform.system() != 'Darwin':
+			record['peak_rss'] *= 1024
+
+	return record
+
+# Find the commit of the build (empty if git is not available) #
+def build_commit():
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output = True, text = True, check = True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return ''
+
+# The path of the history file in the output folder #
+def history_path():
+	return os.path.join(main.output_dir, history_file)
+
+# Read the history of the measurements #
+def read_history():
+	if not os.path.exists(history_path()):
+		return []
+
+	with open(history_path()) as f:
+		return json.load(f)
+
+# Write the history of the measurements, where the file is replaced at the end, so an interrupted write #
+# does not lose the history #
+def write_history(history):
+	tmp_file = history_path() + '.tmp'
+	with open(tmp_file, 'w') as f:
+		json.dump(history, f, indent = 1)
+
+	os.replace(tmp_file, history_path())
+
+# Show the mapping speed of each case, as well as its change from the previous run of the history #
+def show_entry(entry, prev_entry):
+	prev_speed = {}
+	if prev_entry != None:
+		for record in prev_entry['cases']:
+			for config in record['configs']:
+				prev_speed[record['case'], config['config']] = config['tasks_per_s']
+
+	for record in entry['cases']:
+		print('\n' + record['case'] + ' (' + str(record['num_tasks']) + ' tasks, ' + str(record['num_edge']) + ' edges)\n------------------------------')
+
+		for step in record['phases']:
+			print(step + ': ' + format(record['phases'][step]['time'], '.4f') + ' s')
+
+		for config in record['configs']:
+			line = config['config'] + ': ' + format(config['tasks_per_s'], '.0f') + ' tasks/s, ' + format(config['events_per_s'], '.0f') + ' events/s'
+
+			key = (record['case'], config['config'])
+			if key in prev_speed:
+				line += ' (' + format(config['tasks_per_s'] / prev_speed[key] - 1, '+.1%') + ')'
+
+			print(line)
+
+		if record['peak_rss'] != None:
+			print('Peak RSS: ' + format(record['peak_rss'] / 2 ** 20, '.1f') + ' MiB')
+
+# The main function #
+# The configuration of main.py is given by the command line (see main.parse_args), e.g., the output folder, #
+# where argv is the list of its arguments (None: The arguments of the program) #
+def perf(argv = None):
+	main.apply_config(main.parse_args(argv))
+	os.makedirs(main.output_dir, exist_ok = True)
+
+	history = read_history()
+
+	entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'label': label, 'commit': build_commit(), 'python': platform.python_version(), 'machine': platform.machine(), 'cases': []}
+
+	# Each case is run by a new worker process, which applies the configuration of this process #
+	pool = multiprocessing.Pool(1, main.apply_config, (main.current_config(),), maxtasksperchild = 1)
+	try:
+		for record in pool.imap(run_case, perf_cases()):
+			entry['cases'].append(record)
+			print('Measured: ' + record['case'])
+
+		pool.close()
+		pool.join()
+	finally:
+		# The worker process is stopped if the measurement did not finish #
+		pool.terminate()
+
+	show_entry(entry, history[-1] if history else None)
+
+	history.append(entry)
+	write_history(history)
+
+if __name__ == '__main__':
+	perf()
@@ -0,0 +1,142 @@
+ #**************************************************************************
+ # sink.py
+ #
+ # Write the results of the simulations to the files, where the records are
+ # buffered and written in batches by a background thread, so writing the
+ # files does not stop the simulation.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import csv
+import json
+import os
+import queue
+import threading
+
+# The formats of the files, i.e., extension: format #
+# text: Each record is a line of text, csv: Comma-separated values with a header, jsonl: JSON Lines, #
+# parquet: Apache Parquet (needs pyarrow) #
+file_formats = {'.dat': 'text', '.txt': 'text', '.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+# Define the sink of the results, where the records (i.e., dictionaries of the fields, or lines for the text #
+# format) are collected in batches, and the batches are written to the file by the writer thread #
+class results_sink:
+	def __init__(self, file_name, fields = None, file_format = None, batch_size = 256, max_batches = 16):
+		if file_format == None:
+			file_format = file_formats.get(os.path.splitext(file_name)[1])
+		if file_format not in file_formats.values():
+			raise ValueError('Unknown format of the results file: ' + file_name)
+
+		# Parquet files are written only if pyarrow is installed #
+		if file_format == 'parquet':
+			try:
+				import pyarrow
+				import pyarrow.parquet
+			except ImportError:
+				raise ValueError('Writing the results to a Parquet file needs pyarrow: ' + file_name)
+
+			self.pyarrow = pyarrow
+
+		self.file_name = file_name
+		self.fields = fields # The fields of the records in the order of the columns (None: the fields of the first record)
+		self.file_format = file_format
+		self.batch_size = batch_size # Number of records of each batch
+		self.batch = [] # The records collected for the next batch
+		self.error = None # The error of the writer thread
+
+		# The batches waiting for the writer thread, where the simulation waits if the thread falls behind by #
+		# max_batches batches, so the memory is bounded #
+		self.queue = queue.Queue(max_batches)
+
+		self.thread = threading.Thread(target = self.writer, daemon = True)
+		self.thread.start()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	# Add a record to the file #
+	def write(self, record):
+		if self.error != None:
+			raise self.error
+
+		self.batch.append(record)
+		if len(self.batch) >= self.batch_size:
+			self.flush()
+
+	# Give the records collected so far to the writer thread #
+	def flush(self):
+		if self.batch:
+			self.queue.put(self.batch)
+			self.batch = []
+
+	# Write the remaining records and wait for the writer thread to finish #
+	def close(self):
+		if self.thread.is_alive():
+			self.flush()
+			self.queue.put(None)
+			self.thread.join()
+
+		if self.error != None:
+			raise self.error
+
+	# The writer thread, which writes each batch and then flushes the file #
+	def writer(self):
+		file = None
+		writer = None
+
+		try:
+			if self.file_format != 'parquet':
+				file = open(self.file_name, 'w', newline = '')
+
+			while True:
+				batch = self.queue.get()
+				if batch == None:
+					break
+
+				if self.file_format == 'text':
+					file.writelines(batch)
+				elif self.file_format == 'csv':
+					if writer == None:
+						if self.fields == None:
+							self.fields = list(batch[0])
+						writer = csv.DictWriter(file, self.fields)
+						writer.writeheader()
+					writer.writerows(batch)
+				elif self.file_format == 'jsonl':
+					file.writelines(json.dumps(record) + '\n' for record in batch)
+				else:
+					table = self.pyarrow.Table.from_pylist(batch)
+					if self.fields != None:
+						table = table.select(self.fields)
+					if writer == None:
+						writer = self.pyarrow.parquet.ParquetWriter(self.file_name, table.schema)
+					writer.write_table(table.cast(writer.schema))
+
+				if file != None:
+					file.flush()
+		except Exception as error:
+			self.error = error
+
+			# Take the remaining batches, so the simulation does not wait for the thread #
+			while self.queue.get() != None:
+				pass
+		finally:
+			if file != None:
+				file.close()
+			if self.file_format == 'parquet' and writer != None:
+				writer.close()
@@ -0,0 +1,280 @@
+ #**************************************************************************
+ # sweep.py
+ #
+ # Run the parameter studies of the mapping algorithms (e.g., the ones in
+ # the "simulation results" folder) over a grid of the simulation
+ # parameters, where the finished cells of the grid are kept on disk so
+ # that an interrupted sweep resumes where it stopped.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import gen
+import main
+import math
+import os
+import shutil
+import itertools
+import hashlib
+import json
+import multiprocessing
+
+# Global variables #
+sweep_dir = 'output/sweep' # The folder of the studies, where each case is placed in "category N/case M"
+num_workers = 0 # Number of worker processes running the cells; 0: Number of CPU cores, 1: No worker process
+itr_prg = main.itr_prg # Number of iterations for each cell
+
+# The parameters of the cells, in the order of writing them to info.txt, and their default values #
+param_list = ['max_num_tasks', 'ran_pro', 'type_pro', 'et_min', 'et_max', 'et_type', 'num_cpu_threads', 'num_gpu_devices', 'loc_queue_cap']
+param_default = {'max_num_tasks': main.max_num_tasks, 'ran_pro': main.ran_pro, 'type_pro': main.type_pro, 'et_min': main.et_min, 'et_max': main.et_max, 'et_type': main.et_type, 'num_cpu_threads': main.num_cpu_threads, 'num_gpu_devices': main.num_gpu_devices, 'loc_queue_cap': None}
+
+# The studies, i.e., [category, case, parameters] #
+# Each parameter given as a list of values is a dimension of the grid, where the parameters given together as #
+# a tuple change together. The other parameters have their default values, and loc_queue_cap is calculated #
+# from the number of threads and devices if it is not given #
+case_list = [
+	[1, 1, {'max_num_tasks': [100, 200, 300, 400, 500], 'ran_pro': 0.01}],
+	[1, 2, {'ran_pro': 0.01, 'et_max': [10, 20, 30, 40, 50]}],
+	[1, 3, {'ran_pro': 0.01, ('num_cpu_threads', 'num_gpu_devices'): [(4, 2), (8, 4), (16, 4), (32, 8), (64, 8)]}],
+	[2, 4, {'max_num_tasks': [100, 200, 300, 400, 500], 'ran_pro': 0.03}],
+	[2, 5, {'ran_pro': 0.03, 'et_max': [10, 20, 30, 40, 50]}],
+	[2, 6, {'ran_pro': 0.03, ('num_cpu_threads', 'num_gpu_devices'): [(4, 2), (8, 4), (16, 4), (32, 8), (64, 8)]}],
+	[3, 7, {'max_num_tasks': [100, 200, 300, 400, 500], 'ran_pro': 0.05}],
+	[3, 8, {'ran_pro': 0.05, 'et_max': [10, 20, 30, 40, 50]}],
+	[3, 9, {'ran_pro': 0.05, ('num_cpu_threads', 'num_gpu_devices'): [(4, 2), (8, 4), (16, 4), (32, 8), (64, 8)]}]
+]
+
+# Specify the folder of a case #
+def case_folder(category, case):
+	return os.path.join(sweep_dir, 'category ' + str(category), 'case ' + str(case))
+
+# Specify the cells of a case, i.e., the parameters of each point of the grid #
+def case_cells(case_param):
+	dim_list = [] # The dimensions of the grid, i.e., [parameter names, values]
+	base = dict(param_default)
+
+	for key in case_param:
+		if isinstance(case_param[key], list):
+			if isinstance(key, tuple):
+				dim_list.append([key, case_param[key]])
+			else:
+				dim_list.append([(key,), [(value,) for value in case_param[key]]])
+		else:
+			base[key] = case_param[key]
+
+	cells = []
+	for point in itertools.product(*[dim[1] for dim in dim_list]):
+		param = dict(base)
+		for i in range(len(dim_list)):
+			for j in range(len(dim_list[i][0])):
+				param[dim_list[i][0][j]] = point[i][j]
+
+		if param['loc_queue_cap'] == None:
+			param['loc_queue_cap'] = math.ceil(param['num_cpu_threads'] / param['num_gpu_devices'])
+
+		cells.append(param)
+
+	return cells
+
+# Write the parameters of a case to info.txt in the format of the existing studies #
+def write_info(folder, cells, case_param):
+	# The names of the parameters given in the case #
+	given = []
+	for key in case_param:
+		if isinstance(key, tuple):
+			given.extend(key)
+		else:
+			given.append(key)
+
+	file = open(os.path.join(folder, 'info.txt'), 'w')
+
+	for name in param_list:
+		# et_type and loc_queue_cap are written only if they are given in the case, as in the existing studies #
+		if name in ['et_type', 'loc_queue_cap'] and name not in given:
+			continue
+
+		values = []
+		for param in cells:
+			values.append(param[name])
+
+		if all(value == values[0] for value in values):
+			file.write(name + ' = ' + str(values[0]) + '\n')
+		else:
+			file.write(name + ' = {' + ', '.join(str(value) for value in values) + '}\n')
+
+	file.close()
+
+# The master seed of a cell, which is given by the case and the parameters of the cell (not the folder), so #
+# the graphs of the cell do not depend on the other cells, the order of running the cells, or sweep_dir #
+def cell_seed(category, case, param):
+	return 'sweep ' + json.dumps([category, case, [param[name] for name in param_list]])
+
+# The key of a cell, i.e., the hash of everything its results depend on (its master seed, the number of #
+# iterations, the algorithms and their weights, and the parameters of main.py used for the graphs), which is #
+# written to the info.txt of the cell, so a finished cell is run again if its key differs #
+def cell_key(category, case, param):
+	data = [cell_seed(category, case, param), itr_prg, main.alg_list, main.policy_weights, main.bench_name, main.itr_et, main.dl_min_task, main.dl_max_task, main.dl_min_graph, main.dl_max_graph]
+
+	return hashlib.sha256(json.dumps(data, sort_keys = True).encode()).hexdigest()[:16]
+
+# Read the key of a finished cell (None: the cell is not finished or its key is not given) #
+def read_key(cell_folder):
+	file_name = os.path.join(cell_folder, 'info.txt')
+	if not os.path.exists(file_name):
+		return None
+
+	with open(file_name) as file:
+		for line in file:
+			if line.startswith('key = '):
+				return line[len('key = '):].strip()
+
+	return None
+
+# Run the iterations of a cell, which can be done by a worker process #
+def run_cell(cell):
+	folder, cell_num, param, master_seed, key = cell
+
+	# Each iteration has its own generator derived from the master seed of the cell #
+
+	results = [] # The response time and missed deadline of the algorithms in each iteration
+	max_tasks = [] # The maximum number of parallel tasks of each run measuring it
+	num_edge = [] # The number of edges of the graph in each iteration
+
+	for i in range(itr_prg):
+		rng = gen.iteration_rng(master_seed, i)
+
+		# Generate the graph randomly #
+		num_tasks, task_graph, gpu_task_num = gen.graph_rand(param['max_num_tasks'], param['type_pro'], param['ran_pro'], [], rng)
+		num_edge.append(task_graph.num_edge())
+
+		# Determine execution time of tasks and deadline of the system #
+		task_graph, deadline = gen.specify_et('n', num_tasks, task_graph, main.bench_name, param['et_min'], param['et_max'], param['et_type'], main.itr_et, main.dl_min_task, main.dl_max_task, main.dl_min_graph, main.dl_max_graph, gpu_task_num, rng)
+
+		# Map the graph using the algorithms #
+		row = []
+		for alg in main.alg_list:
+			output, result = main.map_graph(alg, num_tasks, param['num_cpu_threads'], param['num_gpu_devices'], param['loc_queue_cap'], task_graph, deadline, 0, 0)
+
+			row.append(result)
+			if result[2] != None:
+				max_tasks.append(result[2])
+
+		results.append(row)
+
+	return folder, cell_num, param, key, results, max_tasks, num_edge
+
+# Write the results of a cell to its folder #
+# The files are written to a temporary folder that is renamed at the end, so a cell folder exists only if #
+# the cell is finished (where the folder of an outdated cell is replaced) #
+def save_cell(folder, cell_num, param, key, results, max_tasks, num_edge):
+	cell_folder = os.path.join(folder, 'cell ' + str(cell_num))
+	tmp_folder = cell_folder + '.tmp'
+
+	if os.path.exists(tmp_folder):
+		shutil.rmtree(tmp_folder)
+	os.makedirs(tmp_folder)
+
+	# The parameters and key of the cell #
+	file = open(os.path.join(tmp_folder, 'info.txt'), 'w')
+	for name in param_list:
+		file.write(name + ' = ' + str(param[name]) + '\n')
+	file.write('key = ' + key + '\n')
+	file.close()
+
+	# The response time and missed deadline of the algorithms (one line per iteration) #
+	file = open(os.path.join(tmp_folder, 'results.dat'), 'w')
+	for i in range(len(results)):
+		line = []
+		for result in results[i]:
+			line.append(str(result[0]))
+			line.append(str(result[1]))
+
+		file.write('\t'.join(line) + '\n')
+	file.close()
+
+	# The maximum number of parallel tasks running using CPUs and GPUs #
+	file = open(os.path.join(tmp_folder, 'max_tasks.dat'), 'w')
+	for i in range(len(max_tasks)):
+		file.write(str(max_tasks[i][0]) + '\t' + str(max_tasks[i][1]) + '\n')
+	file.close()
+
+	# The number of edges of the graphs #
+	file = open(os.path.join(tmp_folder, 'num_edge.dat'), 'w')
+	for i in range(len(num_edge)):
+		file.write(str(num_edge[i]) + '\n')
+	file.close()
+
+	if os.path.exists(cell_folder):
+		shutil.rmtree(cell_folder)
+	os.replace(tmp_folder, cell_folder)
+
+# The main function #
+def sweep():
+	# Specify the cells that are not finished yet, or whose parameters have been changed since they were #
+	# finished #
+	cell_list = []
+	num_cells = 0
+	num_outdated = 0
+
+	for category, case, case_param in case_list:
+		folder = case_folder(category, case)
+		os.makedirs(folder, exist_ok = True)
+
+		cells = case_cells(case_param)
+		write_info(folder, cells, case_param)
+
+		for i in range(len(cells)):
+			num_cells += 1
+
+			key = cell_key(category, case, cells[i])
+			finished_key = read_key(os.path.join(folder, 'cell ' + str(i + 1)))
+
+			if finished_key != key:
+				cell_list.append([folder, i + 1, cells[i], cell_seed(category, case, cells[i]), key])
+
+				if finished_key != None:
+					num_outdated += 1
+
+	print('Cells: ' + str(num_cells) + ', finished: ' + str(num_cells - len(cell_list)) + ', outdated: ' + str(num_outdated))
+
+	# Run the cells in the worker processes, where each finished cell is saved at once #
+	pool = None
+	try:
+		if num_workers == 1:
+			cell_results = map(run_cell, cell_list)
+		else:
+			if num_workers == 0:
+				pool = multiprocessing.Pool(os.cpu_count())
+			else:
+				pool = multiprocessing.Pool(num_workers)
+
+			cell_results = pool.imap_unordered(run_cell, cell_list)
+
+		num_done = num_cells - len(cell_list)
+		for folder, cell_num, param, key, results, max_tasks, num_edge in cell_results:
+			save_cell(folder, cell_num, param, key, results, max_tasks, num_edge)
+
+			num_done += 1
+			print('[' + str(num_done) + '/' + str(num_cells) + '] ' + folder + ', cell ' + str(cell_num))
+
+		if pool != None:
+			pool.close()
+			pool.join()
+	finally:
+		# The worker processes are stopped if the sweep did not finish #
+		if pool != None:
+			pool.terminate()
+
+if __name__ == '__main__':
+	sweep()
@@ -0,0 +1,57 @@
+ #**************************************************************************
+ # conftest.py
+ #
+ # Make the modules at the root of the repository importable by the tests,
+ # and provide a small benchmark.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import json
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gen
+
+# The execution times of the tasks of the small benchmark in its two task graphs #
+toy_et = [[[10, 13], [20], [7, 9], [30]], [[16], [21, 22], [8], [31, 35]]]
+
+# Create the files of a small benchmark (named toy) in the folder benchmark of a temporary folder, which is #
+# the current folder of the test, where the benchmarks loaded in the process are not used #
+@pytest.fixture
+def toy_bench(tmp_path, monkeypatch):
+	folder = tmp_path / 'benchmark'
+	folder.mkdir()
+
+	(folder / 'toy_tdg_modified.dot').write_text('0 -> 1 \n   0 -> 2 \n   1 -> 3 \n   2 -> 3 \n')
+	(folder / 'toy_gpu_task.dat').write_text('1-2\n')
+	(folder / 'toy_gpu_trace.csv').write_text('40, memcopy:start\n270, memcopy:terminate\n318, kernel:start\n1318, kernel:terminate\n1400, memcopy:start\n1500, memcopy:terminate\n1600, kernel:start\n1850, kernel:terminate\n')
+
+	graphs = []
+	for graph_id, graph_et in enumerate(toy_et):
+		nodes = {}
+		for t_id, et_list in enumerate(graph_et):
+			nodes[str(t_id)] = {'ins': [], 'outs': [], 'results': [{'thread': 0, 'execution_total_time': et} for et in et_list]}
+
+		graphs.append({'taskgraph_id': graph_id + 1, 'nodes': nodes})
+
+	(folder / 'toy_json.json').write_text(json.dumps({'toy': graphs}, indent = 4))
+
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.setattr(gen, 'bench_cache', {})
+
+	return 'toy'
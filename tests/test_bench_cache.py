@@ -0,0 +1,107 @@
+ #**************************************************************************
+ # test_bench_cache.py
+ #
+ # Test the cache files of the benchmarks.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from array import array
+import os
+import pytest
+import gen
+from conftest import toy_et
+
+cache_file = os.path.join('benchmark', 'toy_cache.bin')
+
+# Give the data of a benchmark as lists #
+def as_lists(data):
+	return dict([[attr, list(getattr(data, attr))] for attr in gen.bench_data.__slots__])
+
+# Load the benchmark again in a new process, i.e., without the benchmarks loaded in the process #
+def reload(monkeypatch, bench_name):
+	monkeypatch.setattr(gen, 'bench_cache', {})
+	return gen.load_bench(bench_name)
+
+# Fail if the files of the benchmark are parsed #
+def no_build(bench_name):
+	raise AssertionError('the benchmark ' + bench_name + ' is parsed')
+
+# The data of the benchmark is parsed from its files #
+def test_build_bench(toy_bench):
+	data = gen.load_bench(toy_bench)
+	samples = [toy_et[0][t_id] + toy_et[1][t_id] for t_id in range(4)]
+
+	assert list(data.gpu_task_num) == [1, 2]
+	assert list(data.et_min) == [min(et_list) for et_list in samples]
+	assert list(data.et_avg) == [round(sum(et_list) / len(et_list)) for et_list in samples]
+	assert list(data.et_max) == [max(et_list) for et_list in samples]
+	assert list(data.mem_copy_diff) == [230, 100]
+	assert list(data.kernel_diff) == [1000, 250]
+	assert list(data.num_out) == [3, 1, 1, 0] # All the tasks after each task
+
+	# The benchmark is loaded once in the process #
+	assert gen.load_bench(toy_bench) is data
+
+# The cache file is built when the benchmark is loaded, and then it is read instead of the files of the #
+# benchmark #
+def test_read_cache(toy_bench, monkeypatch):
+	data = as_lists(gen.load_bench(toy_bench))
+	assert os.path.exists(cache_file)
+	assert not [name for name in os.listdir('benchmark') if name.endswith('.tmp')]
+
+	monkeypatch.setattr(gen, 'build_bench', no_build)
+	assert as_lists(reload(monkeypatch, toy_bench)) == data
+
+# The cache file is built again if a file of the benchmark changes #
+def test_changed_file(toy_bench, monkeypatch):
+	gen.load_bench(toy_bench)
+
+	with open(os.path.join('benchmark', 'toy_gpu_trace.csv'), 'a') as f:
+		f.write('2000, kernel:start\n2100, kernel:terminate\n')
+
+	data = reload(monkeypatch, toy_bench)
+	assert list(data.kernel_diff) == [1000, 250, 100]
+
+	monkeypatch.setattr(gen, 'build_bench', no_build)
+	assert list(reload(monkeypatch, toy_bench).kernel_diff) == [1000, 250, 100]
+
+# A cache file that is not valid (i.e., truncated, of another format, or of another version) is built again #
+@pytest.mark.parametrize('damage', ['empty', 'header', 'items', 'magic', 'version'])
+def test_invalid_cache(toy_bench, monkeypatch, damage):
+	data = as_lists(gen.load_bench(toy_bench))
+
+	with open(cache_file, 'rb') as f:
+		contents = f.read()
+
+	header_size = len(gen.bench_cache_magic) + 8 + 32
+	contents = {'empty': b'',
+		'header': contents[:header_size - 1],
+		'items': contents[:-1],
+		'magic': b'X' + contents[1:],
+		'version': contents[:len(gen.bench_cache_magic)] + array('q', [gen.bench_cache_version + 1]).tobytes() + contents[len(gen.bench_cache_magic) + 8:]}[damage]
+
+	with open(cache_file, 'wb') as f:
+		f.write(contents)
+
+	built = []
+	build_bench = gen.build_bench
+	monkeypatch.setattr(gen, 'build_bench', lambda bench_name: built.append(bench_name) or build_bench(bench_name))
+
+	assert as_lists(reload(monkeypatch, toy_bench)) == data
+	assert built == [toy_bench]
+
+	# The cache file built again is valid #
+	monkeypatch.setattr(gen, 'build_bench', no_build)
+	assert as_lists(reload(monkeypatch, toy_bench)) == data
@@ -0,0 +1,77 @@
+ #**************************************************************************
+ # test_events.py
+ #
+ # Test the events of the ends of the execution segments that advance the
+ # mapping simulation.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import pytest
+import func
+
+# The end of a segment is noticed at the first time unit not before its finish time, and never at the time the #
+# segment starts #
+def test_add_event():
+	event_heap = []
+	func.add_event(event_heap, 5, 7.2, 0) # Noticed at 8
+	func.add_event(event_heap, 5, 7, 1) # Noticed at 7
+	func.add_event(event_heap, 5, 5, 2) # A segment of no time, noticed at 6
+	func.add_event(event_heap, 5, 3.5, 3) # Noticed at 6
+
+	assert sorted(event_heap) == [[6, 2], [6, 3], [7, 1], [8, 0]]
+
+# The due events are taken in the order of their times, and the later events are kept #
+def test_due_events():
+	event_heap = []
+	for res_id, f_time in enumerate([9, 3, 6, 3, 12]):
+		func.add_event(event_heap, 0, f_time, res_id)
+
+	assert func.due_events(event_heap, 2) == []
+	assert sorted(func.due_events(event_heap, 3)) == [1, 3]
+	assert func.due_events(event_heap, 9) == [2, 0]
+	assert event_heap == [[12, 4]]
+
+# The next time is the earliest event of the threads and devices, or the next time unit after a change #
+def test_next_event():
+	thr_events = []
+	dev_events = []
+	func.add_event(thr_events, 0, 40, 0)
+	func.add_event(thr_events, 0, 25, 1)
+	func.add_event(dev_events, 0, 31, 0)
+
+	assert func.next_event(thr_events, dev_events, 10, False) == 25
+	assert func.next_event(thr_events, dev_events, 10, True) == 11
+	assert func.next_event([], dev_events, 10, False) == 31
+
+# Without any event or change, the mapping process never ends #
+def test_next_event_blocked():
+	with pytest.raises(RuntimeError, match = 'blocked at time 10'):
+		func.next_event([], [], 10, False)
+
+# The threads or devices are visited once in the order of their IDs, where the ones added while visiting are #
+# visited at the same time only if their IDs are after the current one #
+def test_visit_list():
+	visit = func.visit_list([4, 0, 2, 4, 0])
+	visited = []
+
+	for res_id in visit:
+		visited.append(res_id)
+
+		if res_id == 2:
+			visit.add(1) # Already passed
+			visit.add(3)
+			visit.add(4) # Already in the list
+
+	assert visited == [0, 2, 3, 4]
@@ -0,0 +1,67 @@
+ #**************************************************************************
+ # test_gen.py
+ #
+ # Test the specification of the execution times of the tasks.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import random
+import pytest
+import gen
+
+# The arrays of the graph are filled in place with the values of the definitions of each task, and the #
+# deadline of the system is an integer #
+@pytest.mark.parametrize('et_type', ['min', 'avg', 'max'])
+def test_specify_et(et_type):
+	rng = random.Random(4)
+	num_tasks, task_graph, gpu_task_num = gen.graph_rand(400, 0.5, 0.01, [], rng)
+	arrays = [task_graph.exe_time, task_graph.memcopy1_time, task_graph.gpu_time, task_graph.cpu1_time, task_graph.deadline, task_graph.res_time]
+
+	state = rng.getstate()
+	task_graph, deadline = gen.specify_et('n', num_tasks, task_graph, None, 2, 40, et_type, 3, 1, 5, 1, 4, gpu_task_num, rng)
+
+	assert all(x is y for x, y in zip(arrays, [task_graph.exe_time, task_graph.memcopy1_time, task_graph.gpu_time, task_graph.cpu1_time, task_graph.deadline, task_graph.res_time]))
+	assert type(deadline) is int
+
+	# The values of each task drawn in the same order #
+	rng.setstate(state)
+	ran_all = [rng.random() for i in range(num_tasks * 3)]
+	dl_task = [rng.randint(1, 5) for i in range(num_tasks)]
+	dl_graph = rng.randint(1, 4)
+
+	exe_time = []
+	for i in range(num_tasks):
+		scale = 10 if task_graph.t_type[i] == 1 else 1
+		values = [round(r * 38 * scale) for r in ran_all[3 * i:3 * i + 3]]
+		exe_time.append({'min': min(values), 'avg': round(sum(values) / 3), 'max': max(values)}[et_type])
+
+	sum_et = sum(exe_time)
+	assert deadline == dl_graph * sum_et
+
+	for i in range(num_tasks):
+		assert task_graph.exe_time[i] == exe_time[i]
+
+		if task_graph.t_type[i] == 1:
+			memcopy_time = round(exe_time[i] * 0.05, 2)
+			gpu_time = round(exe_time[i] * 0.85, 2)
+			assert task_graph.memcopy1_time[i] == task_graph.memcopy2_time[i] == memcopy_time
+			assert task_graph.gpu_time[i] == gpu_time
+			assert task_graph.cpu1_time[i] == task_graph.cpu2_time[i] == round(abs(exe_time[i] - (memcopy_time + gpu_time + memcopy_time)) / 2, 2)
+			assert task_graph.deadline[i] == dl_task[i] * 10
+		else:
+			assert task_graph.memcopy1_time[i] == task_graph.gpu_time[i] == task_graph.cpu1_time[i] == 0
+			assert task_graph.deadline[i] == dl_task[i]
+
+		assert task_graph.res_time[i] == round(deadline * exe_time[i] / sum_et)
@@ -0,0 +1,50 @@
+ #**************************************************************************
+ # test_instrument.py
+ #
+ # Test the counters of the profiler of the mapping process.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import random
+import gen
+import main
+import instrument
+
+# The counters of a run match the graph and the response time, i.e., each task is dispatched to a thread once #
+# (twice for a GPU-using task) and to a device once for a GPU-using task, each execution segment ends with an #
+# event, each data dependency is checked once, and each time unit up to the response time is either #
+# processed or skipped #
+def test_counters():
+	rng = random.Random(3)
+	num_tasks, task_graph, gpu_task_num = gen.graph_rand(500, 0.5, 0.02, [], rng)
+	task_graph, deadline = gen.specify_et('n', num_tasks, task_graph, None, 1, 10, 'max', 3, 1, 4, 1, 3, gpu_task_num, rng)
+	num_gpu_tasks = sum(task_graph.t_type)
+
+	for alg in main.alg_list[:3]:
+		prof = instrument.profiler()
+		prof.start()
+		try:
+			output, result = main.map_graph(alg, num_tasks, 4, 2, 4, task_graph, deadline, 0, 0)
+		finally:
+			prof.stop()
+
+		counters = prof.report()['counters']
+
+		assert counters['runs'] == 1
+		assert counters['cpu_dispatches'] == num_tasks + num_gpu_tasks
+		assert counters['gpu_dispatches'] == num_gpu_tasks
+		assert counters['events'] == num_tasks + 4 * num_gpu_tasks
+		assert counters['dep_checks'] == task_graph.num_edge()
+		assert counters['ticks'] + counters['skipped_ticks'] == result[0]
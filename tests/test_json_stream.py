@@ -0,0 +1,87 @@
+ #**************************************************************************
+ # test_json_stream.py
+ #
+ # Test reading the JSON files of the benchmarks as a stream.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import io
+import json
+import random
+import pytest
+import gen
+from conftest import toy_et
+
+# Walk a JSON value using the stream, where the objects and arrays are walked item by item #
+def walk(stream, depth = 0):
+	char = stream.peek()
+
+	if char == '{' and depth < 3:
+		obj = {}
+		for key in stream.items():
+			obj[key] = walk(stream, depth + 1)
+		return obj
+	elif char == '[' and depth < 3:
+		array = []
+		for i in stream.elements():
+			array.append(walk(stream, depth + 1))
+		return array
+	else:
+		return stream.value()
+
+# Generate a random JSON value #
+def rand_value(rng, depth = 0):
+	kind = rng.randrange(7 if depth < 4 else 4)
+
+	if kind == 0:
+		return rng.randrange(-10 ** 12, 10 ** 12)
+	elif kind == 1:
+		return rng.choice([0.5, -1e-7, 12345.678, 3e100])
+	elif kind == 2:
+		return ''.join([rng.choice('ab ,:{}[]"\\\\é') for i in range(rng.randrange(6))])
+	elif kind == 3:
+		return rng.choice([True, False, None])
+	elif kind in [4, 5]:
+		return dict([[str(rng.randrange(100)), rand_value(rng, depth + 1)] for i in range(rng.randrange(4))])
+	else:
+		return [rand_value(rng, depth + 1) for i in range(rng.randrange(4))]
+
+# The values walked by the stream are the ones of the JSON file, whatever the size of the chunks read from the #
+# file (i.e., the values and white spaces split between the chunks) #
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1 << 16])
+def test_json_stream(chunk_size):
+	rng = random.Random(chunk_size)
+
+	for i in range(50):
+		value = {'a': [rand_value(rng) for j in range(3)], 'b': rand_value(rng)}
+		text = json.dumps(value, indent = rng.choice([None, 1, 4]), ensure_ascii = rng.choice([True, False]))
+
+		assert walk(gen.json_stream(io.StringIO(text), chunk_size)) == value
+
+# An invalid JSON file is not read #
+@pytest.mark.parametrize('text', ['{"a": 1 "b": 2}', '[1, 2', '{"a": [1, 2}', '{"a": tru}'])
+def test_json_stream_invalid(text):
+	with pytest.raises(ValueError):
+		walk(gen.json_stream(io.StringIO(text), 3))
+
+# The execution times of each task are reduced to the minimum, average, and maximum of its samples in all #
+# task graphs of the benchmark #
+def test_parse_bench_et(toy_bench):
+	index = gen.parse_bench_et(toy_bench)
+
+	assert sorted(index) == [0, 1, 2, 3]
+	for t_id in index:
+		samples = toy_et[0][t_id] + toy_et[1][t_id]
+		assert index[t_id] == {'min': min(samples), 'avg': round(sum(samples) / len(samples)), 'max': max(samples)}
@@ -0,0 +1,46 @@
+ #**************************************************************************
+ # test_main.py
+ #
+ # Test running the iterations of main.py in the worker processes.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run main.py in a new process (so its configuration is not kept), and give the files of the results, where #
+# the wall-clock times of the records are removed #
+def run_main(folder, num_workers):
+	subprocess.run([sys.executable, os.path.join(root, 'main.py'), '--graph', 'random', '--output-dir', str(folder), '--seed', '11', '--set', 'itr_prg=4', '--set', 'max_num_tasks=120', '--set', 'num_workers=' + str(num_workers)], cwd = str(folder.parent), check = True, stdout = subprocess.DEVNULL)
+
+	files = {}
+	for name in ['results.dat', 'max_tasks.dat', 'num_edge.dat', 'results.csv']:
+		with open(os.path.join(str(folder), name)) as file:
+			files[name] = file.read()
+
+	files['results.csv'] = [line.rsplit(',', 1)[0] for line in files['results.csv'].splitlines()]
+
+	return files
+
+# The worker processes, which generate the graphs of their iterations, give the same results in the same order #
+# as the serial run #
+def test_workers(tmp_path):
+	serial = run_main(tmp_path / 'serial', 1)
+
+	assert len(serial['results.dat'].splitlines()) == 4
+	assert run_main(tmp_path / 'workers', 3) == serial
@@ -0,0 +1,227 @@
+ #**************************************************************************
+ # test_queues.py
+ #
+ # Test the queues of tasks, the index of the threads and devices, and the
+ # CPU allocation algorithms using them, and the ready set of the tasks.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from array import array
+from types import SimpleNamespace
+import random
+import pytest
+import func
+import mapping
+
+# The queue without a priority keeps the order of insertion #
+def test_task_queue_fifo():
+	queue = func.task_queue()
+	for task in [5, 3, 8]:
+		queue.append(task)
+
+	assert list(queue) == [5, 3, 8]
+	assert [queue.pop() for i in range(3)] == [5, 3, 8]
+	assert len(queue) == 0
+
+# The task with the lowest priority value is selected first, where the earliest inserted task wins ties #
+def test_task_queue_priority():
+	value = [3, 1, 2, 1, 3]
+	queue = func.task_queue(value.__getitem__)
+	for task in range(5):
+		queue.append(task)
+
+	assert [queue.pop() for i in range(5)] == [1, 3, 2, 0, 4]
+
+# Removing a task keeps the order of the others #
+def test_task_queue_remove():
+	queue = func.task_queue(lambda task: -task)
+	for task in range(6):
+		queue.append(task)
+
+	queue.remove(3)
+	queue.remove(7) # Not in the queue
+
+	assert list(queue) == [0, 1, 2, 4, 5]
+	assert queue.pop() == 5
+
+# Add the values of the tasks one by one, like the original mapping process #
+def running_sum(values, tasks):
+	total = 0
+	for task in tasks:
+		total += values[task]
+
+	return total
+
+# The totals are the running sums of the values in the order of the queue, whatever the order of the #
+# insertions and removals, with values whose sums are exact or not #
+@pytest.mark.parametrize('kind', ['int', 'float', 'mixed'])
+def test_task_queue_totals(kind):
+	rng = random.Random(1)
+	if kind == 'int':
+		values = array('d', [rng.randrange(1000) for i in range(100)])
+	elif kind == 'float':
+		values = array('d', [round(rng.uniform(0, 10), 2) for i in range(100)])
+	else:
+		values = array('d', [rng.choice([round(rng.uniform(0, 10), 2), rng.random() * 1e-300, 1e200, 3]) for i in range(100)])
+
+	queue = func.task_queue(values.__getitem__, {'val': values})
+	tasks = [] # The tasks in the order of the queue
+
+	for i in range(3000):
+		if len(tasks) == 100 or (tasks and rng.random() < 0.5):
+			if rng.random() < 0.5:
+				task = queue.pop()
+			else:
+				task = rng.choice(tasks)
+				queue.remove(task)
+
+			tasks.remove(task)
+		else:
+			task = rng.choice([task for task in range(100) if task not in tasks])
+			queue.append(task)
+			tasks.append(task)
+
+		assert repr(queue.tot['val']) == repr(running_sum(values, tasks))
+
+	other = func.task_queue(None, {'val': values})
+	for task in range(100):
+		if task not in tasks:
+			other.append(task)
+
+	assert func.queues_tot([queue, other], 'val') == running_sum(values, tasks + list(other))
+
+# The ties of the totals are the ones of the running sums, e.g., 0.1 + 0.2 + 0.3 is more than 0.6, so MTET #
+# selects the thread of the task of 0.6 (the exact sums are equal, where the thread with the lowest ID wins) #
+def test_task_queue_totals_tie():
+	exe_time = array('d', [0.1, 0.2, 0.3, 0.6, 5])
+	sim = alloc_sim(mapping.cpu_alloc_MTET(), [-1, -1], [[4, 0, 1, 2], [3]], exe_time)
+	sim.alloc_queue[0].remove(4)
+	sim.alloc_index.update(0)
+
+	assert sim.alloc_queue[0].tot['exe_time'] == 0.1 + 0.2 + 0.3 > 0.6
+	assert mapping.cpu_alloc_MTET().select(sim, 1) == 1
+
+# The thread or device with the lowest key is selected, where the lowest ID wins ties, and the excluded ones #
+# are not selected #
+def test_res_index():
+	key = [4, 2, 2, 7]
+	index = func.res_index(4, key.__getitem__)
+	assert index.top() == 1
+	assert len(index) == 4
+
+	key[1] = 9
+	index.update(1)
+	assert index.top() == 2
+
+	index.exclude(2)
+	assert index.top() == 0
+	assert len(index) == 3
+
+	key[3] = 0
+	index.update(3)
+	index.update(2)
+	assert index.top() == 3
+	assert len(index) == 4
+
+# The index gives the same selection as scanning the keys after many updates (i.e., the outdated entries are #
+# discarded correctly) #
+def test_res_index_random():
+	rng = random.Random(2)
+	key = [rng.randrange(10) for i in range(8)]
+	included = [True] * 8
+	index = func.res_index(8, key.__getitem__)
+
+	for i in range(2000):
+		res_id = rng.randrange(8)
+		if rng.random() < 0.2:
+			index.exclude(res_id)
+			included[res_id] = False
+		else:
+			key[res_id] = rng.randrange(10)
+			index.update(res_id)
+			included[res_id] = True
+
+		if any(included):
+			assert index.top() == min([[key[j], j] for j in range(8) if included[j]])[1]
+
+# Create the part of the simulator used by the CPU allocation algorithms #
+def alloc_sim(policy, last_idle, queue_tasks, exe_time):
+	sim = SimpleNamespace(num_cpu_threads = len(last_idle), last_idle = list(last_idle), alloc_queue = [], num_tasks_cpu = 0)
+	for tasks in queue_tasks:
+		queue = func.task_queue(None, {'exe_time': exe_time, 'res_time': exe_time})
+		for task in tasks:
+			queue.append(task)
+
+		sim.alloc_queue.append(queue)
+		sim.num_tasks_cpu += len(tasks)
+
+	sim.alloc_index = func.res_index(sim.num_cpu_threads, lambda thr_id: policy.key(sim, thr_id))
+
+	return sim
+
+# The thread selected by MRIT and TMCD is the one of sorting the costs of all threads #
+def test_cpu_alloc_select():
+	rng = random.Random(3)
+	exe_time = array('d', [round(rng.uniform(1, 10), 2) for i in range(50)])
+
+	for i in range(300):
+		num_threads = rng.randrange(1, 6)
+		t = rng.randrange(1, 20)
+		last_idle = [rng.choice([-1, rng.randrange(t + 1)]) for j in range(num_threads)]
+		queue_tasks = [rng.sample(range(50), rng.randrange(4)) for j in range(num_threads)]
+		rec_idle_time = [t - last_idle[j] if last_idle[j] != -1 else 0 for j in range(num_threads)]
+
+		# MRIT: the most recent idle time #
+		sim = alloc_sim(mapping.cpu_alloc_MRIT(), last_idle, queue_tasks, exe_time)
+		assert sim.alloc_index.top() in range(num_threads)
+		assert mapping.cpu_alloc_MRIT().select(sim, t) == sorted(range(num_threads), key = lambda j: rec_idle_time[j], reverse = True)[0]
+
+		# TMCD: the least cost #
+		policy = mapping.cpu_alloc_TMCD()
+		policy.beta = 0.3
+		sim = alloc_sim(policy, last_idle, queue_tasks, exe_time)
+
+		total_num_tasks = max(sum([len(tasks) for tasks in queue_tasks]), 1)
+		total_it = sum(rec_idle_time) or 1
+		total_et = running_sum(exe_time, [task for tasks in queue_tasks for task in tasks]) or 1
+		cost = []
+		for j in range(num_threads):
+			val_it = 1 / (rec_idle_time[j] / total_it) if rec_idle_time[j] != 0 else 0
+			cost.append(policy.alpha * len(queue_tasks[j]) / total_num_tasks + policy.beta * val_it + policy.gamma * running_sum(exe_time, queue_tasks[j]) / total_et)
+
+		assert policy.select(sim, t) == sorted(range(num_threads), key = lambda j: cost[j])[0]
+
+# The successors of a task are ready once all their predecessors are finished, and the ready task with the #
+# lowest ID is taken first #
+def test_ready_set():
+	dep_list = [[], [], [0], [0, 1], [2, 3], [1]]
+	task_graph = SimpleNamespace(dep = dep_list.__getitem__)
+	ready = func.ready_set(6, task_graph)
+
+	assert len(ready) == 2
+	assert ready.pop() == 0
+
+	ready.release(0)
+	assert [ready.pop() for i in range(len(ready))] == [1, 2]
+
+	ready.release(2) # Task 4 still waits for task 3
+	assert len(ready) == 0
+
+	ready.release(1)
+	assert [ready.pop() for i in range(len(ready))] == [3, 5]
+
+	ready.release(3)
+	assert ready.pop() == 4
+	assert len(ready) == 0
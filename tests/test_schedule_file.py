@@ -0,0 +1,103 @@
+ #**************************************************************************
+ # test_schedule_file.py
+ #
+ # Test the columnar files of the schedules.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import random
+import pytest
+import gen
+import func
+import validate
+from method import new
+
+# Simulate a random graph #
+def simulate(seed):
+	rng = random.Random(seed)
+	num_tasks, task_graph, gpu_task_num = gen.graph_rand(60, 0.5, 0.2, [], rng)
+	task_graph, deadline = gen.specify_et('n', num_tasks, task_graph, None, 1, 20, 'max', 2, 1, 5, 1, 3, gpu_task_num, rng)
+
+	sim = new.create_simulator(num_tasks, 2, 2, 2, task_graph, 'MTET', 'MET', 'LET', 'MNJ', 'MNAOT')
+	sim.run()
+
+	return task_graph, sim
+
+# The loaded columns are the ones of the simulation, with and without compression #
+@pytest.mark.parametrize('compress', [0, 1])
+def test_round_trip(tmp_path, compress):
+	task_graph, sim = simulate(1)
+	file_name = str(tmp_path / 'a.sched')
+	func.export_schedule(file_name, task_graph, sim, compress)
+	columns = func.schedule_data(task_graph, sim)
+
+	with func.load_schedule(file_name) as schedule:
+		assert schedule.num_tasks == task_graph.num_tasks
+
+		for name, type_code in func.schedule_columns:
+			assert name in schedule
+			assert list(schedule[name]) == list(columns[name])
+
+			# The columns that are not compressed are used directly from the memory map #
+			assert isinstance(schedule[name], memoryview) == (compress == 0)
+
+# The files of version 1 are read without the positions of the segments #
+def test_version_1(tmp_path, monkeypatch):
+	task_graph, sim = simulate(2)
+	file_name = str(tmp_path / 'a.sched')
+
+	monkeypatch.setattr(func, 'schedule_version', 1)
+	monkeypatch.setattr(func, 'schedule_columns', func.schedule_columns[:-3])
+	func.export_schedule(file_name, task_graph, sim)
+	monkeypatch.undo()
+
+	with func.load_schedule(file_name) as schedule:
+		assert 'thr_pos1' not in schedule
+		assert list(schedule['f_time_gpu']) == list(sim.task_state.f_time_gpu)
+		assert func.check_schedule(task_graph, schedule) == []
+
+# A file that is not a schedule file, or of an unsupported version, is not loaded #
+def test_invalid_file(tmp_path, monkeypatch):
+	task_graph, sim = simulate(3)
+	file_name = str(tmp_path / 'a.sched')
+
+	with open(file_name, 'wb') as file:
+		file.write(b'NOT A SCHEDULE FILE')
+	with pytest.raises(ValueError, match = 'Not a schedule file'):
+		func.load_schedule(file_name)
+
+	monkeypatch.setattr(func, 'schedule_version', 3)
+	func.export_schedule(file_name, task_graph, sim)
+	monkeypatch.undo()
+	with pytest.raises(ValueError, match = 'Unsupported version'):
+		func.load_schedule(file_name)
+
+# The exported files of a folder are checked, where the invalid ones are counted #
+def test_check_files(tmp_path, capsys):
+	task_graph, sim = simulate(4)
+	func.export_schedule(str(tmp_path / 'a.sched'), task_graph, sim)
+
+	# A GPU segment is moved before the initial CPU segment of its task #
+	task = task_graph.t_type.index(1)
+	sim.task_state.s_time_gpu[task] = sim.task_state.s_time_cpu1[task] - 1
+	func.export_schedule(str(tmp_path / 'b.sched'), task_graph, sim, 1)
+	(tmp_path / 'c.txt').write_text('not checked')
+
+	assert validate.check_files(str(tmp_path)) == 1
+
+	out = capsys.readouterr().out
+	assert 'a.sched: valid\n' in out
+	assert 'b.sched: not valid\n\tTask ' + str(task) + ':' in out
+	assert 'c.txt' not in out
@@ -0,0 +1,105 @@
+ #**************************************************************************
+ # test_sink.py
+ #
+ # Test the sinks of the results.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import csv
+import json
+import sys
+import pytest
+import sink
+
+# The records written to the sinks, i.e., more than a batch #
+records = [{'iteration': i + 1, 'config': 'new: ' + str(i % 3), 'response_time': i * 7, 'wall_time': i / 8} for i in range(50)]
+
+# The lines of text are written in order, in batches of any size #
+@pytest.mark.parametrize('batch_size', [1, 7, 256])
+def test_text(tmp_path, batch_size):
+	file_name = str(tmp_path / 'results.dat')
+	with sink.results_sink(file_name, batch_size = batch_size, max_batches = 1) as file_sink:
+		for record in records:
+			file_sink.write(str(record['response_time']) + '\n')
+
+	with open(file_name) as file:
+		assert file.read() == ''.join([str(record['response_time']) + '\n' for record in records])
+
+# The columns of the CSV file are the given fields, or the fields of the first record #
+@pytest.mark.parametrize('fields', [None, ['config', 'iteration', 'response_time', 'wall_time']])
+def test_csv(tmp_path, fields):
+	file_name = str(tmp_path / 'results.csv')
+	with sink.results_sink(file_name, fields, batch_size = 8) as file_sink:
+		for record in records:
+			file_sink.write(record)
+
+	with open(file_name, newline = '') as file:
+		reader = csv.reader(file)
+		assert next(reader) == (fields if fields != None else list(records[0]))
+		assert [dict(zip(fields or list(records[0]), row)) for row in reader] == [dict([[name, str(record[name])] for name in record]) for record in records]
+
+# Each record is a line of the JSON Lines file #
+def test_jsonl(tmp_path):
+	file_name = str(tmp_path / 'results.jsonl')
+	with sink.results_sink(file_name, batch_size = 8) as file_sink:
+		for record in records:
+			file_sink.write(record)
+
+	with open(file_name) as file:
+		assert [json.loads(line) for line in file] == records
+
+# The rows of the Parquet file are the records #
+def test_parquet(tmp_path):
+	pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+
+	file_name = str(tmp_path / 'results.parquet')
+	with sink.results_sink(file_name, ['iteration', 'response_time'], batch_size = 8) as file_sink:
+		for record in records:
+			file_sink.write(record)
+
+	assert pyarrow_parquet.read_table(file_name).to_pylist() == [{'iteration': record['iteration'], 'response_time': record['response_time']} for record in records]
+
+# A Parquet file is not written without pyarrow #
+def test_parquet_missing(tmp_path, monkeypatch):
+	monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+	with pytest.raises(ValueError, match = 'needs pyarrow'):
+		sink.results_sink(str(tmp_path / 'results.parquet'))
+
+# The format of the file is given by its extension, or explicitly #
+def test_format(tmp_path):
+	with pytest.raises(ValueError, match = 'Unknown format'):
+		sink.results_sink(str(tmp_path / 'results.xyz'))
+
+	file_name = str(tmp_path / 'results.xyz')
+	with sink.results_sink(file_name, file_format = 'jsonl') as file_sink:
+		file_sink.write(records[0])
+
+	with open(file_name) as file:
+		assert json.loads(file.read()) == records[0]
+
+# The error of the writer thread is raised in the simulation, which is not blocked by the thread #
+def test_writer_error(tmp_path):
+	file_sink = sink.results_sink(str(tmp_path / 'no folder' / 'results.csv'), batch_size = 1, max_batches = 1)
+	with pytest.raises(FileNotFoundError):
+		for record in records:
+			file_sink.write(record)
+		file_sink.close()
+
+	# A record with a field that is not a column #
+	file_sink = sink.results_sink(str(tmp_path / 'results.csv'), ['iteration'])
+	file_sink.write(records[0])
+	with pytest.raises(ValueError):
+		file_sink.close()
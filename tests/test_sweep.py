@@ -0,0 +1,64 @@
+ #**************************************************************************
+ # test_sweep.py
+ #
+ # Test resuming the parameter studies of sweep.py.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import os
+import main
+import sweep
+
+# Run a small sweep in a folder #
+def run_sweep(monkeypatch, folder, case_list):
+	monkeypatch.setattr(sweep, 'sweep_dir', str(folder))
+	monkeypatch.setattr(sweep, 'num_workers', 1)
+	monkeypatch.setattr(sweep, 'itr_prg', 2)
+	monkeypatch.setattr(sweep, 'case_list', case_list)
+	monkeypatch.setattr(main, 'alg_list', main.alg_list[:2])
+	sweep.sweep()
+
+# Read the files of a cell #
+def read_cell(folder, case, cell):
+	cell_folder = os.path.join(str(folder), 'category 1', 'case ' + str(case), 'cell ' + str(cell))
+
+	files = {}
+	for name in sorted(os.listdir(cell_folder)):
+		with open(os.path.join(cell_folder, name)) as file:
+			files[name] = file.read()
+
+	return files
+
+# The finished cells are kept, and the cells whose parameters have been changed are run again #
+def test_resume(monkeypatch, tmp_path, capsys):
+	case_list = [[1, 1, {'max_num_tasks': [40, 50], 'ran_pro': 0.05}]]
+	run_sweep(monkeypatch, tmp_path, case_list)
+	first = [read_cell(tmp_path, 1, 1), read_cell(tmp_path, 1, 2)]
+
+	run_sweep(monkeypatch, tmp_path, case_list)
+	assert 'finished: 2, outdated: 0' in capsys.readouterr().out
+
+	run_sweep(monkeypatch, tmp_path, [[1, 1, {'max_num_tasks': [40, 60], 'ran_pro': 0.05}]])
+	assert 'finished: 1, outdated: 1' in capsys.readouterr().out
+	assert read_cell(tmp_path, 1, 1) == first[0]
+	assert 'max_num_tasks = 60\n' in read_cell(tmp_path, 1, 2)['info.txt']
+
+# The graphs of a cell do not depend on the folder of the sweep #
+def test_seed_independent_of_folder(monkeypatch, tmp_path):
+	case_list = [[1, 1, {'max_num_tasks': [40], 'ran_pro': 0.05}]]
+	run_sweep(monkeypatch, tmp_path / 'a', case_list)
+	run_sweep(monkeypatch, tmp_path / 'b', case_list)
+
+	assert read_cell(tmp_path / 'a', 1, 1) == read_cell(tmp_path / 'b', 1, 1)
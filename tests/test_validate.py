@@ -0,0 +1,150 @@
+ #**************************************************************************
+ # test_validate.py
+ #
+ # Test the simulator against the reference simulator, and the check of the
+ # schedules.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import random
+import pytest
+import gen
+import func
+import main
+import mapping
+import validate
+from method import new
+
+# Generate a random graph with its execution times, where the execution times of the CPU-only tasks and the #
+# response times can be given as decimal fractions (whose running sums are not exact) #
+def rand_graph(seed, max_num_tasks = 80, ran_pro = 0.1, float_times = False):
+	rng = random.Random(seed)
+	num_tasks, task_graph, gpu_task_num = gen.graph_rand(max_num_tasks, 0.5, ran_pro, [], rng)
+	task_graph, deadline = gen.specify_et('n', num_tasks, task_graph, None, 1, 20, 'max', 2, 1, 5, 1, 3, gpu_task_num, rng)
+
+	if float_times:
+		for i in range(num_tasks):
+			if task_graph.t_type[i] == 0:
+				task_graph.exe_time[i] = rng.choice([0.1, 0.2, 0.3, 0.7, 1.1]) * rng.randrange(1, 30)
+			task_graph.res_time[i] = rng.choice([0.1, 0.2, 0.3, 0.7]) * rng.randrange(1, 30)
+
+	return num_tasks, task_graph
+
+# The GPU algorithms of each method #
+gpu_algs = [['O-KGLP', 'O-KGLP']] + [['new', gq_sel, lq_alloc, lq_disp] for gq_sel in new.job_prio_policies for lq_alloc in new.lq_alloc_policies for lq_disp in ['LET', 'WSM']]
+
+# The simulator gives the same schedules as the reference simulator for all CPU allocation and dispatching #
+# algorithms, with both methods, where the times given as decimal fractions check that the totals of the #
+# queues are the running sums of the original mapping process (i.e., no decision changes on their ties) #
+@pytest.mark.parametrize('float_times', [False, True])
+@pytest.mark.parametrize('cpu_alloc_alg', list(mapping.cpu_alloc_policies))
+def test_reference(monkeypatch, cpu_alloc_alg, float_times):
+	monkeypatch.setattr(main, 'num_cpu_threads', 3)
+	monkeypatch.setattr(main, 'num_gpu_devices', 2)
+	monkeypatch.setattr(main, 'loc_queue_cap', 4 if float_times else 2)
+	monkeypatch.setattr(mapping.cpu_alloc_TMCD, 'beta', 0.2)
+
+	for seed in range(2):
+		num_tasks, task_graph = rand_graph(seed, float_times = float_times)
+
+		for cpu_disp_alg in mapping.cpu_disp_policies:
+			for gpu_alg in gpu_algs:
+				alg = [gpu_alg[0], cpu_alloc_alg, cpu_disp_alg] + gpu_alg[1:]
+				ref_sim, sim = validate.create_simulators(alg, num_tasks, task_graph)
+				ref_t = ref_sim.run()
+				t = sim.run()
+
+				assert validate.compare(ref_sim, ref_t, sim, t) == None, alg
+				assert func.check_schedule(task_graph, func.schedule_data(task_graph, sim)) == []
+
+# A different schedule is found as a divergence #
+def test_compare_divergence():
+	num_tasks, task_graph = rand_graph(4)
+	ref_sim, sim = validate.create_simulators(main.alg_list[1], num_tasks, task_graph)
+	ref_t = ref_sim.run()
+	t = sim.run()
+
+	task = sim.exec_queue[0][-1]
+	name = 'f_time_cpu' if task_graph.t_type[task] == 0 else 'f_time_cpu2'
+	getattr(sim.task_state, name)[task] += 1
+
+	assert validate.compare(ref_sim, ref_t, sim, t).startswith('task ' + str(task) + ' at time ')
+	assert validate.compare(ref_sim, ref_t, ref_sim, ref_t + 1) == 'response time: reference ' + str(ref_t) + ', simulator ' + str(ref_t + 1)
+
+# An unknown mapping algorithm is not simulated #
+def test_reference_unknown_alg():
+	num_tasks, task_graph = rand_graph(5)
+
+	with pytest.raises(ValueError):
+		validate.reference_simulator(num_tasks, 2, 1, 2, task_graph, ['new', 'MTET', 'XYZ', 'LET', 'MNJ', 'LET'])
+
+# Simulate a graph and give its schedule #
+def schedule(seed):
+	num_tasks, task_graph = rand_graph(seed, 60, 0.2)
+	sim = new.create_simulator(num_tasks, 2, 2, 2, task_graph, 'MTET', 'MET', 'LET', 'MNJ', 'MNAOT')
+	sim.run()
+
+	columns = func.schedule_data(task_graph, sim)
+	for name in columns:
+		columns[name] = list(columns[name])
+
+	return task_graph, columns
+
+# A valid schedule has no errors, with and without the graph and the positions of the segments #
+def test_check_schedule_valid():
+	task_graph, columns = schedule(6)
+	assert func.check_schedule(task_graph, columns) == []
+	assert func.check_schedule(None, columns) == []
+
+	for name in ['thr_pos1', 'thr_pos2', 'dev_pos']:
+		del columns[name]
+	assert func.check_schedule(task_graph, columns) == []
+
+# The errors of the schedule are found #
+def test_check_schedule_errors():
+	task_graph, columns = schedule(7)
+	gpu_task = task_graph.t_type.index(1)
+	cpu_task = [i for i in range(task_graph.num_tasks) if task_graph.t_type[i] == 0 and len(task_graph.dep(i)) > 0][0]
+
+	# A segment is not executed #
+	wrong = dict(columns, s_time_gpu = list(columns['s_time_gpu']))
+	wrong['s_time_gpu'][gpu_task] = -1
+	assert 'Task ' + str(gpu_task) + ': the GPU segment is not executed' in func.check_schedule(task_graph, wrong)
+
+	# A segment takes another time than its duration, which is not checked without the graph #
+	wrong = dict(columns, f_time_cpu = list(columns['f_time_cpu']))
+	wrong['f_time_cpu'][cpu_task] += 0.5
+	assert any(['Task ' + str(cpu_task) + ': the' in error and 'takes' in error for error in func.check_schedule(task_graph, wrong)])
+	assert not any(['takes' in error for error in func.check_schedule(None, wrong)])
+
+	# A task starts before the task it depends on finishes #
+	dep = task_graph.dep(cpu_task)[0]
+	wrong = dict(columns, s_time_cpu = list(columns['s_time_cpu']), f_time_cpu = list(columns['f_time_cpu']))
+	shift = columns['s_time_cpu'][cpu_task] - (columns['s_time_cpu'][dep] if task_graph.t_type[dep] == 0 else columns['s_time_cpu1'][dep])
+	wrong['s_time_cpu'][cpu_task] -= shift
+	wrong['f_time_cpu'][cpu_task] -= shift
+	assert any([error.startswith('Task ' + str(cpu_task) + ': starts at') for error in func.check_schedule(task_graph, wrong)])
+
+	# Two tasks overlap on a thread, i.e., a task is moved to the start of the graph after another task of its #
+	# thread (the durations and data dependencies are not checked without the graph) #
+	task = [i for i in range(task_graph.num_tasks) if task_graph.t_type[i] == 0 and columns['thr_pos1'][i] > 0][0]
+	wrong = dict(columns, s_time_cpu = list(columns['s_time_cpu']), f_time_cpu = list(columns['f_time_cpu']))
+	wrong['s_time_cpu'][task] = 0
+	wrong['f_time_cpu'][task] = columns['f_time_cpu'][task] - columns['s_time_cpu'][task]
+	assert any([error.startswith('Thread ' + str(columns['thr_id'][task]) + ': task ' + str(task) + ' starts at 0') for error in func.check_schedule(None, wrong)])
+
+	# The number of errors is limited #
+	wrong = dict(columns, s_time_cpu = [-1] * task_graph.num_tasks)
+	assert len(func.check_schedule(task_graph, wrong, 3)) == 3
@@ -0,0 +1,80 @@
+ #**************************************************************************
+ # test_workload.py
+ #
+ # Test the structured workload generators.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+import pytest
+import workload
+
+# Give the data dependencies of the tasks of a graph as lists #
+def deps(task_graph):
+	return [list(task_graph.dep(i)) for i in range(task_graph.num_tasks)]
+
+# The graphs of each family have the given number of tasks and fraction of GPU-using tasks, a task depends only #
+# on tasks with lower IDs (i.e., the graph is acyclic), and the same seed gives the same graph #
+@pytest.mark.parametrize('family', list(workload.families))
+@pytest.mark.parametrize('num_tasks', [1, 2, 5, 97, 300])
+def test_family(family, num_tasks):
+	num, task_graph, gpu_task_num = workload.generate(family, num_tasks, 0.3, 7)
+	dep_list = deps(task_graph)
+
+	assert num == task_graph.num_tasks == num_tasks
+	assert len(gpu_task_num) == round(num_tasks * 0.3)
+	assert [i for i in range(num_tasks) if task_graph.t_type[i] == 1] == gpu_task_num
+	assert all([dep < i for i in range(num_tasks) for dep in dep_list[i]])
+	assert all([len(set(dep_list[i])) == len(dep_list[i]) for i in range(num_tasks)])
+
+	# The numbers of all outgoing tasks of the tasks #
+	out_set = [set() for i in range(num_tasks)]
+	for i in reversed(range(num_tasks)):
+		for dep in dep_list[i]:
+			out_set[dep] |= out_set[i] | {i}
+	assert list(task_graph.num_out) == [len(out) for out in out_set]
+
+	num, same_graph, same_gpu = workload.generate(family, num_tasks, 0.3, 7, out_task = False)
+	assert deps(same_graph) == dep_list and same_gpu == gpu_task_num
+	assert list(same_graph.num_out) == [0] * num_tasks
+
+# The series-parallel graphs have one first and one last task #
+@pytest.mark.parametrize('seed', range(5))
+def test_series_parallel(seed):
+	num_tasks, task_graph, gpu_task_num = workload.series_parallel(200, 0, seed, par_pro = 0.7)
+	dep_list = deps(task_graph)
+
+	assert [i for i in range(num_tasks) if dep_list[i] == []] == [0]
+	assert set(range(num_tasks - 1)) == set([dep for i in range(num_tasks) for dep in dep_list[i]])
+
+# The data dependencies of the regular families #
+def test_structure():
+	assert deps(workload.fork_join(9, 0, 1, width = 3)[1]) == [[], [0], [0], [0], [1, 2, 3], [4], [4], [4], [5, 6, 7]]
+	assert deps(workload.fork_join(6, 0, 1, width = 3)[1]) == [[], [0], [0], [0], [1, 2, 3], [4]]
+	assert deps(workload.stencil(8, 0, 1, width = 3)[1]) == [[], [], [], [0, 1], [0, 1, 2], [1, 2], [3, 4], [3, 4, 5]]
+	assert deps(workload.wavefront(6, 0, 1, width = 3)[1]) == [[], [0], [1], [0], [1, 3], [2, 4]]
+
+	# The two steps of 2 x 2 blocks, i.e., lu0, fwd, bdiv, and bmod, and then lu0 #
+	assert deps(workload.lu(5, 0, 1)[1]) == [[], [0], [0], [1, 2], [3]]
+
+	# Each task of a layer depends on "degree" tasks of the previous layer #
+	dep_list = deps(workload.layered(20, 0, 1, width = 5, degree = 2)[1])
+	assert dep_list[:5] == [[]] * 5
+	assert all([len(dep_list[i]) == 2 and all([i // 5 - 1 == dep // 5 for dep in dep_list[i]]) for i in range(5, 20)])
+
+# The parameters out of range are not accepted #
+@pytest.mark.parametrize('family, num_tasks, gpu_pro, param', [['fork_join', 0, 0.5, {}], ['stencil', 10, 1.5, {}], ['fork_join', 10, 0.5, {'width': 0}], ['layered', 10, 0.5, {'degree': 0}], ['series_parallel', 10, 0.5, {'max_branch': 1}], ['wavefront', 10, 0.5, {'width': 0}], ['xyz', 10, 0.5, {}]])
+def test_invalid_param(family, num_tasks, gpu_pro, param):
+	with pytest.raises(ValueError):
+		workload.generate(family, num_tasks, gpu_pro, 1, **param)
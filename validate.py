@@ -0,0 +1,709 @@
+ #**************************************************************************
+ # validate.py
+ #
+ # Validate the simulator, i.e., run the reference simulator (the original
+ # mapping process, which advances the time unit by unit and processes all
+ # threads and devices at each time unit) and the simulator side by side on
+ # the same seeded graphs and show the first divergence between them, as
+ # well as check the schedules of the simulations and the exported schedule
+ # files.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from operator import itemgetter
+import gen
+import func
+import main
+import mapping
+import workload
+import os
+from method import new
+from method import O_KGLP
+
+# Global variables #
+validate_itr = 20 # Number of graphs
+validate_seed = 'validate' # The master seed of the random numbers, where each graph has its own generator derived from it (see gen.iteration_rng)
+graph_type = 'n' # The graphs; y: The benchmark of main.py, n: The random graphs of main.py
+schedule_dir = os.path.join(main.output_dir, 'scheduling') # The folder of the exported schedule files checked after the simulations ('': not checked)
+
+# ++++++++++++++++++++++++++++ Reference simulator ++++++++++++++++++++++++++++ #
+
+# Define the state of the tasks in the reference simulator, i.e., the thread, status, and times of each task #
+# (-1: not specified), which are given like the state of the simulator, so the schedules can be compared #
+class reference_state:
+	def __init__(self, num_tasks):
+		self.thr_id = [-1] * num_tasks # Thread ID
+		self.status = [None] * num_tasks # Status of the task (e.g., 's_cpu'; None: not started)
+
+		for name in time_columns:
+			setattr(self, name, [-1] * num_tasks)
+
+# Define the reference simulator, i.e., the mapping process of the original O_KGLP.py and new.py, where the #
+# time advances by one time unit and all threads and devices are processed at each time unit (in the order #
+# of their IDs), the task stack is scanned for the ready tasks by checking the data dependencies, and the #
+# queues are plain lists scanned by the mapping algorithms #
+# It shares only the graph with the simulator, and the weights of the mapping algorithms are the ones of #
+# their classes (see main.policy_weights) #
+# The totals of the queues are running sums over the tasks in the order of the queues, like the original #
+# mapping process, so the rounding of the totals of the simulator is compared as well #
+class reference_simulator:
+	def __init__(self, num_tasks, num_cpu_threads, num_gpu_devices, loc_queue_cap, task_graph, alg):
+		self.num_tasks = num_tasks # Number of tasks
+		self.num_cpu_threads = num_cpu_threads # Number of CPU threads
+		self.num_gpu_devices = num_gpu_devices # Number of GPU devices
+		self.loc_queue_cap = loc_queue_cap # Capacity of the local queues (the FIFO queues of O-KGLP)
+		self.task_graph = task_graph # The graph of tasks
+		self.task_state = reference_state(num_tasks) # The state of the tasks
+
+		# The mapping algorithms, i.e., [method, CPU allocation, CPU dispatching, GPU algorithm(s)] #
+		self.method = alg[0]
+		self.cpu_alloc_alg = alg[1]
+		self.cpu_disp_alg = alg[2]
+		if self.method == 'new':
+			self.gpu_gq_sel_alg = alg[3]
+			self.gpu_lq_alloc_alg = alg[4]
+			self.gpu_lq_disp_alg = alg[5]
+
+			algs = [[alg[3], new.job_prio_policies], [alg[4], new.lq_alloc_policies], [alg[5], new.job_prio_policies]]
+		elif self.method == 'O-KGLP':
+			algs = []
+		else:
+			raise ValueError('Unknown mapping method: ' + str(self.method))
+
+		for name, policies in [[alg[1], mapping.cpu_alloc_policies], [alg[2], mapping.cpu_disp_policies]] + algs:
+			if name not in policies:
+				raise ValueError('Unknown mapping algorithm: ' + str(name))
+
+		self.task_stack = list(range(num_tasks)) # The task stack [CPU]
+		self.alloc_queue = [[] for i in range(num_cpu_threads)] # Allocation queues of the threads [CPU]
+		self.exec_queue = [[] for i in range(num_cpu_threads)] # Execution queues of the threads [CPU]
+		self.wait_queue = [[] for i in range(num_cpu_threads)] # Waiting queues of the threads (FIFO queue) [CPU]
+		self.curr_thr = -1 # The current thread [CPU]
+		self.last_idle = [0] * num_cpu_threads # Last idle time of the threads (-1 for a busy thread) [CPU]
+		self.glob_queue = [] # Global queue of the devices (the priority queue of O-KGLP) [GPU]
+		self.loc_queue = [[] for i in range(num_gpu_devices)] # Local queues of the devices (the FIFO queues of O-KGLP) [GPU]
+		self.ker_exec_queue = [[] for i in range(num_gpu_devices)] # Kernel execution queues of the devices [GPU]
+		self.task_device = [] # Allocation of devices to tasks [GPU]
+		self.comp_tasks_cnt = 0 # The number of completed tasks
+
+	# Check whether the data dependencies of a task are finished #
+	def check_dep(self, task):
+		st = self.task_state
+
+		for dep in self.task_graph.dep(task):
+			if st.status[dep] != 'f_cpu' and st.status[dep] != 'f_cpu2':
+				return False
+
+		return True
+
+	# Select an allocation queue using one of the CPU allocation algorithms #
+	def cpu_alloc_algorithm(self, t):
+		alloc_queue = self.alloc_queue
+		exe_time = self.task_graph.exe_time
+		res_time = self.task_graph.res_time
+
+		thr_list = [] # The thread information
+
+		# The MNTP algorithm #
+		if self.cpu_alloc_alg == 'MNTP':
+			# Sort the threads based on the minimum number of tasks #
+			for i in range(self.num_cpu_threads):
+				thr_list.append([i, len(alloc_queue[i])])
+
+			thr_list = sorted(thr_list, key = itemgetter(1), reverse = False)
+
+		# The NT algorithm #
+		elif self.cpu_alloc_alg == 'NT':
+			# Select the next thread #
+			if self.curr_thr < self.num_cpu_threads - 1:
+				self.curr_thr += 1
+			else:
+				self.curr_thr = 0
+
+			return self.curr_thr
+
+		# The MRIT algorithm #
+		elif self.cpu_alloc_alg == 'MRIT':
+			# Sort the threads based on the most recent idle time #
+			for i in range(self.num_cpu_threads):
+				if self.last_idle[i] != -1:
+					thr_list.append([i, t - self.last_idle[i]])
+				else:
+					thr_list.append([i, 0])
+
+			thr_list = sorted(thr_list, key = itemgetter(1), reverse = True)
+
+		# The MTET algorithm #
+		elif self.cpu_alloc_alg == 'MTET':
+			# Sort the threads based on the minimum total execution time #
+			for i in range(self.num_cpu_threads):
+				total_et = 0
+				for task in alloc_queue[i]:
+					total_et += exe_time[task]
+
+				thr_list.append([i, total_et])
+
+			thr_list = sorted(thr_list, key = itemgetter(1), reverse = False)
+
+		# The MTRT algorithm #
+		elif self.cpu_alloc_alg == 'MTRT':
+			# Sort the threads based on the maximum total response time #
+			for i in range(self.num_cpu_threads):
+				total_rt = 0
+				for task in alloc_queue[i]:
+					total_rt += res_time[task]
+
+				thr_list.append([i, total_rt])
+
+			thr_list = sorted(thr_list, key = itemgetter(1), reverse = True)
+
+		# The TMCD algorithm #
+		elif self.cpu_alloc_alg == 'TMCD':
+			weights = mapping.cpu_alloc_TMCD
+
+			# Calculate the recent idle time of the threads #
+			rec_idle_time = []
+			for i in range(self.num_cpu_threads):
+				if self.last_idle[i] != -1:
+					rec_idle_time.append(t - self.last_idle[i])
+				else:
+					rec_idle_time.append(0)
+
+			# Calculate total number of tasks, total idle time, and total execution time #
+			total_num_tasks = 0
+			total_it = 0
+			total_et = 0
+
+			for i in range(self.num_cpu_threads):
+				total_it += rec_idle_time[i]
+				for task in alloc_queue[i]:
+					total_num_tasks += 1
+					total_et += exe_time[task]
+
+			if total_num_tasks == 0:
+				total_num_tasks = 1
+			if total_it == 0:
+				total_it = 1
+			if total_et == 0:
+				total_et = 1
+
+			# Sort the threads based on the least cost #
+			for i in range(self.num_cpu_threads):
+				if rec_idle_time[i] != 0:
+					val_it = 1 / (rec_idle_time[i] / total_it)
+				else:
+					val_it = 0
+
+				sum_et = 0
+				for task in alloc_queue[i]:
+					sum_et += exe_time[task]
+				thr_list.append([i, weights.alpha * len(alloc_queue[i]) / total_num_tasks + weights.beta * val_it + weights.gamma * sum_et / total_et])
+
+			thr_list = sorted(thr_list, key = itemgetter(1), reverse = False)
+
+		return thr_list[0][0]
+
+	# Choose a task from the allocation queue using one of the CPU dispatching algorithms #
+	def cpu_disp_algorithm(self, sel_tasks):
+		exe_time = self.task_graph.exe_time
+		res_time = self.task_graph.res_time
+
+		# The MET algorithm #
+		if self.cpu_disp_alg == 'MET':
+			cost = [exe_time[task] for task in sel_tasks]
+
+		# The MRT algorithm #
+		elif self.cpu_disp_alg == 'MRT':
+			cost = [-res_time[task] for task in sel_tasks]
+
+		# The MCD algorithm #
+		elif self.cpu_disp_alg == 'MCD':
+			weights = mapping.cpu_disp_MCD
+
+			# Calculate total execution time and total response time of the tasks #
+			total_et = 0
+			total_rt = 0
+			for task in sel_tasks:
+				total_et += exe_time[task]
+				total_rt += res_time[task]
+
+			if total_et == 0:
+				total_et = 1
+			if total_rt == 0:
+				total_rt = 1
+
+			cost = [weights.theta * exe_time[task] / total_et + weights.psi * 1 / (res_time[task] / total_rt) for task in sel_tasks]
+
+		# Select the task with the least cost #
+		sel_id = 0
+		for i in range(len(sel_tasks))[1::]:
+			if cost[i] < cost[sel_id]:
+				sel_id = i
+
+		return sel_id
+
+	# Select a job from a queue using one of the GQ selection and LQ dispatching algorithms #
+	def gpu_job_sel_algorithm(self, queue, alg):
+		gpu_time = self.task_graph.gpu_time
+		num_out = self.task_graph.num_out
+
+		# The LET algorithm #
+		if alg == 'LET':
+			cost = [gpu_time[task] for task in queue]
+
+		# The MNAOT algorithm #
+		elif alg == 'MNAOT':
+			cost = [-num_out[task] for task in queue]
+
+		# The WSM algorithm #
+		elif alg == 'WSM':
+			weights = new.job_prio_WSM
+
+			cost = []
+			for task in queue:
+				if num_out[task] != 0:
+					cost.append(weights.et_w * gpu_time[task] + weights.naot_w * 1 / num_out[task])
+				else:
+					cost.append(weights.et_w * gpu_time[task] + weights.naot_w)
+
+		# Select the job with the least cost #
+		sel_id = 0
+		for i in range(len(queue))[1::]:
+			if cost[i] < cost[sel_id]:
+				sel_id = i
+
+		return sel_id
+
+	# Find out the local queues that have capacity to get new tasks #
+	def loc_queue_cap_check(self):
+		dev_list = []
+		for i in range(self.num_gpu_devices):
+			if len(self.loc_queue[i]) < self.loc_queue_cap:
+				dev_list.append(i)
+
+		return dev_list
+
+	# Select a local queue using one of the LQ allocation algorithms #
+	def gpu_lq_alloc_algorithm(self, dev_list):
+		gpu_time = self.task_graph.gpu_time
+
+		dev_list_new = [] # The device information
+		for dev_id in dev_list:
+			num_jobs = len(self.loc_queue[dev_id])
+			total_et = 0
+			for task in self.loc_queue[dev_id]:
+				total_et += gpu_time[task]
+
+			# The MNJ algorithm #
+			if self.gpu_lq_alloc_alg == 'MNJ':
+				dev_list_new.append([dev_id, num_jobs])
+
+			# The LTET algorithm #
+			elif self.gpu_lq_alloc_alg == 'LTET':
+				dev_list_new.append([dev_id, total_et])
+
+			# The WSM algorithm #
+			elif self.gpu_lq_alloc_alg == 'WSM':
+				dev_list_new.append([dev_id, new.lq_alloc_WSM.nj_w * num_jobs + new.lq_alloc_WSM.tet_w * total_et])
+
+		# Sort the list based on the least value #
+		dev_list_new = sorted(dev_list_new, key = itemgetter(1), reverse = False)
+
+		return dev_list_new[0][0]
+
+	# Choose the FIFO queue with fewer tasks (O-KGLP) #
+	def short_FIFO(self):
+		queue_id = 0
+		for i in range(self.num_gpu_devices)[1::]:
+			if len(self.loc_queue[i]) < len(self.loc_queue[queue_id]):
+				queue_id = i
+
+		return queue_id
+
+	# Select the job with the earliest deadline from the priority queue (O-KGLP) #
+	def gpu_prio_queue_sel(self):
+		deadline = self.task_graph.deadline
+
+		sel_id = 0
+		for i in range(len(self.glob_queue))[1::]:
+			if deadline[self.glob_queue[i]] < deadline[self.glob_queue[sel_id]]:
+				sel_id = i
+
+		return sel_id
+
+	# The mapping process #
+	def run(self):
+		t = 0 # Response time
+
+		while self.comp_tasks_cnt < self.num_tasks:
+			changed = self.cpu_execution(t)
+			changed = self.gpu_execution(t) or changed
+
+			# The mapping process is blocked if nothing has been changed and none of the threads and devices is #
+			# executing a segment #
+			if not changed and not self.executing(t):
+				raise RuntimeError('The mapping process is blocked at time ' + str(t))
+
+			t += 1
+
+		return t
+
+	# Check whether any thread or device is executing a segment #
+	def executing(self, t):
+		st = self.task_state
+
+		for queue, segments in [[self.exec_queue, [['s_cpu', st.f_time_cpu], ['s_cpu1', st.f_time_cpu1], ['s_cpu2', st.f_time_cpu2]]], [self.ker_exec_queue, [['s_memcopy1', st.f_time_memcopy1], ['s_gpu', st.f_time_gpu], ['s_memcopy2', st.f_time_memcopy2]]]]:
+			for res_queue in queue:
+				if bool(res_queue):
+					task = res_queue[len(res_queue) - 1]
+					for status, f_time in segments:
+						if st.status[task] == status and f_time[task] > t:
+							return True
+
+		return False
+
+	# CPU execution #
+	def cpu_execution(self, t):
+		changed = False
+		task_graph = self.task_graph
+		st = self.task_state
+
+		for thr_num in range(self.num_cpu_threads):
+			# Check the execution queue of the thread #
+			if bool(self.exec_queue[thr_num]):
+				task = self.exec_queue[thr_num][len(self.exec_queue[thr_num]) - 1]
+
+				# CPU-only task #
+				# Check whether the execution of the CPU-only task has been finished #
+				if st.status[task] == 's_cpu' and st.f_time_cpu[task] <= t:
+					st.status[task] = 'f_cpu'
+					changed = True
+
+					self.curr_thr = thr_num
+					self.last_idle[thr_num] = t
+					self.comp_tasks_cnt += 1
+
+				# GPU-using task #
+				# Check whether the execution of the initial CPU segment has been finished #
+				elif st.status[task] == 's_cpu1' and st.f_time_cpu1[task] <= t:
+					st.status[task] = 'f_cpu1'
+					changed = True
+
+					self.curr_thr = thr_num
+					self.last_idle[thr_num] = t
+
+					if self.method == 'new':
+						self.glob_queue.append(task) # Allocate the task to the global queue of the devices
+					else:
+						# Enqueue the task into the shortest FIFO queue #
+						flag = 0
+						if (len(self.glob_queue) + sum([len(queue) for queue in self.loc_queue])) < self.num_cpu_threads:
+							queue_id = self.short_FIFO()
+
+							if len(self.loc_queue[queue_id]) < self.loc_queue_cap:
+								self.loc_queue[queue_id].append(task)
+								flag = 1
+
+								self.task_device.append([task, queue_id])
+
+						# Enqueue the task into the priority queue #
+						if flag == 0:
+							self.glob_queue.append(task)
+
+				# Check whether the execution of the last CPU segment has been finished #
+				elif st.status[task] == 's_cpu2' and st.f_time_cpu2[task] <= t:
+					st.status[task] = 'f_cpu2'
+					changed = True
+
+					self.curr_thr = thr_num
+					self.last_idle[thr_num] = t
+					self.comp_tasks_cnt += 1
+
+			# Check the task stack and add ready tasks to the allocation queues #
+			# This process is done just by the master thread #
+			if thr_num == 0:
+				remove_list = []
+				for task in self.task_stack:
+					# Add the ready tasks to the allocation queues if there are not any data dependencies, or #
+					# there are any data dependencies but the related tasks are finished #
+					if self.check_dep(task):
+						# Select an allocation queue from the list of queues #
+						thread_id = -1
+						for j in range(self.num_cpu_threads): # Select empty queue belonging to an idle thread
+							if len(self.alloc_queue[j]) == 0 and self.last_idle[j] != -1:
+								thread_id = j
+								break
+
+						if thread_id == -1: # Select the queue using the allocation heuristic
+							thread_id = self.cpu_alloc_algorithm(t)
+
+						# Append the task to the selected queue #
+						self.alloc_queue[thread_id].append(task)
+						remove_list.append(task)
+						changed = True
+
+						# Set the thread ID of the task #
+						st.thr_id[task] = thread_id
+
+				# Remove the tasks, which were processed, from the task stack #
+				for task in remove_list:
+					self.task_stack.remove(task)
+
+			# Check whether the thread is idle #
+			if not bool(self.exec_queue[thr_num]) or self.last_idle[thr_num] != -1:
+				# Check the waiting queue of the thread and dispatch one of the tasks (if any) to it #
+				if bool(self.wait_queue[thr_num]):
+					# Choose the first task (i.e., FIFO) from the waiting queue, and dispatch it to the thread #
+					task = self.wait_queue[thr_num].pop(0)
+					self.exec_queue[thr_num].append(task)
+
+					st.status[task] = 's_cpu2'
+					st.s_time_cpu2[task] = t
+					st.f_time_cpu2[task] = t + task_graph.cpu2_time[task]
+
+					self.last_idle[thr_num] = -1
+					changed = True
+
+				# Check the allocation queue of the thread and dispatch one of the tasks (if any) to it #
+				elif bool(self.alloc_queue[thr_num]):
+					# Choose one of the tasks from the allocation queue, and dispatch it to the thread #
+					task = self.alloc_queue[thr_num].pop(self.cpu_disp_algorithm(self.alloc_queue[thr_num]))
+					self.exec_queue[thr_num].append(task)
+
+					if task_graph.t_type[task] == 0: # CPU-only task
+						st.status[task] = 's_cpu'
+						st.s_time_cpu[task] = t
+						st.f_time_cpu[task] = t + task_graph.exe_time[task]
+					else: # GPU-using task
+						st.status[task] = 's_cpu1'
+						st.s_time_cpu1[task] = t
+						st.f_time_cpu1[task] = t + task_graph.cpu1_time[task]
+
+					self.last_idle[thr_num] = -1
+					changed = True
+
+		return changed
+
+	# GPU execution #
+	def gpu_execution(self, t):
+		changed = False
+		task_graph = self.task_graph
+		st = self.task_state
+
+		for dev_num in range(self.num_gpu_devices):
+			# Check the kernel execution queue of the device #
+			if bool(self.ker_exec_queue[dev_num]):
+				task = self.ker_exec_queue[dev_num][len(self.ker_exec_queue[dev_num]) - 1]
+
+				# Check whether the execution of the task has been finished #
+				if st.status[task] == 's_memcopy1' and st.f_time_memcopy1[task] <= t:
+					st.status[task] = 's_gpu'
+					st.s_time_gpu[task] = t
+					st.f_time_gpu[task] = t + task_graph.gpu_time[task]
+					changed = True
+				elif st.status[task] == 's_gpu' and st.f_time_gpu[task] <= t:
+					st.status[task] = 's_memcopy2'
+					st.s_time_memcopy2[task] = t
+					st.f_time_memcopy2[task] = t + task_graph.memcopy2_time[task]
+					changed = True
+				elif st.status[task] == 's_memcopy2' and st.f_time_memcopy2[task] <= t:
+					st.status[task] = 'f_memcopy2'
+					changed = True
+
+					self.wait_queue[st.thr_id[task]].append(task) # Allocate the task to the waiting queue of the thread
+
+			# Check the global queue and add existing tasks to the local queues #
+			# This process is done just by the master device #
+			if dev_num == 0 and self.method == 'new':
+				while bool(self.glob_queue) and bool(self.loc_queue_cap_check()):
+					# Select a task from the global queue, allocate it to one of the local queues, and then remove #
+					# it from the global queue #
+					task = self.glob_queue.pop(self.gpu_job_sel_algorithm(self.glob_queue, self.gpu_gq_sel_alg))
+					loc_queue_id = self.gpu_lq_alloc_algorithm(self.loc_queue_cap_check())
+					self.loc_queue[loc_queue_id].append(task)
+					changed = True
+
+					self.task_device.append([task, loc_queue_id])
+
+			# Check whether the device is idle #
+			last_status = st.status[self.ker_exec_queue[dev_num][len(self.ker_exec_queue[dev_num]) - 1]] if bool(self.ker_exec_queue[dev_num]) else None
+			if not bool(self.ker_exec_queue[dev_num]) or last_status == 'f_memcopy2' or last_status == 's_cpu2' or last_status == 'f_cpu2':
+				# Check the local queue of the device and dispatch one of the tasks (if any) to it #
+				if bool(self.loc_queue[dev_num]):
+					# Choose one of the tasks from the local queue (the first task of the FIFO queue of O-KGLP), #
+					# and dispatch it to the device #
+					if self.method == 'new':
+						task = self.loc_queue[dev_num].pop(self.gpu_job_sel_algorithm(self.loc_queue[dev_num], self.gpu_lq_disp_alg))
+					else:
+						task = self.loc_queue[dev_num].pop(0)
+
+					self.ker_exec_queue[dev_num].append(task)
+
+					st.status[task] = 's_memcopy1'
+					st.s_time_memcopy1[task] = t
+					st.f_time_memcopy1[task] = t + task_graph.memcopy1_time[task]
+					changed = True
+
+					# Dequeue a task from the priority queue and enqueue it into the FIFO queue (O-KGLP) #
+					if self.method == 'O-KGLP' and len(self.loc_queue[dev_num]) < self.loc_queue_cap and len(self.glob_queue) > 0:
+						prio_task = self.glob_queue.pop(self.gpu_prio_queue_sel())
+						self.loc_queue[dev_num].append(prio_task)
+
+						self.task_device.append([prio_task, dev_num])
+
+		return changed
+
+# Create the simulators of a mapping algorithm of main.py, i.e., [reference simulator, simulator] #
+def create_simulators(alg, num_tasks, task_graph):
+	ref_sim = reference_simulator(num_tasks, main.num_cpu_threads, main.num_gpu_devices, main.loc_queue_cap, task_graph, alg)
+
+	if alg[0] == 'O-KGLP':
+		sim = O_KGLP.create_simulator(num_tasks, main.num_cpu_threads, main.num_gpu_devices, main.loc_queue_cap, task_graph, alg[1], alg[2])
+	else:
+		sim = new.create_simulator(num_tasks, main.num_cpu_threads, main.num_gpu_devices, main.loc_queue_cap, task_graph, alg[1], alg[2], alg[3], alg[4], alg[5])
+
+	return ref_sim, sim
+
+# ++++++++++++++++++++++++++++++++ Comparison ++++++++++++++++++++++++++++++++ #
+
+# The time columns of the schedules, which specify the time of a divergence #
+time_columns = ['s_time_cpu', 'f_time_cpu', 's_time_cpu1', 'f_time_cpu1', 's_time_memcopy1', 'f_time_memcopy1', 's_time_gpu', 'f_time_gpu', 's_time_memcopy2', 'f_time_memcopy2', 's_time_cpu2', 'f_time_cpu2']
+
+# Find the first divergence between the reference simulator and the simulator (None: identical) #
+# The schedules are compared task by task (i.e., the thread, device, times, and order of the segments), where #
+# the divergence is the task whose differing values are the earliest #
+def compare(ref_sim, ref_t, sim, t):
+	task_graph = sim.task_graph
+	ref_col = func.schedule_data(task_graph, ref_sim)
+	col = func.schedule_data(task_graph, sim)
+
+	first = None # The first divergence, i.e., [time, task ID, differences]
+	for i in range(task_graph.num_tasks):
+		diff = []
+		diff_time = None
+
+		for name, type_code in func.schedule_columns:
+			if ref_col[name][i] != col[name][i]:
+				diff.append(name + ': reference ' + str(ref_col[name][i]) + ', simulator ' + str(col[name][i]))
+
+				# The time of a differing time column, or the start of the task for the other columns #
+				if name in time_columns:
+					values = [ref_col[name][i], col[name][i]]
+				else:
+					values = [ref_col['s_time_cpu'][i], ref_col['s_time_cpu1'][i]]
+
+				for value in values:
+					if value != -1 and (diff_time == None or value < diff_time):
+						diff_time = value
+
+		if diff and (first == None or (diff_time != None and (first[0] == None or diff_time < first[0]))):
+			first = [diff_time, i, diff]
+
+	if first != None:
+		return 'task ' + str(first[1]) + ' at time ' + str(first[0]) + ': ' + '; '.join(first[2])
+
+	# The order of allocating the devices to the tasks #
+	for i in range(min(len(ref_sim.task_device), len(sim.task_device))):
+		if ref_sim.task_device[i] != sim.task_device[i]:
+			return 'device allocation ' + str(i) + ': reference ' + str(ref_sim.task_device[i]) + ', simulator ' + str(sim.task_device[i])
+
+	if len(ref_sim.task_device) != len(sim.task_device):
+		return 'number of device allocations: reference ' + str(len(ref_sim.task_device)) + ', simulator ' + str(len(sim.task_device))
+
+	if ref_t != t:
+		return 'response time: reference ' + str(ref_t) + ', simulator ' + str(t)
+
+	return None
+
+# Generate the graph of an iteration like main.py does #
+def gen_graph(itr):
+	rng = gen.iteration_rng(validate_seed, itr)
+
+	if graph_type == 'y':
+		gpu_task_num = gen.read_gpu_task(main.bench_name)
+		num_tasks, task_graph = gen.graph_predef(main.bench_name, gpu_task_num)
+	elif main.workload_family == '':
+		num_tasks, task_graph, gpu_task_num = gen.graph_rand(main.max_num_tasks, main.type_pro, main.ran_pro, [], rng)
+	else:
+		num_tasks, task_graph, gpu_task_num = workload.generate(main.workload_family, main.max_num_tasks, main.workload_gpu_pro, rng.getrandbits(32), **main.workload_param)
+
+	task_graph, deadline = gen.specify_et(graph_type, num_tasks, task_graph, main.bench_name, main.et_min, main.et_max, main.et_type, main.itr_et, main.dl_min_task, main.dl_max_task, main.dl_min_graph, main.dl_max_graph, gpu_task_num, rng)
+
+	return num_tasks, task_graph
+
+# Check the exported schedule files, where the graphs are not known, so just the order of the segments of #
+# the tasks and the occupancy of the threads and devices are checked #
+# Return the number of invalid files #
+def check_files(folder):
+	num_invalid = 0
+
+	for file_name in sorted(os.listdir(folder)):
+		if not file_name.endswith('.sched'):
+			continue
+
+		with func.load_schedule(os.path.join(folder, file_name)) as schedule:
+			errors = func.check_schedule(None, schedule)
+
+		if errors:
+			num_invalid += 1
+			print(file_name + ': not valid\n\t' + '\n\t'.join(errors))
+		else:
+			print(file_name + ': valid')
+
+	return num_invalid
+
+# The main function #
+def validate():
+	num_diverged = 0
+	num_invalid = 0
+
+	for itr in range(validate_itr):
+		num_tasks, task_graph = gen_graph(itr)
+		print('\nIteration ' + str(itr + 1) + ' (' + str(num_tasks) + ' tasks)\n====================')
+
+		for alg in main.alg_list:
+			ref_sim, sim = create_simulators(alg, num_tasks, task_graph)
+			ref_t = ref_sim.run()
+			t = sim.run()
+
+			# Compare the simulations and check the schedule of the simulator #
+			divergence = compare(ref_sim, ref_t, sim, t)
+			errors = func.check_schedule(task_graph, func.schedule_data(task_graph, sim))
+
+			line = alg[0] + ': ' + main.alg_name(alg) + ': '
+			if divergence == None:
+				line += 'identical (response time ' + str(t) + ')'
+			else:
+				num_diverged += 1
+				line += 'diverged at ' + divergence
+
+			if errors:
+				num_invalid += 1
+				line += '\n\tinvalid schedule:\n\t' + '\n\t'.join(errors)
+
+			print(line)
+
+	print('\nDiverged runs: ' + str(num_diverged) + ', invalid schedules: ' + str(num_invalid))
+
+	# Check the exported schedule files #
+	if schedule_dir != '' and os.path.isdir(schedule_dir):
+		print('\nExported schedules\n====================')
+		num_invalid += check_files(schedule_dir)
+
+	return num_diverged == 0 and num_invalid == 0
+
+if __name__ == '__main__':
+	if not validate():
+		raise SystemExit(1)
@@ -0,0 +1,277 @@
+ #**************************************************************************
+ # workload.py
+ #
+ # Generate large graphs of tasks with the structures of the OpenMP
+ # applications (fork-join, layered, series-parallel, stencil, wavefront,
+ # and LU), where each family gets the number of tasks, the fraction of
+ # GPU-using tasks, and the seed of its random numbers explicitly.
+ #**************************************************************************
+ # Copyright 2025 Instituto Superior de Engenharia do Porto
+ #
+ # Licensed under the Apache License, Version 2.0 (the "License");
+ # you may not use this file except in compliance with the License.
+ # You may obtain a copy of the License at
+ #
+ #              http://www.apache.org/licenses/LICENSE-2.0
+ #
+ # Unless required by applicable law or agreed to in writing, software
+ # distributed under the License is distributed on an "AS IS" BASIS,
+ # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ # See the License for the specific language governing permissions and
+ # limitations under the License.
+ #**************************************************************************
+from array import array
+import random
+import itertools
+import gen
+
+# Each family yields the data dependencies of the tasks in the order of the task IDs, where a task depends #
+# only on tasks with lower IDs, so the graph is built in one pass without keeping the lists of the tasks #
+
+# Create the graph from the data dependencies given by a family, as well as select the GPU-using tasks #
+# The number of all outgoing tasks of the tasks (used by MNAOT and WSM) takes more than linear time on large #
+# graphs, so it can be skipped by out_task = False, where the numbers are left 0 #
+def build_graph(num_tasks, gpu_pro, rng, dep_iter, out_task):
+	# The data dependencies in the compressed sparse row format #
+	dep_ptr = array('q', [0])
+	dep_idx = array('q')
+	for task_deps in dep_iter:
+		dep_idx.extend(task_deps)
+		dep_ptr.append(len(dep_idx))
+
+	if len(dep_ptr) != num_tasks + 1:
+		raise ValueError('The family generated ' + str(len(dep_ptr) - 1) + ' tasks instead of ' + str(num_tasks))
+
+	# Specify the task type #
+	gpu_task_num = sorted(rng.sample(range(num_tasks), round(num_tasks * gpu_pro)))
+
+	t_type = array('b', [0]) * num_tasks
+	for i in gpu_task_num:
+		t_type[i] = 1
+
+	# Create the graph, as well as determine the number of all outgoing tasks of the tasks #
+	task_graph = gen.graph_struct(num_tasks, t_type, dep_ptr, dep_idx, array('q', [0]) * num_tasks)
+	if out_task:
+		gen.num_out_task(task_graph)
+
+	return num_tasks, task_graph, gpu_task_num
+
+# Check the number of tasks and the fraction of GPU-using tasks, as well as create the random generator #
+def check_param(num_tasks, gpu_pro, seed):
+	if num_tasks < 1:
+		raise ValueError('The number of tasks should be positive: ' + str(num_tasks))
+	if not 0 <= gpu_pro <= 1:
+		raise ValueError('The fraction of GPU-using tasks should be in [0, 1]: ' + str(gpu_pro))
+
+	return random.Random(seed)
+
+# ++++++++++++++++++++++++++++++++ Fork-join ++++++++++++++++++++++++++++++++ #
+
+# A chain of parallel regions, where a fork task starts "width" tasks, and the join task waiting for them #
+# is the fork task of the next region #
+def fork_join(num_tasks, gpu_pro, seed, width = 16, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+	if width < 1:
+		raise ValueError('The width should be positive: ' + str(width))
+
+	return build_graph(num_tasks, gpu_pro, rng, fork_join_deps(num_tasks, width), out_task)
+
+def fork_join_deps(num_tasks, width):
+	yield [] # The first fork task
+	fork = 0
+	next_id = 1
+
+	while next_id < num_tasks:
+		# The last region gets the remaining tasks #
+		region_width = min(width, num_tasks - next_id - 1)
+
+		for i in range(region_width):
+			yield [fork]
+
+		# The join task #
+		if region_width > 0:
+			yield range(next_id, next_id + region_width)
+		else:
+			yield [fork]
+
+		fork = next_id + region_width
+		next_id = fork + 1
+
+# +++++++++++++++++++++++++++++++++ Layered +++++++++++++++++++++++++++++++++ #
+
+# Layers of "width" tasks, where each task depends on "degree" random tasks of the previous layer #
+def layered(num_tasks, gpu_pro, seed, width = 64, degree = 3, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+	if width < 1 or degree < 1:
+		raise ValueError('The width and degree should be positive: ' + str(width) + ', ' + str(degree))
+
+	return build_graph(num_tasks, gpu_pro, rng, layered_deps(num_tasks, width, degree, rng), out_task)
+
+def layered_deps(num_tasks, width, degree, rng):
+	# The first layer #
+	for i in range(min(width, num_tasks)):
+		yield []
+
+	for layer_start in range(width, num_tasks, width):
+		prev_layer = range(layer_start - width, layer_start)
+
+		for i in range(layer_start, min(layer_start + width, num_tasks)):
+			yield sorted(rng.sample(prev_layer, min(degree, width)))
+
+# +++++++++++++++++++++++++++++ Series-parallel +++++++++++++++++++++++++++++ #
+
+# A random series-parallel graph, where a block of tasks (having one first and one last task) is a single #
+# task, two blocks in series, or a fork task, 2 to "max_branch" blocks in parallel, and a join task #
+def series_parallel(num_tasks, gpu_pro, seed, par_pro = 0.5, max_branch = 4, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+	if max_branch < 2:
+		raise ValueError('The maximum number of branches should be at least 2: ' + str(max_branch))
+
+	return build_graph(num_tasks, gpu_pro, rng, series_parallel_deps(num_tasks, par_pro, max_branch, rng), out_task)
+
+# The blocks are split using a stack of the blocks being built instead of recursion, so the depth of the #
+# graph is not limited, where each block is a generator that yields the blocks it consists of (i.e., [number #
+# of tasks, data dependencies of the first task]), gets the last task of each of them, and returns its own #
+# last task #
+def series_parallel_deps(num_tasks, par_pro, max_branch, rng):
+	new_task = [0, None] # The ID of the next task, and the data dependencies of the task created by a block
+
+	def block(n, deps):
+		if n == 1:
+			new_task[1] = deps
+			new_task[0] += 1
+			return new_task[0] - 1
+
+		# Parallel blocks #
+		if n >= 4 and rng.random() < par_pro:
+			new_task[1] = deps
+			new_task[0] += 1
+			fork = new_task[0] - 1
+
+			# Split the tasks between the fork and join tasks into the branches #
+			m = n - 2
+			num_branch = rng.randint(2, min(max_branch, m))
+			cut_list = sorted(rng.sample(range(1, m), num_branch - 1))
+
+			last_list = []
+			prev_cut = 0
+			for cut in cut_list + [m]:
+				last_list.append((yield [cut - prev_cut, [fork]]))
+				prev_cut = cut
+
+			new_task[1] = last_list
+			new_task[0] += 1
+			return new_task[0] - 1
+
+		# Blocks in series #
+		k = rng.randint(1, n - 1)
+		last = yield [k, deps]
+		return (yield [n - k, [last]])
+
+	stack = [block(num_tasks, [])]
+	sent = None
+
+	while stack:
+		try:
+			sub_block = stack[-1].send(sent)
+			stack.append(block(sub_block[0], sub_block[1]))
+			sent = None
+		except StopIteration as stop:
+			stack.pop()
+			sent = stop.value
+
+		# Yield the task created by the block #
+		if new_task[1] != None:
+			yield new_task[1]
+			new_task[1] = None
+
+# +++++++++++++++++++++++++++ Stencil and wavefront +++++++++++++++++++++++++ #
+
+# Time steps of a 1D stencil over "width" cells (like the heat benchmark), where each cell depends on itself #
+# and its neighbours in the previous step #
+def stencil(num_tasks, gpu_pro, seed, width = 32, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+	if width < 1:
+		raise ValueError('The width should be positive: ' + str(width))
+
+	return build_graph(num_tasks, gpu_pro, rng, stencil_deps(num_tasks, width), out_task)
+
+def stencil_deps(num_tasks, width):
+	for i in range(num_tasks):
+		if i < width:
+			yield []
+		else:
+			cell = i % width
+			prev = i - width
+			yield range(prev - (cell > 0), prev + (cell < width - 1) + 1)
+
+# A 2D wavefront over rows of "width" cells, where each cell depends on the cell above and the cell on the #
+# left #
+def wavefront(num_tasks, gpu_pro, seed, width = 32, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+	if width < 1:
+		raise ValueError('The width should be positive: ' + str(width))
+
+	return build_graph(num_tasks, gpu_pro, rng, wavefront_deps(num_tasks, width), out_task)
+
+def wavefront_deps(num_tasks, width):
+	for i in range(num_tasks):
+		deps = []
+		if i >= width:
+			deps.append(i - width)
+		if i % width > 0:
+			deps.append(i - 1)
+
+		yield deps
+
+# +++++++++++++++++++++++++++++++++++ LU ++++++++++++++++++++++++++++++++++++ #
+
+# The tasks of the blocked LU decomposition (like the sparseLU benchmark with dense blocks), i.e., for each #
+# step k: lu0 of block (k, k), fwd of blocks (k, j), bdiv of blocks (i, k), and bmod of blocks (i, j), #
+# where i, j > k, and each task depends on the tasks that wrote its blocks last #
+# The number of blocks is the smallest one giving enough tasks, where the tasks after num_tasks are dropped #
+def lu(num_tasks, gpu_pro, seed, out_task = True):
+	rng = check_param(num_tasks, gpu_pro, seed)
+
+	num_blocks = 1
+	while num_blocks * (num_blocks + 1) * (2 * num_blocks + 1) // 6 < num_tasks:
+		num_blocks += 1
+
+	return build_graph(num_tasks, gpu_pro, rng, itertools.islice(lu_deps(num_blocks), num_tasks), out_task)
+
+def lu_deps(num_blocks):
+	last = [[-1] * num_blocks for i in range(num_blocks)] # The task writing each block last
+	next_id = [0]
+
+	# Create a task writing a block, which depends on the given tasks and the last task writing the block #
+	def task(i, j, deps):
+		if last[i][j] != -1:
+			deps.append(last[i][j])
+
+		last[i][j] = next_id[0]
+		next_id[0] += 1
+
+		return sorted(set(deps))
+
+	for k in range(num_blocks):
+		yield task(k, k, []) # lu0
+		lu0 = last[k][k]
+
+		for j in range(k + 1, num_blocks):
+			yield task(k, j, [lu0]) # fwd
+		for i in range(k + 1, num_blocks):
+			yield task(i, k, [lu0]) # bdiv
+
+		for i in range(k + 1, num_blocks):
+			for j in range(k + 1, num_blocks):
+				yield task(i, j, [last[i][k], last[k][j]]) # bmod
+
+# The families of the graphs #
+families = {'fork_join': fork_join, 'layered': layered, 'series_parallel': series_parallel, 'stencil': stencil, 'wavefront': wavefront, 'lu': lu}
+
+# Generate a graph using one of the families #
+def generate(family, num_tasks, gpu_pro, seed, **param):
+	if family not in families:
+		raise ValueError('Unknown workload family: ' + family)
+
+	return families[family](num_tasks, gpu_pro, seed, **param)